@@ -1,6 +1,24 @@
 from django.apps import AppConfig
 
 
-class UsersConfig(AppConfig):
+class WeatherConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "users"
+    name = "app"
+
+    def ready(self):
+        from app.constants import WEATHER_STREAM
+        from app.signals import weather_stored
+        from app.utils.alerts import evaluate_alerts
+        from app.utils.autocomplete import city_index
+        from app.utils.rollups import update_country_rollups
+        from app.utils.stream import publish_weather_updates
+        from app.utils.tiles import invalidate_city_tiles
+
+        weather_stored.connect(
+            city_index.handle_weather_stored, dispatch_uid="city-index"
+        )
+        weather_stored.connect(invalidate_city_tiles, dispatch_uid="city-tiles")
+        weather_stored.connect(evaluate_alerts, dispatch_uid="city-alerts")
+        weather_stored.connect(update_country_rollups, dispatch_uid="country-rollups")
+        if WEATHER_STREAM:
+            weather_stored.connect(publish_weather_updates, dispatch_uid="city-stream")
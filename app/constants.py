@@ -1,16 +1,105 @@
-import os
 from dotenv import load_dotenv
 
+from core.constants import env
+
 
 load_dotenv()
 
 
-OPEN_WEATHER_MAP_API = os.environ.get(
-    "OPEN_WEATHER_MAP_API", "your_open_weather_api_key"
+OPEN_WEATHER_MAP_API = env("OPEN_WEATHER_MAP_API", "your_open_weather_api_key")
+OPEN_WEATHER_MAP_API_KEY = env("OPEN_WEATHER_MAP_API_KEY", "your_open_weather_api_key")
+OPEN_WEATHER_MAP_ONE_CALL_KEY = env(
+    "OPEN_WEATHER_MAP_ONE_CALL_KEY", "your_open_weather_one_call_key"
 )
-OPEN_WEATHER_MAP_API_KEY = os.environ.get(
-    "OPEN_WEATHER_MAP_API_KEY", "your_open_weather_api_key"
+
+# Bulk refresh
+OPEN_WEATHER_MAP_GROUP_SIZE = int(env("OPEN_WEATHER_MAP_GROUP_SIZE", 20))
+WEATHER_REFRESH_MAX_AGE = int(env("WEATHER_REFRESH_MAX_AGE", 60 * 2))
+
+# Cache
+WEATHER_CACHE_MIN_TTL = int(env("WEATHER_CACHE_MIN_TTL", 30))
+WEATHER_CACHE_MAX_TTL = int(env("WEATHER_CACHE_MAX_TTL", 60 * 60))
+WEATHER_DEFAULT_UPDATE_INTERVAL = int(env("WEATHER_DEFAULT_UPDATE_INTERVAL", 60 * 10))
+WEATHER_UPDATE_INTERVAL_SMOOTHING = float(env("WEATHER_UPDATE_INTERVAL_SMOOTHING", 0.3))
+
+# Write-behind persistence
+WEATHER_WRITE_BEHIND = env("WEATHER_WRITE_BEHIND", "false").lower() == "true"
+WEATHER_WRITE_BEHIND_QUEUE_SIZE = int(env("WEATHER_WRITE_BEHIND_QUEUE_SIZE", 1000))
+WEATHER_WRITE_BEHIND_BATCH_SIZE = int(env("WEATHER_WRITE_BEHIND_BATCH_SIZE", 100))
+WEATHER_WRITE_BEHIND_FLUSH_INTERVAL = float(
+    env("WEATHER_WRITE_BEHIND_FLUSH_INTERVAL", 0.5)
 )
-OPEN_WEATHER_MAP_ONE_CALL_KEY = os.environ.get(
-    "OPEN_WEATHER_MAP_ONE_CALL_KEY", "your_open_weather_one_call_key"
+WEATHER_WRITE_BEHIND_PUT_TIMEOUT = float(env("WEATHER_WRITE_BEHIND_PUT_TIMEOUT", 0.05))
+
+# Forecast grid cache
+FORECAST_GRID_RESOLUTION = float(env("FORECAST_GRID_RESOLUTION", 0.1))
+FORECAST_GRID_CACHE_TTL = int(env("FORECAST_GRID_CACHE_TTL", 60 * 10))
+
+# Coordinate lookups
+COORDINATE_CACHE_PRECISION = int(env("COORDINATE_CACHE_PRECISION", 2))
+UPSTREAM_MAX_WORKERS = int(env("UPSTREAM_MAX_WORKERS", 16))
+
+# Upstream admission control
+UPSTREAM_MAX_CONCURRENT = int(env("UPSTREAM_MAX_CONCURRENT", 32))
+UPSTREAM_ADMISSION_TIMEOUT = float(env("UPSTREAM_ADMISSION_TIMEOUT", 0.1))
+UPSTREAM_RETRY_AFTER = int(env("UPSTREAM_RETRY_AFTER", 5))
+
+# Hedged upstream requests
+UPSTREAM_HEDGING = env("UPSTREAM_HEDGING", "false").lower() == "true"
+UPSTREAM_HEDGE_PERCENTILE = float(env("UPSTREAM_HEDGE_PERCENTILE", 0.95))
+UPSTREAM_HEDGE_WINDOW = int(env("UPSTREAM_HEDGE_WINDOW", 200))
+UPSTREAM_HEDGE_MIN_SAMPLES = int(env("UPSTREAM_HEDGE_MIN_SAMPLES", 20))
+UPSTREAM_HEDGE_INITIAL_DELAY = float(env("UPSTREAM_HEDGE_INITIAL_DELAY", 1))
+UPSTREAM_HEDGE_MIN_DELAY = float(env("UPSTREAM_HEDGE_MIN_DELAY", 0.05))
+UPSTREAM_HEDGE_MAX_RATIO = float(env("UPSTREAM_HEDGE_MAX_RATIO", 0.05))
+UPSTREAM_HEDGE_MAX_WORKERS = int(env("UPSTREAM_HEDGE_MAX_WORKERS", 32))
+
+# Hourly forecast
+HOURLY_PAGE_SIZE = int(env("HOURLY_PAGE_SIZE", 12))
+HOURLY_MAX_PAGE_SIZE = int(env("HOURLY_MAX_PAGE_SIZE", 48))
+
+# Bulk export
+EXPORT_BATCH_SIZE = int(env("EXPORT_BATCH_SIZE", 1000))
+
+# Bulk seeding
+SEED_CHUNK_SIZE = int(env("SEED_CHUNK_SIZE", 1000))
+
+# City listing
+CITIES_PAGE_SIZE = int(env("CITIES_PAGE_SIZE", 50))
+CITIES_MAX_PAGE_SIZE = int(env("CITIES_MAX_PAGE_SIZE", 500))
+
+# City autocomplete
+AUTOCOMPLETE_LIMIT = int(env("AUTOCOMPLETE_LIMIT", 10))
+AUTOCOMPLETE_MAX_LIMIT = int(env("AUTOCOMPLETE_MAX_LIMIT", 50))
+
+# Map tiles
+TILE_MAX_ZOOM = int(env("TILE_MAX_ZOOM", 12))
+TILE_GRID_SIZE = int(env("TILE_GRID_SIZE", 4))
+TILE_CACHE_TTL = int(env("TILE_CACHE_TTL", 60 * 60))
+
+# Request profiling
+PROFILING_TOKEN = env("PROFILING_TOKEN", "")
+PROFILING_SAMPLE_RATE = float(env("PROFILING_SAMPLE_RATE", 0))
+PROFILING_STORAGE = env("PROFILING_STORAGE", "cache")
+PROFILING_DIR = env("PROFILING_DIR", "/tmp/weather-profiles")
+PROFILING_TTL = int(env("PROFILING_TTL", 60 * 60 * 24))
+PROFILING_TOP_N = int(env("PROFILING_TOP_N", 25))
+PROFILING_TRACEMALLOC_FRAMES = int(env("PROFILING_TRACEMALLOC_FRAMES", 5))
+
+# Weather update stream
+WEATHER_STREAM = env("WEATHER_STREAM", "false").lower() == "true"
+WEATHER_STREAM_REDIS_URL = env(
+    "WEATHER_STREAM_REDIS_URL", env("REDIS_HOST", "redis://localhost:6379")
 )
+WEATHER_STREAM_MAX_CITIES = int(env("WEATHER_STREAM_MAX_CITIES", 50))
+WEATHER_STREAM_QUEUE_SIZE = int(env("WEATHER_STREAM_QUEUE_SIZE", 16))
+WEATHER_STREAM_HEARTBEAT = int(env("WEATHER_STREAM_HEARTBEAT", 15))
+
+# Delta responses
+WEATHER_RENDER_HISTORY_SIZE = int(env("WEATHER_RENDER_HISTORY_SIZE", 4))
+WEATHER_RENDER_HISTORY_TTL = int(env("WEATHER_RENDER_HISTORY_TTL", 60 * 60 * 6))
+
+# Weather alerts
+ALERTS_REDIS_URL = env("ALERTS_REDIS_URL", env("REDIS_HOST", "redis://localhost:6379"))
+ALERTS_STREAM_KEY = env("ALERTS_STREAM_KEY", "weather:alerts")
+ALERTS_STREAM_MAXLEN = int(env("ALERTS_STREAM_MAXLEN", 10000))
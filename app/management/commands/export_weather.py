@@ -0,0 +1,63 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.constants import EXPORT_BATCH_SIZE
+from app.utils.export import export_fields, iter_weather_batches, ndjson_chunks
+
+
+class Command(BaseCommand):
+    help = "Exports every stored Weather document as NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output",
+            help="The file to write, or - for standard output. Files ending in .gz are gzip-compressed.",
+        )
+        parser.add_argument(
+            "--fields",
+            help="Comma-separated Weather document fields to export. Defaults to every stored field.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Gzip-compress the output regardless of its file name.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=EXPORT_BATCH_SIZE,
+            help="The number of documents read per database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            fields = export_fields(options["fields"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = options["output"]
+        compress = options["gzip"] or output.endswith(".gz")
+        if output == "-":
+            stream = gzip.GzipFile(fileobj=sys.stdout.buffer) if compress else None
+        else:
+            stream = gzip.open(output, "wb") if compress else open(output, "wb")
+
+        exported = 0
+        try:
+            for batch in iter_weather_batches(fields, options["batch_size"]):
+                exported += len(batch)
+                for chunk in ndjson_chunks([batch]):
+                    if stream is None:
+                        self.stdout.write(chunk.decode(), ending="")
+                    else:
+                        stream.write(chunk)
+        finally:
+            if stream is not None:
+                stream.close()
+
+        if output != "-":
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported {exported} cities to {output}")
+            )
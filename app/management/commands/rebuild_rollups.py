@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from app.utils.rollups import rebuild_country_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the country rollups from every stored city. Run it while no weather is "
+        "being stored, after an initial import or to correct drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of documents read and written per round trip.",
+        )
+
+    def handle(self, *args, **options):
+        countries = rebuild_country_rollups(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {countries} country rollups"))
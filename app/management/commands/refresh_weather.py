@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from app.constants import WEATHER_REFRESH_MAX_AGE
+from app.utils.weather_refresh import refresh_weather_group
+
+
+class Command(BaseCommand):
+    help = "Refreshes the current weather of stored cities using OpenWeatherMap group requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ids",
+            nargs="+",
+            type=int,
+            help="City ids to refresh. Defaults to every stored city.",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=WEATHER_REFRESH_MAX_AGE,
+            help="Only refresh cities updated more than this many seconds ago.",
+        )
+
+    def handle(self, *args, **options):
+        stats = refresh_weather_group(options["ids"], max_age=options["max_age"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Refreshed {updated}/{selected} cities with {calls} upstream calls "
+                "({skipped} unchanged, {failed} failed)".format(**stats)
+            )
+        )
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.constants import SEED_CHUNK_SIZE
+from app.utils.seed import iter_jsonl_chunks, seed_weather_chunk
+
+
+class Command(BaseCommand):
+    help = "Seeds Weather documents from JSONL files of upstream weather payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help="JSONL files with one weather payload per line. Files ending in .gz are decompressed.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SEED_CHUNK_SIZE,
+            help="The number of lines validated and written per bulk write.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        lines = written = invalid_lines = 0
+
+        for chunk in iter_jsonl_chunks(options["paths"], options["chunk_size"]):
+            chunk_written, invalid = seed_weather_chunk(chunk)
+            lines += len(chunk)
+            written += chunk_written
+            invalid_lines += len(invalid)
+            for location, errors in invalid:
+                self.stderr.write(f"{location}: {errors}")
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Processed {lines} lines, {written} cities written "
+                f"({lines / elapsed:.0f} lines/s)"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {written} cities from {lines} lines in {elapsed:.2f}s "
+                f"({invalid_lines} invalid)"
+            )
+        )
@@ -0,0 +1,41 @@
+import marshal
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.utils.profiling import load_profile
+
+
+class Command(BaseCommand):
+    help = "Shows a request profile captured by the profiling middleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile_id", help="The X-Profile-Id of the request.")
+        parser.add_argument(
+            "--output",
+            help="Also write the pstats call tree to this file, for pstats or snakeviz.",
+        )
+
+    def handle(self, *args, **options):
+        profile = load_profile(options["profile_id"])
+        if profile is None:
+            raise CommandError(f"Profile {options['profile_id']} not found")
+
+        self.stdout.write(
+            f"{profile['method']} {profile['path']} -> {profile['status']} "
+            f"in {profile['duration'] * 1000:.1f} ms, "
+            f"peak traced memory {profile['peak_traced_memory'] / 1024:.1f} KiB"
+        )
+        self.stdout.write(profile["summary"])
+        self.stdout.write("Top allocations:")
+        for allocation in profile["allocations"]:
+            self.stdout.write(
+                f"{allocation['size_diff'] / 1024:+10.1f} KiB "
+                f"{allocation['count_diff']:+8d} blocks  {allocation['location']}"
+            )
+
+        if options["output"]:
+            # Validate before writing, so a corrupt profile does not produce an unreadable file.
+            marshal.loads(profile["stats"])
+            Path(options["output"]).write_bytes(profile["stats"])
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
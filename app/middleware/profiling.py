@@ -0,0 +1,61 @@
+import hmac
+import logging
+import random
+import uuid
+
+from app.constants import PROFILING_SAMPLE_RATE, PROFILING_TOKEN
+from app.utils.metrics import increment, register_metric
+from app.utils.profiling import RequestProfiler, store_profile
+
+logger = logging.getLogger(__name__)
+
+PROFILES_CAPTURED_METRIC = register_metric("profiles.captured")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when it carries an `X-Profile-Token` header matching PROFILING_TOKEN, or
+    at random for a PROFILING_SAMPLE_RATE fraction of requests. The profile is stored under a
+    request id returned in the `X-Profile-Id` response header, and can be read back with
+    `python manage.py show_profile <id>`.
+
+    Requests that are not selected only pay for the header check and a random draw.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._should_profile(request):
+            return self.get_response(request)
+
+        profiler = RequestProfiler()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile = profiler.stop()
+
+        profile_id = uuid.uuid4().hex
+        profile.update(
+            {
+                "id": profile_id,
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+            }
+        )
+        try:
+            store_profile(profile_id, profile)
+        except Exception:
+            logger.exception("Failed to store profile %s", profile_id)
+            return response
+        increment(PROFILES_CAPTURED_METRIC)
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    def _should_profile(self, request) -> bool:
+        token = request.headers.get("X-Profile-Token")
+        if token and PROFILING_TOKEN:
+            return hmac.compare_digest(token, PROFILING_TOKEN)
+        return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
@@ -1 +1,5 @@
+from .alert_rule import AlertRule
+from .country_rollup import CountryRollup
 from .weather import Weather
+
+__all__ = ["AlertRule", "CountryRollup", "Weather"]
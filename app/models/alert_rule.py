@@ -0,0 +1,33 @@
+from datetime import datetime
+from mongoengine import (
+    BooleanField,
+    DateTimeField,
+    Document,
+    FloatField,
+    IntField,
+    StringField,
+)
+import pytz
+
+from app.models.enums import AlertMetric, AlertOperator
+
+
+class AlertRule(Document):
+    city_id = IntField(required=True)
+    metric = StringField(
+        required=True, choices=[metric.value for metric in AlertMetric]
+    )
+    operator = StringField(
+        required=True, choices=[operator.value for operator in AlertOperator]
+    )
+    # In Kelvin for temperatures, m/s for wind speeds, % for humidity and hPa for pressure.
+    threshold = FloatField(required=True)
+    label = StringField()
+    # Whether the condition held at the last evaluation, so alerts only fire when it starts holding.
+    triggered = BooleanField(default=False)
+    created_at = DateTimeField(default=lambda: datetime.now(tz=pytz.UTC))
+
+    meta = {
+        # Rules are loaded by city on every refresh.
+        "indexes": [("city_id", "metric")]
+    }
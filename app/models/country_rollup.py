@@ -0,0 +1,23 @@
+from datetime import datetime
+from mongoengine import (
+    DateTimeField,
+    DictField,
+    Document,
+    FloatField,
+    IntField,
+    StringField,
+)
+import pytz
+
+
+class CountryRollup(Document):
+    # The 2-character country code of the stored cities.
+    country = StringField(primary_key=True)
+    cities = IntField(default=0)
+    # The sum of the current temperatures of the cities, in Kelvin.
+    temp_sum = FloatField(default=0.0)
+    # The number of cities in each Beaufort scale, by the position of the scale.
+    wind_scales = DictField()
+    # The highest wind speed stored since the rollup was built, in m/s.
+    wind_peak = FloatField(default=0.0)
+    updated_at = DateTimeField(default=lambda: datetime.now(tz=pytz.UTC))
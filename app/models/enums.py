@@ -17,11 +17,15 @@ class BeaufortScale(Enum):
     HURRICANE = (float("inf"), "Hurricane")
 
     @classmethod
-    def get_description(cls, wind_speed: float) -> str:
+    def get_scale(cls, wind_speed: float) -> "BeaufortScale":
         for scale in cls:
             if wind_speed <= scale.value[0]:
-                return scale.value[1]
-        return cls.HURRICANE.value[1]
+                return scale
+        return cls.HURRICANE
+
+    @classmethod
+    def get_description(cls, wind_speed: float) -> str:
+        return cls.get_scale(wind_speed).description
 
     @property
     def scale(self) -> str:
@@ -31,6 +35,13 @@ class BeaufortScale(Enum):
     def description(self) -> str:
         return self.value[1]
 
+    @property
+    def lower_bound(self) -> float:
+        """The wind speed above which this scale starts, the upper bound of the previous one."""
+        members = list(type(self))
+        index = members.index(self)
+        return members[index - 1].value[0] if index else 0.0
+
 
 class WindDirection(Enum):
     NORTH = "North"
@@ -55,3 +66,21 @@ class TemperatureUnit(Enum):
     CELSIUS = "metric"
     FAHRENHEIT = "imperial"
     KELVIN = "standard"
+
+
+class WeatherInclude(Enum):
+    ALL = "all"
+    CURRENT = "current"
+    FORECAST = "forecast"
+
+
+class AlertMetric(Enum):
+    TEMPERATURE = "temperature"
+    WIND_SPEED = "wind_speed"
+    HUMIDITY = "humidity"
+    PRESSURE = "pressure"
+
+
+class AlertOperator(Enum):
+    ABOVE = "above"
+    BELOW = "below"
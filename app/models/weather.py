@@ -4,6 +4,7 @@ from mongoengine import (
     StringField,
     FloatField,
     DateTimeField,
+    DictField,
     EmbeddedDocument,
     EmbeddedDocumentField,
     ListField,
@@ -64,8 +65,25 @@ class Weather(Document):
     wind = EmbeddedDocumentField(Wind)
     clouds = EmbeddedDocumentField(Clouds)
     dt = IntField()
+    dt_interval = IntField()
     sys = EmbeddedDocumentField(Sys)
     timezone = IntField()
     name = StringField()
     cod = IntField()
     forecast = ListField()
+    forecast_hash = StringField()
+    hourly = DictField()
+    # The country, temperature and Beaufort scale last counted in the country rollups.
+    rollup = DictField()
+
+    meta = {
+        # Keyset pagination of the city listing seeks on (sort field, _id), optionally per country.
+        "indexes": [
+            ("name", "_id"),
+            ("updated_at", "_id"),
+            ("sys.country", "name", "_id"),
+            ("sys.country", "updated_at", "_id"),
+            # Bounding-box queries of the map tiles.
+            ("coord.lon", "coord.lat"),
+        ]
+    }
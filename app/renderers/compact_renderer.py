@@ -0,0 +1,28 @@
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """
+    Selected with `?format=compact`. Views that list it render their data with
+    CompactWeatherSerializer when it is the accepted renderer.
+    """
+
+    media_type = "application/vnd.weather.compact+json"
+    format = "compact"
+
+
+class CompactFormatMixin:
+    """
+    Offers CompactJSONRenderer next to the default renderers of an APIView.
+    The compact format can also be negotiated with the Accept header, so responses vary on it
+    and the page cache keeps the JSON and compact bodies of a URL apart.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ("Accept",))
+        return response
@@ -0,0 +1,68 @@
+from typing import Any, Dict
+
+from rest_framework import serializers
+
+from app.models import AlertRule
+from app.models.enums import AlertMetric, AlertOperator, BeaufortScale, TemperatureUnit
+from app.utils.formatters import to_kelvin
+
+
+class AlertRuleSerializer(serializers.Serializer):
+    id = serializers.CharField(read_only=True)
+    city_id = serializers.IntegerField(min_value=1)
+    metric = serializers.ChoiceField(choices=[metric.value for metric in AlertMetric])
+    operator = serializers.ChoiceField(
+        choices=[operator.value for operator in AlertOperator]
+    )
+    threshold = serializers.FloatField(required=False)
+    # A Beaufort scale name, such as `gale`, instead of a wind speed threshold.
+    beaufort = serializers.ChoiceField(
+        choices=[scale.name.lower() for scale in BeaufortScale],
+        required=False,
+        write_only=True,
+    )
+    # The unit of a temperature threshold. Thresholds are stored in Kelvin.
+    unit = serializers.ChoiceField(
+        choices=[unit.value for unit in TemperatureUnit],
+        default=TemperatureUnit.CELSIUS.value,
+        write_only=True,
+    )
+    label = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    triggered = serializers.BooleanField(read_only=True)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalizes the threshold to the stored units.
+        A Beaufort scale is converted to the wind speed where it starts, so `above gale` holds
+        from a gale upwards.
+        Args:
+            attrs (Dict[str, Any]): The validated fields.
+        Returns:
+            Dict[str, Any]: The fields of the AlertRule document.
+        Raises:
+            serializers.ValidationError: If both or neither of threshold and beaufort are given,
+                or if beaufort is used with a metric other than wind_speed.
+        """
+
+        beaufort = attrs.pop("beaufort", None)
+        unit = attrs.pop("unit")
+        if beaufort is not None:
+            if attrs["metric"] != AlertMetric.WIND_SPEED.value:
+                raise serializers.ValidationError(
+                    {"beaufort": "beaufort only applies to the wind_speed metric"}
+                )
+            if "threshold" in attrs:
+                raise serializers.ValidationError(
+                    {"threshold": "Give either threshold or beaufort, not both"}
+                )
+            attrs["threshold"] = BeaufortScale[beaufort.upper()].lower_bound
+        elif "threshold" not in attrs:
+            raise serializers.ValidationError(
+                {"threshold": "threshold or beaufort is required"}
+            )
+        elif attrs["metric"] == AlertMetric.TEMPERATURE.value:
+            attrs["threshold"] = to_kelvin(attrs["threshold"], unit)
+        return attrs
+
+    def create(self, validated_data: Dict[str, Any]) -> AlertRule:
+        return AlertRule(**validated_data).save()
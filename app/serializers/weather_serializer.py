@@ -1,11 +1,18 @@
-from typing import Any, Dict
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import pytz
 from rest_framework import serializers
 
 from datetime import datetime, timedelta
 
-from app.models.enums import BeaufortScale, TemperatureUnit, WindDirection
-from app.utils.formatters import parse_temperature
+from app.models.enums import (
+    BeaufortScale,
+    TemperatureUnit,
+    WeatherInclude,
+    WindDirection,
+)
+from app.utils.formatters import convert_temperature, parse_temperature
+from app.utils.hourly import hourly_index
 
 
 class CoordSerializer(serializers.Serializer):
@@ -63,18 +70,53 @@ class WeatherSerializer(serializers.Serializer):
     name = serializers.CharField()
     cod = serializers.IntegerField()
     forecast = serializers.ListField(child=serializers.DictField(), required=False)
+    hourly = serializers.DictField(required=False, allow_null=True)
+
+
+CURRENT_RESPONSE_FIELDS = (
+    "location_name",
+    "temperature",
+    "wind",
+    "cloudiness",
+    "pressure",
+    "humidity",
+    "sunrise",
+    "sunset",
+    "geo_coordinates",
+    "requested_time",
+)
+
+FORECAST_RESPONSE_FIELDS = ("geo_coordinates", "requested_time", "forecast")
 
 
 class WeatherResponseSerializer(WeatherSerializer):
+    # Weather document fields read by each response field.
+    field_sources = {
+        "location_name": ("name", "sys.country"),
+        "temperature": ("main.temp",),
+        "wind": ("wind",),
+        "cloudiness": ("weather",),
+        "pressure": ("main.pressure",),
+        "humidity": ("main.humidity",),
+        "sunrise": ("sys.sunrise", "timezone"),
+        "sunset": ("sys.sunset", "timezone"),
+        "geo_coordinates": ("coord",),
+        "requested_time": (),
+        "forecast": ("forecast",),
+    }
+
     def get_location_name(self, instance: Dict[str, Any]) -> str:
         """
         Retrieves the location name from the given instance.
         Args:
             instance (Dict[str, Any]): A dictionary containing weather data.
         Returns:
-            str: The location name in the format "name, country".
+            str: The location name in the format "name, country", or an empty string for
+                locations away from any city.
         """
 
+        if not instance.get("name"):
+            return ""
         return instance["name"] + ", " + instance["sys"]["country"]
 
     def get_temperature(self, instance: Dict[str, Any], forecast: bool = False) -> str:
@@ -250,28 +292,297 @@ class WeatherResponseSerializer(WeatherSerializer):
 
         return datetime.now(tz=pytz.UTC).strftime("%Y-%m-%d %H:%M:%S")
 
+    def get_forecast(self, instance: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Formats the daily forecast of the given instance.
+        Args:
+            instance (Dict[str, Any]): A dictionary containing weather data.
+        Returns:
+            List[Dict[str, Any]]: The formatted forecast days, empty if no forecast is stored.
+        """
+
+        return [
+            {
+                "temperature": self.get_temperature(forecast_instance, True),
+                "wind": self.get_wind(forecast_instance, True),
+                "cloudiness": self.get_cloudiness(forecast_instance, True),
+                "pressure": self.get_pressure(forecast_instance, True),
+                "humidity": self.get_humidity(forecast_instance, True),
+                "sunrise": self.get_sunrise(forecast_instance, True),
+                "sunset": self.get_sunset(forecast_instance, True),
+            }
+            for forecast_instance in instance.get("forecast", [])
+        ]
+
+    @classmethod
+    def parse_fields(cls, value: Optional[str]) -> Optional[List[str]]:
+        """
+        Parses a comma-separated list of response fields.
+        Args:
+            value (str, optional): The value of the `fields` query parameter.
+        Returns:
+            List[str] | None: The requested response fields, or None to render every field.
+        Raises:
+            serializers.ValidationError: If a field is not a response field.
+        """
+
+        if not value:
+            return None
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = [field for field in fields if field not in cls.field_sources]
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Unknown response fields: {', '.join(unknown)}"}
+            )
+        return fields
+
+    def get_sections(self) -> Tuple[str, ...]:
+        """
+        Returns the response fields to render, given the `include` and `fields` context values.
+        Returns:
+            Tuple[str, ...]: The response fields, in response order.
+        """
+
+        include = self.context.get("include", WeatherInclude.ALL.value)
+        if include == WeatherInclude.FORECAST.value:
+            sections = FORECAST_RESPONSE_FIELDS
+        elif include == WeatherInclude.CURRENT.value:
+            sections = CURRENT_RESPONSE_FIELDS
+        else:
+            sections = CURRENT_RESPONSE_FIELDS + ("forecast",)
+
+        fields = self.context.get("fields")
+        if fields is None:
+            return sections
+        return tuple(section for section in sections if section in fields)
+
+    def get_projection(self) -> Tuple[str, ...]:
+        """
+        Returns the Weather document fields read when rendering the requested response fields.
+        The observation time and update interval are always included to compute the cache expiry.
+        Returns:
+            Tuple[str, ...]: The document fields to project from MongoDB.
+        """
+
+        projection = {"dt": None, "dt_interval": None}
+        for section in self.get_sections():
+            projection.update(dict.fromkeys(self.field_sources[section]))
+        return tuple(projection)
+
     def to_representation(self, instance):
+        renderers = {
+            "location_name": lambda: self.get_location_name(instance),
+            "temperature": lambda: self.get_temperature(instance),
+            "wind": lambda: self.get_wind(instance),
+            "cloudiness": lambda: self.get_cloudiness(instance),
+            "pressure": lambda: self.get_pressure(instance),
+            "humidity": lambda: self.get_humidity(instance),
+            "sunrise": lambda: self.get_sunrise(instance),
+            "sunset": lambda: self.get_sunset(instance),
+            "geo_coordinates": lambda: self.geo_coordinates(instance),
+            "requested_time": lambda: self.request_time,
+            "forecast": lambda: self.get_forecast(instance),
+        }
+        return {section: renderers[section]() for section in self.get_sections()}
+
+
+# Symbols of the temperature units, used to tag compact temperature values.
+TEMPERATURE_UNIT_SYMBOLS = {
+    TemperatureUnit.CELSIUS.value: "°C",
+    TemperatureUnit.FAHRENHEIT.value: "°F",
+    TemperatureUnit.KELVIN.value: "K",
+}
+
+# Units of the compact current weather values, besides temperatures.
+COMPACT_CURRENT_UNITS = {
+    "wind_speed": "m/s",
+    "wind_deg": "deg",
+    "pressure": "hPa",
+    "humidity": "%",
+    "cloudiness": "text",
+    "sunrise": "unix",
+    "sunset": "unix",
+}
+
+# Temperatures of a forecast day, each rendered as a `temp_<name>` column.
+COMPACT_FORECAST_TEMPERATURES = ("day", "min", "max", "night", "eve", "morn")
+
+
+class CompactWeatherSerializer(WeatherResponseSerializer):
+    """
+    Renders weather data as numbers instead of formatted strings, with the forecast as one array
+    per field. A `schema` header gives the unit of every value.
+    """
+
+    def get_projection(self) -> Tuple[str, ...]:
+        projection = ("dt", "dt_interval", "name", "sys", "coord", "timezone")
+        include = self.context.get("include", WeatherInclude.ALL.value)
+        if include != WeatherInclude.FORECAST.value:
+            projection += ("main", "wind", "weather")
+        if include != WeatherInclude.CURRENT.value:
+            projection += ("forecast",)
+        return projection
+
+    def get_compact_current(self, instance: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Renders the current weather as numbers.
+        Args:
+            instance (Dict[str, Any]): A dictionary containing weather data.
+        Returns:
+            Dict[str, Any]: The current weather values, in the units of the schema.
+        """
+
+        unit = self.context.get("unit", TemperatureUnit.CELSIUS.value)
         return {
-            "location_name": self.get_location_name(instance),
-            "temperature": self.get_temperature(instance),
-            "wind": self.get_wind(instance),
-            "cloudiness": self.get_cloudiness(instance),
-            "pressure": self.get_pressure(instance),
-            "humidity": self.get_humidity(instance),
-            "sunrise": self.get_sunrise(instance),
-            "sunset": self.get_sunset(instance),
-            "geo_coordinates": self.geo_coordinates(instance),
-            "requested_time": self.request_time,
-            "forecast": [
+            "temperature": convert_temperature(instance["main"]["temp"], unit),
+            "feels_like": convert_temperature(instance["main"]["feels_like"], unit),
+            "wind_speed": instance["wind"]["speed"],
+            "wind_deg": instance["wind"]["deg"],
+            "pressure": instance["main"]["pressure"],
+            "humidity": instance["main"]["humidity"],
+            "cloudiness": instance["weather"][0]["description"],
+            "sunrise": instance["sys"]["sunrise"],
+            "sunset": instance["sys"]["sunset"],
+        }
+
+    def get_compact_forecast(self, instance: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        Renders the daily forecast as one array per field, in a single pass over the days.
+        Args:
+            instance (Dict[str, Any]): A dictionary containing weather data.
+        Returns:
+            Dict[str, List[Any]]: The forecast columns, in the units of the schema.
+        """
+
+        unit = self.context.get("unit", TemperatureUnit.CELSIUS.value)
+        columns = {"dt": []}
+        columns.update({f"temp_{name}": [] for name in COMPACT_FORECAST_TEMPERATURES})
+        columns.update({field: [] for field in COMPACT_CURRENT_UNITS})
+        for day in instance.get("forecast", []):
+            columns["dt"].append(day["dt"])
+            for name in COMPACT_FORECAST_TEMPERATURES:
+                columns[f"temp_{name}"].append(
+                    convert_temperature(day["temp"][name], unit)
+                )
+            columns["wind_speed"].append(day["wind_speed"])
+            columns["wind_deg"].append(day["wind_deg"])
+            columns["pressure"].append(day["pressure"])
+            columns["humidity"].append(day["humidity"])
+            columns["cloudiness"].append(day["weather"][0]["description"])
+            columns["sunrise"].append(day["sunrise"])
+            columns["sunset"].append(day["sunset"])
+        return columns
+
+    def get_schema(self, current: bool, forecast: bool) -> Dict[str, Dict[str, str]]:
+        """
+        Returns the units of the compact values.
+        Args:
+            current (bool): Whether the current weather is rendered.
+            forecast (bool): Whether the forecast is rendered.
+        Returns:
+            Dict[str, Dict[str, str]]: The unit of each rendered value, by section.
+        """
+
+        symbol = TEMPERATURE_UNIT_SYMBOLS.get(
+            self.context.get("unit", TemperatureUnit.CELSIUS.value), "K"
+        )
+        schema = {"location": {"lat": "deg", "lon": "deg", "timezone": "s"}}
+        if current:
+            schema["current"] = {
+                "temperature": symbol,
+                "feels_like": symbol,
+                **COMPACT_CURRENT_UNITS,
+            }
+        if forecast:
+            schema["forecast"] = {
+                "dt": "unix",
+                **{f"temp_{name}": symbol for name in COMPACT_FORECAST_TEMPERATURES},
+                **COMPACT_CURRENT_UNITS,
+            }
+        return schema
+
+    def to_representation(self, instance):
+        include = self.context.get("include", WeatherInclude.ALL.value)
+        current = include != WeatherInclude.FORECAST.value and "main" in instance
+        forecast = include != WeatherInclude.CURRENT.value
+        location = {
+            "lat": instance["coord"]["lat"],
+            "lon": instance["coord"]["lon"],
+            "timezone": instance.get("timezone"),
+        }
+        if instance.get("name"):
+            location.update(
                 {
-                    "temperature": self.get_temperature(forecast_instance, True),
-                    "wind": self.get_wind(forecast_instance, True),
-                    "cloudiness": self.get_cloudiness(forecast_instance, True),
-                    "pressure": self.get_pressure(forecast_instance, True),
-                    "humidity": self.get_humidity(forecast_instance, True),
-                    "sunrise": self.get_sunrise(forecast_instance, True),
-                    "sunset": self.get_sunset(forecast_instance, True),
+                    "id": instance.get("id"),
+                    "name": instance["name"],
+                    "country": instance["sys"]["country"],
                 }
-                for forecast_instance in instance["forecast"]
-            ],
+            )
+        data = {
+            "schema": self.get_schema(current, forecast),
+            "dt": instance.get("dt"),
+            "location": location,
         }
+        if current:
+            data["current"] = self.get_compact_current(instance)
+        if forecast:
+            data["forecast"] = self.get_compact_forecast(instance)
+        return data
+
+
+class HourlyForecastSerializer(WeatherResponseSerializer):
+    def iter_hours(
+        self, hourly: Dict[str, Any], timezone: int, start: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily formats the hours of a compact hourly forecast, starting at a position.
+        Args:
+            hourly (Dict[str, Any]): The compact hourly forecast of a Weather document.
+            timezone (int): The offset from UTC of the city in seconds.
+            start (int): The position of the first hour to format.
+        Yields:
+            Dict[str, Any]: The formatted hour.
+        """
+
+        unit = self.context.get("unit", TemperatureUnit.CELSIUS.value)
+        for index in range(start, hourly["size"]):
+            timestamp = hourly["start"] + index * hourly["step"]
+            wind_speed = hourly["wind_speed"][index]
+            yield {
+                "dt": timestamp,
+                "time": self.get_local_time(timestamp, timezone),
+                "temperature": parse_temperature(hourly["temp"][index], unit),
+                "wind": f"{self.get_beaufort_scale(wind_speed)}, {wind_speed} m/s, "
+                f"{self.get_wind_direction(hourly['wind_deg'][index])}",
+                "cloudiness": hourly["descriptions"][
+                    hourly["weather"][index]
+                ].capitalize(),
+                "pressure": str(hourly["pressure"][index]) + " hPa",
+                "humidity": str(hourly["humidity"][index]) + "%",
+                "precipitation": str(round(hourly["pop"][index] * 100)) + "%",
+            }
+
+    def to_representation(self, instance):
+        """
+        Renders one page of the hourly forecast. Only the hours of the page are formatted.
+        The `cursor` context value is the timestamp of the first hour and `limit` the page size.
+        Args:
+            instance (Dict[str, Any]): A dictionary containing the `hourly` and `timezone` of a city.
+        Returns:
+            Dict[str, Any]: The formatted hours and the cursor of the next page, or None on the last page.
+        """
+
+        hourly = instance.get("hourly")
+        if not hourly:
+            return {"hours": [], "next_cursor": None}
+
+        limit = self.context["limit"]
+        start = hourly_index(hourly, self.context.get("cursor"))
+        hours = list(
+            islice(self.iter_hours(hourly, instance["timezone"], start), limit)
+        )
+        next_index = start + limit
+        next_cursor = None
+        if next_index < hourly["size"]:
+            next_cursor = hourly["start"] + next_index * hourly["step"]
+        return {"hours": hours, "next_cursor": next_cursor}
@@ -0,0 +1,30 @@
+import logging
+from typing import Any, Iterable
+
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+# Sent after Weather documents are written, with the `city_ids` that were stored.
+weather_stored = Signal()
+
+
+def notify_weather_stored(sender: Any, city_ids: Iterable[int]) -> None:
+    """
+    Sends `weather_stored` for written cities. Receiver errors are logged rather than raised,
+    so they never fail the write that triggered them.
+    Args:
+        sender (Any): The component that wrote the documents.
+        city_ids (Iterable[int]): The ids of the stored cities.
+    """
+
+    city_ids = list(city_ids)
+    if not city_ids:
+        return
+    for receiver, result in weather_stored.send_robust(sender, city_ids=city_ids):
+        if isinstance(result, Exception):
+            logger.error(
+                "weather_stored receiver %r failed",
+                receiver,
+                exc_info=(type(result), result, result.__traceback__),
+            )
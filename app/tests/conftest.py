@@ -0,0 +1,19 @@
+import pytest
+from mongoengine import DEFAULT_CONNECTION_NAME, connect, disconnect
+import mongomock
+from django.conf import settings as django_settings
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    # Both aliases get the same mongomock client, so reads see the writes.
+    for alias in (DEFAULT_CONNECTION_NAME, django_settings.MONGO_READ_ALIAS):
+        disconnect(alias)
+    for alias in (DEFAULT_CONNECTION_NAME, django_settings.MONGO_READ_ALIAS):
+        connect(
+            "mongoenginetest",
+            alias=alias,
+            host="mongodb://localhost",
+            mongo_client_class=mongomock.MongoClient,
+            uuidRepresentation="standard",
+        )
@@ -2,6 +2,7 @@ import pytest
 import pytz
 from mongoengine import connect, disconnect
 import mongomock
+from rest_framework.exceptions import ValidationError
 from app.serializers.weather_serializer import WeatherResponseSerializer
 from datetime import datetime
 
@@ -144,3 +145,35 @@ def test_to_representation(serializer, instance):
         "requested_time": serializer.request_time,
     }
     assert result == expected
+
+
+def test_to_representation_sparse_fields(instance):
+    serializer = WeatherResponseSerializer(context={"fields": ["temperature", "wind"]})
+    result = serializer.to_representation(instance)
+    assert result == {
+        "temperature": "20°C",
+        "wind": "Light air, 1.5 m/s, North-Northwest",
+    }
+
+
+def test_parse_fields():
+    assert WeatherResponseSerializer.parse_fields(None) is None
+    assert WeatherResponseSerializer.parse_fields("temperature, wind") == [
+        "temperature",
+        "wind",
+    ]
+    with pytest.raises(ValidationError):
+        WeatherResponseSerializer.parse_fields("temperature,visibility")
+
+
+def test_get_projection():
+    serializer = WeatherResponseSerializer(
+        context={"fields": ["temperature", "sunrise"]}
+    )
+    assert serializer.get_projection() == (
+        "dt",
+        "dt_interval",
+        "main.temp",
+        "sys.sunrise",
+        "timezone",
+    )
@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.admission import AdmissionGate
+from app.utils.persistence import find_weather_document
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+        "forecast": [],
+    }
+
+
+@pytest.fixture
+def saturated(mocker):
+    """Replaces the upstream gate with a single-slot gate whose slot is already taken."""
+    gate = AdmissionGate(1, 0)
+    mocker.patch("app.views.weather_view.upstream_admission", gate)
+    mocker.patch("app.views.weather_batch_view.upstream_admission", gate)
+    with gate.admit() as admitted:
+        assert admitted
+        yield gate
+
+
+def test_admission_gate_limits_concurrency():
+    gate = AdmissionGate(2, 0)
+
+    with gate.admit() as first, gate.admit() as second, gate.admit() as third:
+        assert (first, second, third) == (True, True, False)
+    with gate.admit() as admitted:
+        assert admitted
+
+
+def test_admission_gate_waits_for_a_slot():
+    gate = AdmissionGate(1, 1)
+    released = threading.Event()
+
+    def hold():
+        with gate.admit():
+            released.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    threading.Timer(0.05, released.set).start()
+    with gate.admit() as admitted:
+        assert admitted
+    holder.join()
+
+
+def test_admission_gate_disabled():
+    gate = AdmissionGate(0, 0)
+
+    with gate.admit() as first, gate.admit() as second:
+        assert first and second
+
+
+def test_find_weather_document(weather_data):
+    Weather(**weather_data).save()
+
+    assert find_weather_document("bogota", "co")["id"] == 3688689
+    assert find_weather_document("Bogota", "PE") is None
+
+
+def test_saturated_request_served_from_store(mocker, saturated, weather_data):
+    upstream = mocker.patch("requests.get")
+    Weather(**weather_data).save()
+
+    response = APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["X-Weather-Stale"] == "true"
+    assert response.data["data"]["location_name"] == "Bogota, CO"
+    assert "max-age=30" in response["Cache-Control"]
+    upstream.assert_not_called()
+
+
+def test_saturated_request_rejected(mocker, saturated):
+    upstream = mocker.patch("requests.get")
+
+    response = APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+    coordinates = APIClient().get(reverse("weather"), {"lat": 4.61, "lon": -74.08})
+
+    for rejected in (response, coordinates):
+        assert rejected.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert rejected["Retry-After"] == "5"
+    upstream.assert_not_called()
+
+
+def test_saturated_batch_skips_refresh(mocker, saturated, weather_data):
+    refresh = mocker.patch("app.views.weather_batch_view.refresh_weather_group")
+    Weather(**weather_data).save()
+
+    response = APIClient().get(reverse("weather-batch"), {"ids": "3688689"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["X-Weather-Stale"] == "true"
+    assert len(response.data["data"]) == 1
+    refresh.assert_not_called()
@@ -0,0 +1,210 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import AlertRule, Weather
+from app.models.enums import BeaufortScale
+from app.serializers.alert_rule_serializer import AlertRuleSerializer
+from app.signals import notify_weather_stored
+from app.utils.alerts import group_rules, matching_rules
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+    AlertRule.objects.delete()
+
+
+@pytest.fixture
+def redis_client(mocker):
+    return mocker.patch("app.utils.alerts._get_client").return_value
+
+
+def store_weather(temp, wind_speed):
+    Weather(
+        id=3688689,
+        name="Bogota",
+        dt=1729570140,
+        main={"temp": temp, "pressure": 1017, "humidity": 94},
+        wind={"speed": wind_speed, "deg": 0},
+    ).save()
+    notify_weather_stored(Weather, [3688689])
+
+
+def streamed(redis_client):
+    pipeline = redis_client.pipeline.return_value
+    events = [call.args[1] for call in pipeline.xadd.call_args_list]
+    pipeline.xadd.reset_mock()
+    return events
+
+
+def make_rule(rule_id, metric, operator, threshold):
+    return {
+        "_id": rule_id,
+        "city_id": 1,
+        "metric": metric,
+        "operator": operator,
+        "threshold": threshold,
+    }
+
+
+def test_beaufort_lower_bound():
+    assert BeaufortScale.GALE.lower_bound == 17.1
+    assert BeaufortScale.CALM.lower_bound == 0.0
+
+
+def test_matching_rules_splits_sorted_thresholds():
+    rules = [
+        make_rule(1, "temperature", "above", 290),
+        make_rule(2, "temperature", "above", 280),
+        make_rule(3, "temperature", "above", 285),
+        make_rule(4, "temperature", "below", 285),
+        make_rule(5, "temperature", "below", 300),
+        make_rule(6, "humidity", "above", 50),
+    ]
+    groups = group_rules(rules)[1]
+
+    matched = matching_rules(groups, {"temperature": 285})
+
+    assert sorted(rule["_id"] for rule in matched) == [2, 5]
+    assert groups[("temperature", "above")][0] == [280, 285, 290]
+
+
+@pytest.mark.parametrize(
+    "data, threshold",
+    [
+        ({"metric": "temperature", "operator": "below", "threshold": 0}, 273.15),
+        (
+            {
+                "metric": "temperature",
+                "operator": "below",
+                "threshold": 32,
+                "unit": "imperial",
+            },
+            273.15,
+        ),
+        ({"metric": "wind_speed", "operator": "above", "beaufort": "gale"}, 17.1),
+        ({"metric": "humidity", "operator": "above", "threshold": 90}, 90),
+    ],
+)
+def test_alert_rule_serializer_normalizes_thresholds(data, threshold):
+    serializer = AlertRuleSerializer(data={"city_id": 3688689, **data})
+
+    assert serializer.is_valid(), serializer.errors
+    assert serializer.validated_data["threshold"] == pytest.approx(threshold)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"metric": "temperature", "operator": "above"},
+        {"metric": "temperature", "operator": "above", "beaufort": "gale"},
+        {
+            "metric": "wind_speed",
+            "operator": "above",
+            "beaufort": "gale",
+            "threshold": 1,
+        },
+        {"metric": "snow", "operator": "above", "threshold": 1},
+    ],
+)
+def test_alert_rule_serializer_invalid(data):
+    assert not AlertRuleSerializer(data={"city_id": 3688689, **data}).is_valid()
+
+
+def test_alerts_fire_when_condition_starts_holding(redis_client):
+    AlertRule(
+        city_id=3688689, metric="wind_speed", operator="above", threshold=17.1
+    ).save()
+    AlertRule(
+        city_id=3688689, metric="temperature", operator="below", threshold=273.15
+    ).save()
+
+    store_weather(temp=286.88, wind_speed=18.0)
+    first = streamed(redis_client)
+    store_weather(temp=286.88, wind_speed=19.0)
+    repeated = streamed(redis_client)
+    store_weather(temp=270.0, wind_speed=5.0)
+    cleared = streamed(redis_client)
+    store_weather(temp=270.0, wind_speed=21.0)
+    again = streamed(redis_client)
+
+    assert [(event["metric"], event["beaufort"]) for event in first] == [
+        ("wind_speed", "Gale")
+    ]
+    assert first[0]["city"] == "Bogota"
+    assert repeated == []
+    assert [event["metric"] for event in cleared] == ["temperature"]
+    assert [event["value"] for event in again] == ["21.0"]
+
+
+def test_alerts_not_marked_when_stream_push_fails(redis_client):
+    rule = AlertRule(
+        city_id=3688689, metric="humidity", operator="above", threshold=90
+    ).save()
+    redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+
+    store_weather(temp=286.88, wind_speed=1.0)
+
+    assert not rule.reload().triggered
+
+
+def test_alert_rules_endpoints():
+    client = APIClient()
+
+    created = client.post(
+        reverse("alerts"),
+        {
+            "city_id": 3688689,
+            "metric": "wind_speed",
+            "operator": "above",
+            "beaufort": "gale",
+        },
+        format="json",
+    )
+    listed = client.get(reverse("alerts"), {"city_id": 3688689})
+    deleted = client.delete(reverse("alert", args=[created.data["data"]["id"]]))
+    missing = client.delete(reverse("alert", args=["not-an-id"]))
+
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.data["data"]["threshold"] == 17.1
+    assert [rule["id"] for rule in listed.data["data"]] == [created.data["data"]["id"]]
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+    assert AlertRule.objects.count() == 0
+
+
+def test_alert_rules_list_is_not_cached():
+    client = APIClient()
+    url = reverse("alerts")
+
+    before = client.get(url, {"city_id": 3688689})
+    client.post(
+        url,
+        {
+            "city_id": 3688689,
+            "metric": "temperature",
+            "operator": "below",
+            "threshold": 0,
+        },
+        format="json",
+    )
+    after = client.get(url, {"city_id": 3688689})
+
+    assert before.data["data"] == []
+    assert len(after.data["data"]) == 1
+
+
+def test_alert_rules_invalid_requests():
+    client = APIClient()
+
+    assert client.get(reverse("alerts")).status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        client.post(reverse("alerts"), {"city_id": 1}, format="json").status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
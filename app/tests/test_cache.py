@@ -0,0 +1,168 @@
+import pytest
+from mongoengine import connect, disconnect
+import mongomock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.cache import next_update_interval, observation_ttl, snap_to_grid
+from app.utils.metrics import get_metrics
+from app.views.weather_view import WeatherAPIView
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    disconnect()
+    connect(
+        "mongoenginetest",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        uuidRepresentation="standard",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+        "daily": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "previous_dt, new_dt, interval, expected",
+    [
+        (None, 1000, None, None),
+        (1000, 1000, 600, 600),
+        (1000, 1600, None, 600),
+        (1000, 1300, 600, 510),
+        (1000, 100000, 600, 600),
+    ],
+)
+def test_next_update_interval(previous_dt, new_dt, interval, expected):
+    assert next_update_interval(previous_dt, new_dt, interval) == expected
+
+
+def test_observation_ttl_until_next_update():
+    assert observation_ttl(1000, 600, now=1100) == 500
+
+
+def test_observation_ttl_overdue_uses_min_ttl():
+    assert observation_ttl(1000, 600, now=5000) == 30
+
+
+def test_observation_ttl_capped():
+    assert observation_ttl(1000, 100000, now=1000) == 3600
+
+
+def test_observation_ttl_default_interval():
+    assert observation_ttl(1000, None, now=1000) == 600
+
+
+def test_weather_response_max_age(mocker, weather_data):
+    mocker.patch("app.utils.cache.time.time", return_value=1729570140 + 100)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+
+    response = APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "max-age=500" in response["Cache-Control"]
+
+
+def test_weather_page_cached_once_for_max_age(mocker, weather_data):
+    mocker.patch("app.utils.cache.time.time", return_value=1729570140 + 100)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+    cache_set = mocker.spy(cache, "set")
+
+    APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+
+    page_timeouts = [
+        call.args[2]
+        for call in cache_set.call_args_list
+        if call.args[0].startswith("views.decorators.cache.cache_page")
+    ]
+    assert page_timeouts == [500]
+
+
+def test_snap_to_grid():
+    assert snap_to_grid(4.6097, 0.1) == 4.6
+    assert snap_to_grid(-74.0817, 0.1) == -74.1
+    assert snap_to_grid(4.66, 0.25) == 4.75
+
+
+def test_forecast_grid_cache_shares_nearby_cities(mocker):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"daily": [{"dt": 1}]}
+    view = WeatherAPIView()
+
+    bogota = view._fetch_weather_forecast(
+        {"coord": {"lat": 4.6097, "lon": -74.0817}}, None
+    )
+    soacha = view._fetch_weather_forecast(
+        {"coord": {"lat": 4.5794, "lon": -74.1168}}, None
+    )
+    medellin = view._fetch_weather_forecast(
+        {"coord": {"lat": 6.2518, "lon": -75.5636}}, None
+    )
+
+    assert bogota == soacha == medellin == {"daily": [{"dt": 1}]}
+    assert mock_get.call_count == 2
+    assert "lat=4.6&lon=-74.1&" in mock_get.call_args_list[0].args[0]
+    assert get_metrics()["forecast.grid.hits"] == 1
+    assert get_metrics()["forecast.grid.misses"] == 2
+
+
+def test_forecast_grid_cache_disabled(mocker):
+    mocker.patch("app.views.weather_view.FORECAST_GRID_RESOLUTION", 0)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"daily": []}
+    view = WeatherAPIView()
+
+    view._fetch_weather_forecast({"coord": {"lat": 4.6097, "lon": -74.0817}}, None)
+    view._fetch_weather_forecast({"coord": {"lat": 4.6097, "lon": -74.0817}}, None)
+
+    assert mock_get.call_count == 2
+    assert "lat=4.6097&lon=-74.0817&" in mock_get.call_args.args[0]
@@ -0,0 +1,172 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import CountryRollup, Weather
+from app.models.enums import BeaufortScale
+from app.signals import notify_weather_stored
+from app.utils.persistence import weather_upsert_operation
+from app.utils.rollups import rollup_deltas, rollup_snapshot, summarize_rollup
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+    CountryRollup.objects.delete()
+
+
+def store_weather(city_id, country, temp, wind_speed, notify=True):
+    Weather._get_collection().bulk_write(
+        [
+            weather_upsert_operation(
+                {
+                    "id": city_id,
+                    "name": f"City {city_id}",
+                    "dt": 1729570140,
+                    "main": {"temp": temp},
+                    "wind": {"speed": wind_speed, "deg": 0},
+                    "sys": {"country": country},
+                }
+            )
+        ]
+    )
+    if notify:
+        notify_weather_stored(Weather, [city_id])
+
+
+def rollup(country):
+    return CountryRollup.objects.get(country=country)
+
+
+def test_rollup_deltas_move_a_city_between_snapshots():
+    previous = rollup_snapshot(
+        {"sys": {"country": "CO"}, "main": {"temp": 290.0}, "wind": {"speed": 1.0}}
+    )
+    current = rollup_snapshot(
+        {"sys": {"country": "PE"}, "main": {"temp": 280.0}, "wind": {"speed": 20.0}}
+    )
+
+    deltas = rollup_deltas(previous, current)
+
+    assert previous["scale"] == list(BeaufortScale).index(BeaufortScale.LIGHT_AIR)
+    assert deltas["CO"]["inc"] == {
+        "cities": -1,
+        "temp_sum": -290.0,
+        f"wind_scales.{previous['scale']}": -1,
+    }
+    assert deltas["CO"]["max"] is None
+    assert deltas["PE"]["inc"]["cities"] == 1
+    assert deltas["PE"]["max"] == 20.0
+    assert rollup_snapshot({"sys": {"country": "CO"}, "main": {"temp": 1}}) is None
+
+
+def test_rollups_follow_stored_cities():
+    store_weather(1, "CO", 290.15, 1.0)
+    store_weather(2, "CO", 280.15, 20.0)
+    # Storing the same values again counts the city once.
+    store_weather(1, "CO", 290.15, 1.0)
+
+    summary = summarize_rollup(CountryRollup.objects.as_pymongo().get(country="CO"))
+    assert summary["cities"] == 2
+    assert summary["temp_mean"] == pytest.approx(285.15)
+    assert summary["wind_max_beaufort"] == BeaufortScale.GALE.description
+    assert summary["wind_peak"] == 20.0
+
+    # The gale calms down: the current maximum follows, the peak does not.
+    store_weather(2, "CO", 282.15, 3.0)
+
+    summary = summarize_rollup(CountryRollup.objects.as_pymongo().get(country="CO"))
+    assert summary["cities"] == 2
+    assert summary["temp_mean"] == pytest.approx(286.15)
+    assert summary["wind_max_beaufort"] == BeaufortScale.LIGHT_BREEZE.description
+    assert summary["wind_peak"] == 20.0
+
+
+def test_rollups_retry_a_claim_lost_to_a_concurrent_store(mocker):
+    for city_id in (1, 2, 3):
+        store_weather(city_id, "CO", 290.15, 1.0, notify=False)
+    collection = Weather._get_collection()
+    update_one = collection.update_one
+
+    def concurrent_claim(filter, update, **kwargs):
+        if filter["_id"] == 2 and claims.call_count == 2:
+            # Another process counts city 2 in PE between the read and the claim.
+            update_one(
+                {"_id": 2},
+                {"$set": {"rollup": {**update["$set"]["rollup"], "country": "PE"}}},
+            )
+            CountryRollup(country="PE", cities=1).save()
+        return update_one(filter, update, **kwargs)
+
+    claims = mocker.patch.object(collection, "update_one", side_effect=concurrent_claim)
+
+    notify_weather_stored(Weather, [1, 2, 3])
+
+    assert claims.call_count == 4
+    assert rollup("CO").cities == 3
+    assert rollup("PE").cities == 0
+    assert Weather.objects.get(id=2).rollup["country"] == "CO"
+
+
+def test_rollups_move_a_city_to_another_country():
+    store_weather(1, "CO", 290.15, 1.0)
+    store_weather(1, "PE", 280.15, 1.0)
+
+    assert rollup("CO").cities == 0
+    assert rollup("CO").temp_sum == pytest.approx(0.0)
+    assert rollup("PE").cities == 1
+    assert Weather.objects.get(id=1).rollup["country"] == "PE"
+
+
+def test_rebuild_rollups_command(capsys):
+    store_weather(1, "CO", 290.15, 1.0, notify=False)
+    store_weather(2, "PE", 280.15, 5.0, notify=False)
+    CountryRollup(country="AR", cities=3).save()
+
+    call_command("rebuild_rollups")
+    # Rebuilt snapshots are not counted again by the next store.
+    store_weather(1, "CO", 290.15, 1.0)
+
+    assert "Rebuilt 2 country rollups" in capsys.readouterr().out
+    assert sorted(CountryRollup.objects.values_list("country")) == ["CO", "PE"]
+    assert rollup("CO").cities == 1
+    assert rollup("PE").wind_peak == 5.0
+
+
+def test_get_countries():
+    store_weather(1, "CO", 290.15, 1.0)
+    store_weather(2, "CO", 280.15, 20.0)
+    store_weather(3, "AR", 300.15, 3.0)
+    url = reverse("weather-countries")
+    client = APIClient()
+
+    response = client.get(url)
+    single = client.get(url, {"country": "co", "unit": "standard"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [country["country"] for country in response.data["data"]] == ["AR", "CO"]
+    assert response.data["data"][1]["temp_mean"] == 12.0
+    assert response.data["data"][1]["wind_max_beaufort"] == "Gale"
+    assert "max-age" in response["Cache-Control"]
+    assert single.data["data"][0]["temp_mean"] == 285.1
+
+
+@pytest.mark.parametrize(
+    "params, status_code",
+    [
+        ({"country": "COL"}, status.HTTP_400_BAD_REQUEST),
+        ({"country": "PE"}, status.HTTP_404_NOT_FOUND),
+    ],
+)
+def test_get_countries_invalid_requests(params, status_code):
+    store_weather(1, "CO", 290.15, 1.0)
+
+    response = APIClient().get(reverse("weather-countries"), params)
+
+    assert response.status_code == status_code
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+import requests
+from django.core.cache import cache
+
+from app.utils.hedging import HedgedRequests
+from app.utils.metrics import get_metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+def make_hedger(**options):
+    defaults = {
+        "enabled": True,
+        "min_samples": 1,
+        "initial_delay": 0.02,
+        "min_delay": 0.02,
+        "max_ratio": 1.0,
+        "max_workers": 4,
+    }
+    return HedgedRequests(**{**defaults, **options})
+
+
+def upstream(mocker, delays):
+    """Patches requests.get to answer the n-th call after delays[n] seconds."""
+    calls = []
+    lock = threading.Lock()
+
+    def get(url):
+        with lock:
+            call = len(calls)
+            calls.append(url)
+        time.sleep(delays[call])
+        return mocker.Mock(status_code=200, call=call)
+
+    mocker.patch("requests.get", side_effect=get)
+    return calls
+
+
+def test_delay_tracks_rolling_percentile():
+    hedger = make_hedger(percentile=0.9, min_samples=10, window=100, min_delay=0.01)
+
+    assert hedger.delay("weather") == 0.02
+    for latency in range(1, 101):
+        hedger.record("weather", latency / 100)
+
+    assert hedger.delay("weather") == 0.91
+    assert hedger.delay("onecall") == 0.02
+
+
+def test_fast_request_is_not_hedged(mocker):
+    calls = upstream(mocker, [0])
+
+    response = make_hedger().get("weather", "http://upstream/weather")
+
+    assert response.call == 0
+    assert len(calls) == 1
+
+
+def test_slow_request_is_hedged(mocker):
+    calls = upstream(mocker, [0.5, 0])
+
+    response = make_hedger().get("weather", "http://upstream/weather")
+
+    assert response.call == 1
+    assert calls == ["http://upstream/weather"] * 2
+    assert get_metrics()["upstream.hedges"] == 1
+    assert get_metrics()["upstream.hedge.wins"] == 1
+
+
+def test_hedge_budget_caps_hedges(mocker):
+    calls = upstream(mocker, [0.2, 0.2, 0])
+    hedger = make_hedger(max_ratio=0.5, min_samples=100)
+
+    hedger.get("weather", "http://upstream/weather")
+    hedger.get("weather", "http://upstream/weather")
+
+    # The first request only earned half a hedge, the second one completed it.
+    assert len(calls) == 3
+
+
+def test_failed_request_falls_back_to_the_other(mocker):
+    def get(url):
+        if get.calls == 0:
+            get.calls += 1
+            time.sleep(0.05)
+            raise requests.ConnectionError("reset")
+        return mocker.Mock(status_code=200)
+
+    get.calls = 0
+    mocker.patch("requests.get", side_effect=get)
+
+    assert make_hedger().get("weather", "http://upstream/weather").status_code == 200
+
+
+def test_disabled_hedging_calls_upstream_directly(mocker):
+    calls = upstream(mocker, [0.05])
+    hedger = make_hedger(enabled=False)
+
+    hedger.get("weather", "http://upstream/weather")
+
+    assert len(calls) == 1
+    assert hedger._executor is None
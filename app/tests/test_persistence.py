@@ -0,0 +1,162 @@
+import pytest
+from mongoengine import DEFAULT_CONNECTION_NAME
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.metrics import get_metrics
+from app.utils.persistence import (
+    forecast_hash,
+    get_weather_document,
+    get_weather_documents,
+    is_unchanged,
+    weather_reads,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+        "daily": [],
+    }
+
+
+def test_forecast_hash_is_stable():
+    first = [{"dt": 1, "temp": {"day": 290.0, "min": 280.0}}]
+    second = [{"temp": {"min": 280.0, "day": 290.0}, "dt": 1}]
+
+    assert forecast_hash(first) == forecast_hash(second)
+    assert forecast_hash(first) != forecast_hash([{"dt": 2}])
+    assert forecast_hash(None) == forecast_hash([])
+    assert forecast_hash([], {"size": 1}) != forecast_hash([])
+
+
+def test_is_unchanged():
+    digest = forecast_hash([])
+
+    assert is_unchanged(1, digest, 1, digest)
+    assert not is_unchanged(1, digest, 2, digest)
+    assert not is_unchanged(1, None, 1, digest)
+
+
+def test_get_weather_skips_unchanged_write(mocker, weather_data):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+    url = reverse("weather")
+    client = APIClient()
+
+    client.get(url, {"city": "Bogota", "country": "CO"})
+    skipped = get_metrics()["weather.writes.skipped"]
+    mock_update = mocker.patch.object(Weather, "update")
+    response = client.get(url, {"city": "Bogota", "country": "CO", "unit": "imperial"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["temperature"] == "57°F"
+    mock_update.assert_not_called()
+    assert get_metrics()["weather.writes.skipped"] == skipped + 1
+
+
+def test_get_weather_writes_new_observation(mocker, weather_data):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+    url = reverse("weather")
+    client = APIClient()
+
+    client.get(url, {"city": "Bogota", "country": "CO"})
+    weather_data["dt"] += 600
+    weather_data["main"]["temp"] = 290.15
+    response = client.get(url, {"city": "Bogota", "country": "CO", "unit": "imperial"})
+
+    assert response.status_code == status.HTTP_200_OK
+    weather = Weather.objects.get(id=3688689)
+    assert weather.main.temp == 290.15
+    assert weather.dt_interval == 600
+    assert weather.forecast_hash == forecast_hash([])
+
+
+def test_get_weather_document_projection(weather_data):
+    weather_data.pop("daily")
+    Weather(**weather_data, forecast=[{"dt": 1}]).save()
+
+    document = get_weather_document(3688689, ("name", "dt"))
+
+    assert document == {"id": 3688689, "name": "Bogota", "dt": 1729570140}
+    assert get_weather_document(1) is None
+
+
+def test_get_weather_documents(weather_data):
+    weather_data.pop("daily")
+    Weather(**weather_data).save()
+
+    documents = get_weather_documents([3688689, 1])
+
+    assert len(documents) == 1
+    assert documents[0]["id"] == 3688689
+    assert documents[0]["sys"]["country"] == "CO"
+    assert "base" not in documents[0]
+
+
+def test_weather_reads_use_read_alias(mocker):
+    using = mocker.patch.object(Weather.objects.__class__, "using")
+
+    weather_reads()
+    get_weather_document(1, ("dt",), DEFAULT_CONNECTION_NAME)
+
+    assert [call.args[0] for call in using.call_args_list] == [
+        django_settings.MONGO_READ_ALIAS,
+        DEFAULT_CONNECTION_NAME,
+    ]
+
+
+def test_save_weather_reads_state_from_primary(mocker, weather_data):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+    read = mocker.patch(
+        "app.views.weather_view.get_weather_document", return_value=None
+    )
+
+    APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+
+    assert read.call_args.args[2] == DEFAULT_CONNECTION_NAME
@@ -0,0 +1,107 @@
+import marshal
+import pstats
+import tracemalloc
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.utils.profiling import RequestProfiler, load_profile, store_profile
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+@pytest.fixture
+def profiling_token(mocker):
+    mocker.patch("app.middleware.profiling.PROFILING_TOKEN", "secret")
+
+
+def test_request_profiler_captures_calls_and_allocations():
+    profiler = RequestProfiler(top_n=5)
+    profiler.start()
+    data = [str(number) * 10 for number in range(10000)]
+    profile = profiler.stop()
+
+    assert data
+    assert profile["duration"] > 0
+    assert profile["peak_traced_memory"] > 0
+    assert len(profile["allocations"]) <= 5
+    assert "test_profiling.py" in profile["allocations"][0]["location"]
+    assert isinstance(marshal.loads(profile["stats"]), dict)
+
+
+def test_request_profiler_keeps_tracing_it_did_not_start():
+    tracemalloc.start()
+    try:
+        profiler = RequestProfiler(top_n=5)
+        profiler.start()
+        profiler.stop()
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    profiler = RequestProfiler(top_n=5)
+    profiler.start()
+    profiler.stop()
+
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_header_with_token(profiling_token):
+    response = APIClient().get(reverse("metrics"), HTTP_X_PROFILE_TOKEN="secret")
+
+    profile = load_profile(response["X-Profile-Id"])
+    assert profile["path"] == "/metrics/"
+    assert profile["status"] == 200
+    assert "cumulative" in profile["summary"]
+
+
+@pytest.mark.parametrize("token", [None, "wrong"])
+def test_no_profile_without_valid_token(profiling_token, token):
+    headers = {"HTTP_X_PROFILE_TOKEN": token} if token else {}
+
+    response = APIClient().get(reverse("metrics"), **headers)
+
+    assert "X-Profile-Id" not in response
+
+
+def test_profile_sampling(mocker):
+    mocker.patch("app.middleware.profiling.PROFILING_SAMPLE_RATE", 1.0)
+
+    response = APIClient().get(reverse("metrics"))
+
+    assert load_profile(response["X-Profile-Id"]) is not None
+
+
+def test_file_storage(mocker, tmp_path):
+    mocker.patch("app.utils.profiling.PROFILING_STORAGE", "files")
+    mocker.patch("app.utils.profiling.PROFILING_DIR", str(tmp_path))
+    profiler = RequestProfiler()
+    profiler.start()
+    profile = profiler.stop()
+    profile.update({"id": "abc", "method": "GET", "path": "/", "status": 200})
+
+    store_profile("abc", profile)
+
+    pstats.Stats(str(tmp_path / "abc.prof"))
+    assert load_profile("abc")["summary"] == profile["summary"]
+    assert load_profile("missing") is None
+
+
+def test_show_profile_command(profiling_token, tmp_path, capsys):
+    response = APIClient().get(reverse("metrics"), HTTP_X_PROFILE_TOKEN="secret")
+    output = tmp_path / "request.prof"
+
+    call_command("show_profile", response["X-Profile-Id"], output=str(output))
+
+    assert "GET /metrics/ -> 200" in capsys.readouterr().out
+    pstats.Stats(str(output))
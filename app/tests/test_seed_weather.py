@@ -0,0 +1,111 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from mongoengine import connect, disconnect
+import mongomock
+from django.core.management import call_command
+from app.models import Weather
+from app.utils.persistence import forecast_hash
+from app.utils.seed import iter_jsonl_chunks, seed_weather_chunk
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    disconnect()
+    connect(
+        "mongoenginetest",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        uuidRepresentation="standard",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_db():
+    Weather.objects.delete()
+
+
+def make_payload(city_id, temp=286.88):
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": temp,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {"country": "CO", "sunrise": 1729507253, "sunset": 1729550432},
+        "timezone": -18000,
+        "id": city_id,
+        "name": f"City {city_id}",
+        "cod": 200,
+        "forecast": [],
+    }
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "weather.jsonl"
+    lines = [json.dumps(make_payload(city_id)) for city_id in range(1, 6)]
+    lines += ["{not json", json.dumps({"id": 6, "name": "Incomplete"}), ""]
+    path.write_text("\n".join(lines))
+    return path
+
+
+def test_iter_jsonl_chunks(jsonl_file):
+    chunks = list(iter_jsonl_chunks([str(jsonl_file)], chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[0][0] == (f"{jsonl_file}:1", make_payload(1))
+    assert isinstance(chunks[1][2][1], json.JSONDecodeError)
+
+
+def test_seed_weather_chunk_keeps_latest_payload():
+    chunk = [
+        ("dump:1", make_payload(1, temp=280.0)),
+        ("dump:2", make_payload(1, temp=290.0)),
+        ("dump:3", {"id": 2}),
+    ]
+
+    written, invalid = seed_weather_chunk(chunk)
+
+    assert written == 1
+    assert [location for location, _ in invalid] == ["dump:3"]
+    weather = Weather.objects.get(id=1)
+    assert weather.main.temp == 290.0
+    assert weather.forecast_hash == forecast_hash([])
+    assert weather.created_at is not None
+
+
+def test_seed_weather_command(jsonl_file, tmp_path):
+    gz_path = tmp_path / "more.jsonl.gz"
+    with gzip.open(gz_path, "wt") as gz_file:
+        gz_file.write(json.dumps(make_payload(7)) + "\n")
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command(
+        "seed_weather",
+        str(jsonl_file),
+        str(gz_path),
+        "--chunk-size",
+        "4",
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert Weather.objects.count() == 6
+    assert "Seeded 6 cities from 8 lines" in stdout.getvalue()
+    assert "(2 invalid)" in stdout.getvalue()
+    assert f"{jsonl_file}:6" in stderr.getvalue()
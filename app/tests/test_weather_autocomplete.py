@@ -0,0 +1,93 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.signals import notify_weather_stored, weather_stored
+from app.utils.autocomplete import CityPrefixIndex, normalize_name
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def stored_cities():
+    cities = [
+        (1, "Bogotá", "CO"),
+        (2, "Boston", "US"),
+        (3, "Bogor", "ID"),
+        (4, "Medellín", "CO"),
+        (5, "Bochum", "DE"),
+    ]
+    for city_id, name, country in cities:
+        Weather(id=city_id, name=name, sys={"country": country}).save()
+
+
+@pytest.fixture
+def index(mocker):
+    index = CityPrefixIndex()
+    mocker.patch("app.views.weather_autocomplete_view.city_index", index)
+    weather_stored.connect(index.handle_weather_stored)
+    yield index
+    weather_stored.disconnect(index.handle_weather_stored)
+
+
+def test_normalize_name():
+    assert normalize_name(" Medellín ") == "medellin"
+
+
+def test_search(stored_cities, index):
+    assert [city["id"] for city in index.search("bo")] == [5, 3, 1, 2]
+    assert index.search("BOGOT") == [{"id": 1, "name": "Bogotá", "country": "CO"}]
+    assert [city["id"] for city in index.search("bo", country="co")] == [1]
+    assert [city["id"] for city in index.search("bo", limit=2)] == [5, 3]
+    assert index.search("x") == []
+
+
+def test_search_does_not_query_mongo_once_built(mocker, stored_cities, index):
+    index.build()
+    objects = mocker.patch.object(Weather, "objects")
+
+    assert index.search("med")[0]["name"] == "Medellín"
+    objects.assert_not_called()
+
+
+def test_add_replaces_previous_name(index):
+    index.build()
+    index.add(6, "Bombay", "IN")
+    index.add(6, "Mumbai", "IN")
+
+    assert index.search("bom") == []
+    assert index.search("mum") == [{"id": 6, "name": "Mumbai", "country": "IN"}]
+
+
+def test_index_updates_when_cities_are_stored(stored_cities, index):
+    index.build()
+    Weather(id=7, name="Bogue", sys={"country": "US"}).save()
+
+    notify_weather_stored(Weather, [1, 7])
+
+    assert [city["id"] for city in index.search("bog")] == [3, 1, 7]
+
+
+def test_autocomplete_endpoint(stored_cities, index):
+    response = APIClient().get(reverse("weather-autocomplete"), {"q": "bos"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"] == [{"id": 2, "name": "Boston", "country": "US"}]
+
+
+@pytest.mark.parametrize(
+    "params", [{}, {"q": "bo", "limit": "0"}, {"q": "bo", "limit": "a"}]
+)
+def test_autocomplete_endpoint_invalid_params(index, params):
+    response = APIClient().get(reverse("weather-autocomplete"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def stored_cities():
+    updated_at = datetime(2024, 10, 22, 12, 0)
+    cities = [
+        (1, "Bogota", "CO"),
+        (2, "Medellin", "CO"),
+        (3, "Cali", "CO"),
+        (4, "Lima", "PE"),
+        (5, "Cali", "CO"),
+    ]
+    for city_id, name, country in cities:
+        Weather(
+            id=city_id,
+            name=name,
+            sys={"country": country},
+            coord={"lat": 0, "lon": 0},
+            updated_at=updated_at + timedelta(minutes=city_id),
+        ).save()
+
+
+def list_all(client, params):
+    ids = []
+    cursor = None
+    while True:
+        response = client.get(
+            reverse("weather-cities"), {**params, "cursor": cursor or ""}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        ids += [city["id"] for city in response.data["data"]]
+        cursor = response.data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    updated_at = datetime(2024, 10, 22, 12, 0)
+
+    assert decode_cursor(encode_cursor("Cali", 3), "name") == ("Cali", 3)
+    assert decode_cursor(encode_cursor(updated_at, 3), "updated_at") == (updated_at, 3)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "name")
+
+
+def test_keyset_filter():
+    assert keyset_filter("name", 1, None) == {}
+    assert keyset_filter("name", -1, ("Cali", 3)) == {
+        "$or": [
+            {"name": {"$lt": "Cali"}},
+            {"name": "Cali", "_id": {"$lt": 3}},
+            {"name": None},
+        ]
+    }
+    assert keyset_filter("updated_at", -1, (None, 3)) == {
+        "updated_at": None,
+        "_id": {"$lt": 3},
+    }
+
+
+def test_list_cities_by_name(stored_cities):
+    ids = list_all(APIClient(), {"limit": 2})
+
+    assert ids == [1, 3, 5, 4, 2]
+
+
+def test_list_cities_by_country_and_recent_updates(stored_cities):
+    ids = list_all(APIClient(), {"country": "co", "sort": "-updated_at", "limit": 3})
+
+    assert ids == [5, 3, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [("updated_at", [6, 7, 1, 2, 3, 4, 5]), ("-updated_at", [5, 4, 3, 2, 1, 7, 6])],
+)
+def test_list_cities_without_sort_value(stored_cities, sort, expected):
+    Weather._get_collection().insert_many(
+        [{"_id": 6, "name": "Quito"}, {"_id": 7, "name": "Lima", "updated_at": None}]
+    )
+
+    ids = list_all(APIClient(), {"sort": sort, "limit": 2})
+
+    assert ids == expected
+    assert decode_cursor(encode_cursor(None, 6), "updated_at") == (None, 6)
+
+
+def test_list_cities_projection(stored_cities):
+    response = APIClient().get(
+        reverse("weather-cities"), {"fields": "name", "sort": "updated_at", "limit": 1}
+    )
+
+    assert response.data["data"] == [{"id": 1, "name": "Bogota"}]
+    assert response.data["next_cursor"] is not None
+
+
+@pytest.mark.parametrize(
+    "params", [{"sort": "temp"}, {"limit": 0}, {"cursor": "abc"}, {"fields": "visits"}]
+)
+def test_list_cities_invalid_params(params):
+    response = APIClient().get(reverse("weather-cities"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,180 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.renderers.compact_renderer import CompactJSONRenderer
+from app.serializers.weather_serializer import CompactWeatherSerializer
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def forecast_data():
+    return [
+        {
+            "dt": 1729620000 + index * 86400,
+            "sunrise": 1729593647,
+            "sunset": 1729636848,
+            "temp": {
+                "day": 290.15 + index,
+                "min": 282.15,
+                "max": 291.15,
+                "night": 283.15,
+                "eve": 287.15,
+                "morn": 282.15,
+            },
+            "pressure": 1017,
+            "humidity": 64,
+            "wind_speed": 3.1,
+            "wind_deg": 120,
+            "weather": [
+                {"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}
+            ],
+            "timezone": -18000,
+        }
+        for index in range(8)
+    ]
+
+
+@pytest.fixture
+def weather_data(forecast_data):
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+        "forecast": forecast_data,
+    }
+
+
+def test_compact_serializer(weather_data):
+    data = CompactWeatherSerializer(weather_data, context={"unit": "imperial"}).data
+
+    assert data["schema"]["current"]["temperature"] == "°F"
+    assert data["schema"]["forecast"]["temp_day"] == "°F"
+    assert data["schema"]["forecast"]["pressure"] == "hPa"
+    assert data["location"] == {
+        "lat": 4.6097,
+        "lon": -74.0817,
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "country": "CO",
+    }
+    assert data["current"]["temperature"] == 56.7
+    assert data["current"]["humidity"] == 94
+    assert data["forecast"]["dt"][:3] == [1729620000, 1729706400, 1729792800]
+    assert data["forecast"]["temp_day"][:3] == [62.6, 64.4, 66.2]
+    assert data["forecast"]["cloudiness"] == ["light rain"] * 8
+    assert set(data["forecast"]) == set(data["schema"]["forecast"])
+
+
+def test_compact_serializer_include(weather_data):
+    current = CompactWeatherSerializer(weather_data, context={"include": "current"})
+    forecast = CompactWeatherSerializer(weather_data, context={"include": "forecast"})
+
+    assert "forecast" not in current.data and "forecast" not in current.data["schema"]
+    assert "current" not in forecast.data and "current" not in forecast.data["schema"]
+    assert "main" not in forecast.get_projection()
+
+
+def test_get_weather_compact(mocker, weather_data, forecast_data):
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = {"daily": forecast_data}
+        else:
+            current = dict(weather_data)
+            current.pop("forecast")
+            response.json.return_value = current
+        return response
+
+    mocker.patch("requests.get", side_effect=upstream)
+    params = {"city": "Bogota", "country": "CO"}
+
+    compact = APIClient().get(reverse("weather"), {**params, "format": "compact"})
+    full = APIClient().get(reverse("weather"), params)
+
+    assert compact.status_code == status.HTTP_200_OK
+    assert compact["Content-Type"] == "application/vnd.weather.compact+json"
+    assert json.loads(compact.content)["data"]["current"]["temperature"] == 13.7
+    assert len(compact.content) < len(full.content)
+    assert compact["ETag"] != full["ETag"]
+
+
+def test_get_weather_page_cache_varies_on_accept(mocker, weather_data, forecast_data):
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = {"daily": forecast_data}
+        else:
+            current = dict(weather_data)
+            current.pop("forecast")
+            response.json.return_value = current
+        return response
+
+    mock_get = mocker.patch("requests.get", side_effect=upstream)
+    params = {"city": "Bogota", "country": "CO"}
+    client = APIClient()
+
+    compact = client.get(
+        reverse("weather"), params, HTTP_ACCEPT=CompactJSONRenderer.media_type
+    )
+    upstream_calls = mock_get.call_count
+    cached = client.get(
+        reverse("weather"), params, HTTP_ACCEPT=CompactJSONRenderer.media_type
+    )
+    cached_calls = mock_get.call_count
+    full = client.get(reverse("weather"), params)
+
+    assert "Accept" in compact["Vary"]
+    assert cached_calls == upstream_calls
+    assert cached["Content-Type"] == CompactJSONRenderer.media_type
+    assert full["Content-Type"] == "application/json"
+    assert mock_get.call_count > upstream_calls
+
+
+def test_get_weather_batch_compact(weather_data):
+    Weather(**weather_data).save()
+
+    response = APIClient().get(
+        reverse("weather-batch"), {"ids": "3688689", "format": "compact"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"][0]["forecast"]["humidity"] == [64] * 8
@@ -0,0 +1,148 @@
+import pytest
+from mongoengine import connect, disconnect
+import mongomock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.cache import round_coordinates
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    disconnect()
+    connect(
+        "mongoenginetest",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        uuidRepresentation="standard",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+    }
+
+
+@pytest.fixture
+def mock_upstream(mocker, weather_data):
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = {"daily": []}
+        else:
+            response.json.return_value = dict(weather_data)
+        return response
+
+    return mocker.patch("requests.get", side_effect=upstream)
+
+
+def test_round_coordinates():
+    assert round_coordinates("4.60971", "-74.08175", 2) == (4.61, -74.08)
+
+
+@pytest.mark.parametrize("lat, lon", [("abc", "1"), ("4.6", None), ("91", "0")])
+def test_round_coordinates_invalid(lat, lon):
+    with pytest.raises(ValueError):
+        round_coordinates(lat, lon, 2)
+
+
+def test_get_weather_by_coordinates(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(url, {"lat": "4.60971", "lon": "-74.08175"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["location_name"] == "Bogota, CO"
+    urls = sorted(call.args[0] for call in mock_upstream.call_args_list)
+    assert len(urls) == 2
+    assert "/onecall?" in urls[0]
+    assert "/weather?lat=4.61&lon=-74.08&" in urls[1]
+    assert "q=" not in urls[1]
+    assert Weather.objects.get(id=3688689).name == "Bogota"
+
+
+def test_get_weather_by_coordinates_away_from_cities(mocker, weather_data):
+    weather_data.update({"id": 0, "name": ""})
+    del weather_data["sys"]["country"]
+    mock_upstream = mocker.patch("requests.get")
+    mock_upstream.return_value.status_code = 200
+    mock_upstream.return_value.json.side_effect = [
+        dict(weather_data),
+        {"daily": []},
+    ]
+    url = reverse("weather")
+    client = APIClient()
+
+    response = client.get(url, {"lat": "0.5", "lon": "-30.5", "include": "current"})
+    cached = client.get(
+        url, {"lat": "0.5", "lon": "-30.5", "include": "current", "unit": "imperial"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["location_name"] == ""
+    assert response.data["data"]["temperature"] == "14°C"
+    assert "ETag" not in response
+    assert cached.data["data"]["temperature"] == "57°F"
+    assert mock_upstream.call_count == 1
+    assert Weather.objects.count() == 0
+
+
+def test_get_weather_by_coordinates_jitter_hits_cache(mock_upstream):
+    url = reverse("weather")
+    client = APIClient()
+
+    client.get(url, {"lat": "4.60971", "lon": "-74.08175"})
+    response = client.get(
+        url, {"lat": "4.61023", "lon": "-74.07998", "unit": "imperial"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["temperature"] == "57°F"
+    assert mock_upstream.call_count == 2
+
+
+def test_get_weather_by_coordinates_invalid(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(url, {"lat": "4.6"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_upstream.assert_not_called()
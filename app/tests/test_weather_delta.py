@@ -0,0 +1,184 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.delta import diff_render, find_render, record_render, render_etag
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+def make_weather_data(dt, temp):
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": temp,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": dt,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+    }
+
+
+def make_forecast_day(dt, day_temp):
+    return {
+        "dt": dt,
+        "sunrise": 1729593647,
+        "sunset": 1729636848,
+        "temp": {
+            "day": day_temp,
+            "min": 282.15,
+            "max": 291.15,
+            "night": 283.15,
+            "eve": 287.15,
+            "morn": 282.15,
+        },
+        "pressure": 1017,
+        "humidity": 64,
+        "wind_speed": 3.1,
+        "wind_deg": 120,
+        "weather": [
+            {"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}
+        ],
+    }
+
+
+@pytest.fixture
+def upstream(mocker):
+    """Patches requests.get to answer with the observation set on `upstream.state`."""
+
+    def get(url):
+        response = mocker.Mock(status_code=200)
+        dt, temp, day_temps = get.state
+        if "/onecall?" in url:
+            response.json.return_value = {
+                "timezone_offset": -18000,
+                "daily": [
+                    make_forecast_day(1729620000 + index * 86400, day_temp)
+                    for index, day_temp in enumerate(day_temps)
+                ],
+            }
+        else:
+            response.json.return_value = make_weather_data(dt, temp)
+        return response
+
+    mocker.patch("requests.get", side_effect=get)
+    # Every request reads the forecast from upstream, instead of the forecast grid cache.
+    mocker.patch("app.views.weather_view.FORECAST_GRID_RESOLUTION", 0)
+    return get
+
+
+CONTEXT = {"unit": "C", "include": "all", "fields": None}
+
+
+def test_render_etag_ignores_requested_time():
+    first = {"temperature": "14°C", "requested_time": "2024-10-22 04:00:00"}
+    second = {"temperature": "14°C", "requested_time": "2024-10-22 04:10:00"}
+
+    assert render_etag(first) == render_etag(second)
+    assert render_etag(first) != render_etag({"temperature": "15°C"})
+
+
+def test_record_render_keeps_distinct_recent_renders(settings, mocker):
+    mocker.patch("app.utils.delta.WEATHER_RENDER_HISTORY_SIZE", 2)
+
+    for dt, temp in ((1, "1°C"), (2, "2°C"), (2, "2°C"), (3, "3°C")):
+        history = record_render(1, CONTEXT, dt, {"temperature": temp})
+
+    assert [render["dt"] for render in history] == [2, 3]
+    assert record_render(1, {**CONTEXT, "unit": "F"}, 3, {"t": 1})[0]["dt"] == 3
+
+
+def test_find_render():
+    history = [
+        {"dt": 1, "etag": "aa", "data": {}},
+        {"dt": 2, "etag": "bb", "data": {}},
+    ]
+
+    assert find_render(history, '"aa"')["dt"] == 1
+    assert find_render(history, 'W/"bb"')["dt"] == 2
+    assert find_render(history, "2")["etag"] == "bb"
+    assert find_render(history, "cc") is None
+
+
+def test_diff_render():
+    previous = {
+        "temperature": "14°C",
+        "humidity": "94%",
+        "requested_time": "a",
+        "forecast": [{"temperature": 1}, {"temperature": 2}],
+    }
+    current = {
+        "temperature": "15°C",
+        "humidity": "94%",
+        "requested_time": "b",
+        "forecast": [{"temperature": 1}, {"temperature": 3}, {"temperature": 4}],
+    }
+
+    assert diff_render(previous, current) == {
+        "temperature": "15°C",
+        "requested_time": "b",
+        "forecast": {
+            "size": 3,
+            "days": {"1": {"temperature": 3}, "2": {"temperature": 4}},
+        },
+    }
+    assert diff_render(current, current) == {"requested_time": "b"}
+
+
+def test_get_weather_delta_since_etag(upstream):
+    url = reverse("weather")
+    params = {"city": "Bogota", "country": "CO"}
+    upstream.state = (1729570140, 286.88, [290.15, 291.15, 292.15])
+    first = APIClient().get(url, params)
+
+    upstream.state = (1729573740, 288.15, [290.15, 295.15, 292.15])
+    second = APIClient().get(url, {**params, "since": first["ETag"]})
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data["since"] == first["ETag"].strip('"')
+    assert second["ETag"] != first["ETag"]
+    assert set(second.data["data"]) == {"temperature", "requested_time", "forecast"}
+    assert second.data["data"]["temperature"] == "15°C"
+    assert list(second.data["data"]["forecast"]["days"]) == ["1"]
+
+
+def test_get_weather_unknown_since_returns_full_response(upstream):
+    upstream.state = (1729570140, 286.88, [290.15])
+
+    response = APIClient().get(
+        reverse("weather"), {"city": "Bogota", "country": "CO", "since": "unknown"}
+    )
+
+    assert "since" not in response.data
+    assert response.data["data"]["location_name"] == "Bogota, CO"
+    assert response["ETag"]
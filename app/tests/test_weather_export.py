@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.utils.export import gzip_chunks, iter_weather_batches
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def stored_cities():
+    for city_id in range(1, 6):
+        Weather(
+            id=city_id,
+            name=f"City {city_id}",
+            dt=1729570140,
+            timezone=-18000,
+            forecast_hash="hash",
+        ).save()
+
+
+def read_lines(content):
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+def test_iter_weather_batches(stored_cities):
+    batches = list(iter_weather_batches(("name",), batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0] == {"id": 1, "name": "City 1"}
+
+
+def test_gzip_chunks():
+    chunks = [b'{"id":1}\n', b'{"id":2}\n']
+
+    assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"".join(chunks)
+
+
+def test_export_endpoint(stored_cities):
+    response = APIClient().get(reverse("weather-export"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = read_lines(b"".join(response.streaming_content))
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0]["name"] == "City 1"
+    assert "forecast_hash" not in rows[0]
+
+
+def test_export_endpoint_gzip_fields(stored_cities):
+    response = APIClient().get(
+        reverse("weather-export"), {"fields": "name"}, HTTP_ACCEPT_ENCODING="gzip"
+    )
+
+    assert response["Content-Encoding"] == "gzip"
+    rows = read_lines(gzip.decompress(b"".join(response.streaming_content)))
+    assert rows[4] == {"id": 5, "name": "City 5"}
+
+
+def test_export_endpoint_streams_batches_under_asgi(mocker, stored_cities):
+    mocker.patch("app.views.weather_export_view.EXPORT_BATCH_SIZE", 2)
+    read = []
+
+    def batches(fields, batch_size):
+        for batch in iter_weather_batches(fields, batch_size):
+            read.append(len(batch))
+            yield batch
+
+    mocker.patch("app.views.weather_export_view.iter_weather_batches", batches)
+
+    async def scenario():
+        response = await AsyncClient().get(
+            reverse("weather-export"), {"fields": "name"}
+        )
+        chunks = []
+        async for chunk in response.streaming_content:
+            # Only the batch of this chunk has been read from the cursor.
+            chunks.append((chunk, list(read)))
+        return response, chunks
+
+    response, chunks = asyncio.run(scenario())
+
+    assert response.is_async
+    assert [len(read_lines(chunk)) for chunk, _ in chunks] == [2, 2, 1]
+    assert [read for _, read in chunks] == [[2], [2, 2], [2, 2, 1]]
+
+
+def test_export_endpoint_unknown_fields():
+    response = APIClient().get(reverse("weather-export"), {"fields": "name,visits"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_weather_command(stored_cities, tmp_path):
+    output = tmp_path / "weather.ndjson.gz"
+
+    call_command("export_weather", str(output), "--batch-size", "2")
+
+    with gzip.open(output) as export_file:
+        rows = read_lines(export_file.read())
+    assert len(rows) == 5
+    assert rows[2]["id"] == 3
@@ -0,0 +1,200 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.serializers.weather_serializer import HourlyForecastSerializer
+from app.utils.hourly import compact_hourly, hourly_index
+
+START = 1729569600
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def hourly_data():
+    return [
+        {
+            "dt": START + hour * 3600,
+            "temp": 280.15 + hour,
+            "pressure": 1017,
+            "humidity": 80,
+            "wind_speed": 1.5,
+            "wind_deg": 0,
+            "pop": 0.2,
+            "weather": [
+                {
+                    "id": 500,
+                    "main": "Rain",
+                    "description": "light rain" if hour % 2 else "overcast clouds",
+                    "icon": "10d",
+                }
+            ],
+        }
+        for hour in range(48)
+    ]
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+    }
+
+
+@pytest.fixture
+def stored_city(weather_data, hourly_data):
+    Weather(**weather_data, hourly=compact_hourly(hourly_data)).save()
+
+
+def test_compact_hourly(hourly_data):
+    hourly = compact_hourly(hourly_data)
+
+    assert hourly["start"] == START
+    assert hourly["step"] == 3600
+    assert hourly["size"] == 48
+    assert hourly["temp"][:2] == [280.15, 281.15]
+    assert hourly["descriptions"] == ["overcast clouds", "light rain"]
+    assert hourly["weather"][:3] == [0, 1, 0]
+    assert compact_hourly([]) is None
+
+
+def test_hourly_index(hourly_data):
+    hourly = compact_hourly(hourly_data)
+
+    assert hourly_index(hourly, None) == 0
+    assert hourly_index(hourly, START - 60) == 0
+    assert hourly_index(hourly, START + 3600) == 1
+    assert hourly_index(hourly, START + 3601) == 2
+    assert hourly_index(hourly, START + 100 * 3600) == 48
+
+
+def test_hourly_serializer_formats_only_one_page(mocker, hourly_data):
+    serializer = HourlyForecastSerializer(
+        {"hourly": compact_hourly(hourly_data), "timezone": -18000},
+        context={"limit": 5},
+    )
+    beaufort = mocker.spy(serializer, "get_beaufort_scale")
+
+    data = serializer.data
+
+    assert len(data["hours"]) == 5
+    assert beaufort.call_count == 5
+    assert data["hours"][0] == {
+        "dt": START,
+        "time": "11:00 PM",
+        "temperature": "7°C",
+        "wind": "Light air, 1.5 m/s, North",
+        "cloudiness": "Overcast clouds",
+        "pressure": "1017 hPa",
+        "humidity": "80%",
+        "precipitation": "20%",
+    }
+    assert data["next_cursor"] == START + 5 * 3600
+
+
+def test_get_hourly_pages(stored_city):
+    url = reverse("weather-hourly")
+    client = APIClient()
+
+    first = client.get(url, {"id": 3688689, "limit": 40})
+    second = client.get(
+        url, {"id": 3688689, "limit": 40, "cursor": first.data["data"]["next_cursor"]}
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert len(first.data["data"]["hours"]) == 40
+    assert len(second.data["data"]["hours"]) == 8
+    assert second.data["data"]["hours"][0]["dt"] == START + 40 * 3600
+    assert second.data["data"]["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "params", [{"id": "abc"}, {"id": 3688689, "limit": 0}, {"id": 3688689, "limit": 49}]
+)
+def test_get_hourly_invalid_params(stored_city, params):
+    response = APIClient().get(reverse("weather-hourly"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_hourly_not_found():
+    response = APIClient().get(reverse("weather-hourly"), {"id": 1})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_weather_stores_hourly(mocker, weather_data, hourly_data):
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = {"daily": [], "hourly": hourly_data}
+        else:
+            response.json.return_value = dict(weather_data)
+        return response
+
+    mocker.patch("requests.get", side_effect=upstream)
+
+    APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+    response = APIClient().get(reverse("weather-hourly"), {"id": 3688689})
+
+    assert len(response.data["data"]["hours"]) == 12
+    assert Weather.objects.get(id=3688689).hourly["size"] == 48
+
+
+def test_get_weather_stores_new_hourly_for_same_observation(
+    mocker, weather_data, hourly_data
+):
+    hourly = {"series": hourly_data}
+
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = {"daily": [], "hourly": hourly["series"]}
+        else:
+            response.json.return_value = dict(weather_data)
+        return response
+
+    mocker.patch("requests.get", side_effect=upstream)
+
+    APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+    hourly["series"] = [{**hour, "temp": 300.15} for hour in hourly_data]
+    cache.clear()
+    APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+
+    assert Weather.objects.get(id=3688689).hourly["temp"][0] == 300.15
@@ -0,0 +1,205 @@
+import pytest
+from mongoengine import connect, disconnect
+import mongomock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.serializers.weather_serializer import WeatherResponseSerializer
+from app.utils.persistence import forecast_hash
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    disconnect()
+    connect(
+        "mongoenginetest",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        uuidRepresentation="standard",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+    }
+
+
+@pytest.fixture
+def forecast_data():
+    return {
+        "timezone_offset": -18000,
+        "current": {"dt": 1729570140},
+        "daily": [
+            {
+                "dt": 1729620000,
+                "sunrise": 1729593647,
+                "sunset": 1729636848,
+                "temp": {
+                    "day": 290.15,
+                    "min": 282.15,
+                    "max": 291.15,
+                    "night": 283.15,
+                    "eve": 287.15,
+                    "morn": 282.15,
+                },
+                "pressure": 1017,
+                "humidity": 64,
+                "wind_speed": 3.1,
+                "wind_deg": 120,
+                "weather": [
+                    {
+                        "id": 500,
+                        "main": "Rain",
+                        "description": "light rain",
+                        "icon": "10d",
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def mock_upstream(mocker, weather_data, forecast_data):
+    def upstream(url):
+        response = mocker.Mock(status_code=200)
+        if "/onecall?" in url:
+            response.json.return_value = forecast_data
+        else:
+            response.json.return_value = dict(weather_data)
+        return response
+
+    return mocker.patch("requests.get", side_effect=upstream)
+
+
+def test_get_weather_current_only(mock_upstream, weather_data):
+    Weather(**weather_data, forecast=[{"dt": 1}], forecast_hash="stored").save()
+
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"city": "Bogota", "country": "CO", "include": "current"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "forecast" not in response.data["data"]
+    assert response.data["data"]["temperature"] == "14°C"
+    assert mock_upstream.call_count == 1
+    weather = Weather.objects.get(id=3688689)
+    assert weather.forecast == [{"dt": 1}]
+    assert weather.forecast_hash == "stored"
+
+
+def test_get_weather_forecast_only(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"city": "Bogota", "country": "CO", "include": "forecast"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert set(data) == {"geo_coordinates", "requested_time", "forecast"}
+    assert data["forecast"][0]["temperature"]["day"] == "17°C"
+
+
+def test_get_weather_by_coordinates_forecast_only(mock_upstream, forecast_data):
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"lat": "4.6097", "lon": "-74.0817", "include": "forecast"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["geo_coordinates"] == "[4.61, -74.08]"
+    assert response.data["data"]["forecast"][0]["wind"].startswith("Light breeze")
+    assert mock_upstream.call_count == 1
+    assert "/onecall?" in mock_upstream.call_args.args[0]
+    assert Weather.objects.count() == 0
+
+
+def test_get_weather_by_coordinates_include_has_own_cache_entry(mock_upstream):
+    url = reverse("weather")
+    client = APIClient()
+
+    client.get(url, {"lat": "4.6097", "lon": "-74.0817", "include": "current"})
+    response = client.get(url, {"lat": "4.6097", "lon": "-74.0817"})
+
+    assert "forecast" in response.data["data"]
+    assert mock_upstream.call_count == 3
+    weather = Weather.objects.get(id=3688689)
+    assert weather.forecast_hash == forecast_hash(weather.forecast)
+
+
+def test_get_weather_invalid_include(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"city": "Bogota", "country": "CO", "include": "hourly"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_upstream.assert_not_called()
+
+
+def test_get_weather_sparse_fields(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"city": "Bogota", "country": "CO", "fields": "temperature,forecast"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data["data"]) == {"temperature", "forecast"}
+
+
+def test_get_weather_unknown_fields(mock_upstream):
+    url = reverse("weather")
+    response = APIClient().get(
+        url, {"city": "Bogota", "country": "CO", "fields": "temperature,base"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_upstream.assert_not_called()
+
+
+def test_to_representation_current_only(weather_data):
+    serializer = WeatherResponseSerializer(weather_data, context={"include": "current"})
+
+    assert "forecast" not in serializer.data
+    assert serializer.data["location_name"] == "Bogota, CO"
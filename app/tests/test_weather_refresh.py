@@ -0,0 +1,227 @@
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from mongoengine import DEFAULT_CONNECTION_NAME
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app import constants
+from app.models import Weather
+from app.utils.weather_refresh import (
+    build_group_update,
+    chunked,
+    refresh_weather_group,
+)
+from app.views import weather_batch_view
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def make_weather_data(city_id, name, temp=286.88):
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": temp,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": city_id,
+        "name": name,
+        "cod": 200,
+        "forecast": [],
+    }
+
+
+def make_group_item(city_id, name, temp):
+    item = make_weather_data(city_id, name, temp)
+    for field in ("base", "cod", "forecast"):
+        item.pop(field)
+    item["sys"] = {
+        "country": "CO",
+        "timezone": -18000,
+        "sunrise": 1729507253,
+        "sunset": 1729550432,
+    }
+    item.pop("timezone")
+    item["dt"] = 1729573740
+    return item
+
+
+@pytest.fixture
+def stored_cities():
+    stale = datetime.now(tz=pytz.utc) - timedelta(hours=1)
+    for city_id, name in ((1, "Bogota"), (2, "Medellin"), (3, "Cali")):
+        Weather(**make_weather_data(city_id, name), updated_at=stale).save()
+
+
+def test_chunked():
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+def test_build_group_update_keeps_station_fields():
+    update = build_group_update(make_group_item(1, "Bogota", 290.0))
+
+    assert update["main"]["temp"] == 290.0
+    assert update["timezone"] == -18000
+    assert update["sys.country"] == "CO"
+    assert "sys" not in update
+    assert "base" not in update
+
+
+def test_refresh_weather_group_packs_ids(mocker, stored_cities):
+    mocker.patch("app.utils.weather_refresh.OPEN_WEATHER_MAP_GROUP_SIZE", 2)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.side_effect = [
+        {
+            "cnt": 2,
+            "list": [
+                make_group_item(1, "Bogota", 290.0),
+                make_group_item(2, "Medellin", 291.0),
+            ],
+        },
+        {"cnt": 1, "list": [make_group_item(3, "Cali", 292.0)]},
+    ]
+
+    stats = refresh_weather_group(max_age=60)
+
+    assert mock_get.call_count == 2
+    assert "group?id=1,2&" in mock_get.call_args_list[0].args[0]
+    assert stats == {
+        "selected": 3,
+        "calls": 2,
+        "updated": 3,
+        "skipped": 0,
+        "failed": 0,
+    }
+    weather = Weather.objects.get(id=3)
+    assert weather.main.temp == 292.0
+    assert weather.sys.id == 8582
+    assert weather.base == "stations"
+
+
+def test_refresh_weather_group_skips_fresh_cities(mocker, stored_cities):
+    Weather.objects(id=2).update(updated_at=datetime.now(tz=pytz.utc))
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {
+        "cnt": 2,
+        "list": [
+            make_group_item(1, "Bogota", 290.0),
+            make_group_item(3, "Cali", 292.0),
+        ],
+    }
+
+    stats = refresh_weather_group(max_age=60)
+
+    assert stats["selected"] == 2
+    assert "group?id=1,3&" in mock_get.call_args.args[0]
+
+
+def test_refresh_weather_group_upstream_failure(mocker, stored_cities):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 500
+
+    stats = refresh_weather_group()
+
+    assert stats["failed"] == 1
+    assert stats["updated"] == 0
+
+
+def test_weather_batch_endpoint(mocker, api_client, stored_cities):
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {
+        "cnt": 2,
+        "list": [
+            make_group_item(1, "Bogota", 300.15),
+            make_group_item(2, "Medellin", 291.0),
+        ],
+    }
+
+    reads = mocker.spy(weather_batch_view, "get_weather_documents")
+
+    url = reverse("weather-batch")
+    response = api_client.get(url, {"ids": "1,2,99"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert mock_get.call_count == 1
+    assert reads.call_args.kwargs["alias"] == DEFAULT_CONNECTION_NAME
+    assert response.data["missing"] == [99]
+    temperatures = {item["id"]: item["temperature"] for item in response.data["data"]}
+    assert temperatures[1] == "27°C"
+
+
+def test_weather_batch_endpoint_sparse_fields(mocker, api_client, stored_cities):
+    Weather.objects.update(updated_at=datetime.now(tz=pytz.utc))
+    mock_get = mocker.patch("requests.get")
+
+    url = reverse("weather-batch")
+    response = api_client.get(url, {"ids": "1,2", "fields": "temperature,humidity"})
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_get.assert_not_called()
+    assert response.data["data"][0] == {
+        "id": 1,
+        "temperature": "14°C",
+        "humidity": "94%",
+    }
+
+
+def test_weather_batch_endpoint_unknown_fields(api_client):
+    url = reverse("weather-batch")
+    response = api_client.get(url, {"ids": "1", "fields": "visibility"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_weather_batch_endpoint_invalid_ids(api_client):
+    url = reverse("weather-batch")
+    response = api_client.get(url, {"ids": "1,abc"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_blank_settings_use_defaults(monkeypatch):
+    # `KEY=` lines copied from .env.template are loaded as empty strings.
+    monkeypatch.setenv("OPEN_WEATHER_MAP_GROUP_SIZE", "")
+    monkeypatch.setenv("WEATHER_CACHE_MIN_TTL", "")
+
+    importlib.reload(constants)
+
+    assert constants.OPEN_WEATHER_MAP_GROUP_SIZE == 20
+    assert constants.WEATHER_CACHE_MIN_TTL == 30
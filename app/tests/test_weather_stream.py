@@ -0,0 +1,221 @@
+import asyncio
+import json
+
+import pytest
+from mongoengine import DEFAULT_CONNECTION_NAME
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, RequestFactory
+from app.models import Weather
+from app.utils.stream import (
+    STREAM_CLOSED,
+    WeatherUpdateHub,
+    format_event,
+    publish_weather_updates,
+    render_city_events,
+)
+from app.views.weather_stream_view import WeatherStreamView
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+def make_weather_data(city_id, name):
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": city_id,
+        "name": name,
+        "cod": 200,
+        "forecast": [],
+    }
+
+
+@pytest.fixture
+def stored_cities():
+    for city_id, name in ((1, "Bogota"), (2, "Medellin")):
+        Weather(**make_weather_data(city_id, name)).save()
+
+
+@pytest.fixture
+def pubsub(mocker):
+    pubsub = mocker.AsyncMock()
+    pubsub.get_message.side_effect = lambda **kwargs: asyncio.sleep(0.01)
+    mocker.patch(
+        "redis.asyncio.Redis.from_url"
+    ).return_value.pubsub.return_value = pubsub
+    return pubsub
+
+
+def event_payload(event):
+    return json.loads(event.split(b"\ndata: ")[1])
+
+
+def test_format_event():
+    assert format_event(1, 1729570140, b'{"a":1}') == (
+        b'event: weather\nid: 1:1729570140\ndata: {"a":1}\n\n'
+    )
+
+
+def test_render_city_events(stored_cities):
+    events = render_city_events([1, 2, 3])
+
+    assert list(events) == [1, 2]
+    assert event_payload(events[1])["location_name"] == "Bogota, CO"
+
+
+def test_publish_only_followed_cities(mocker, stored_cities):
+    client = mocker.patch("app.utils.stream._get_publisher").return_value
+    client.pubsub_numsub.return_value = [
+        (b"weather:updates:1", 3),
+        (b"weather:updates:2", 0),
+    ]
+    render = mocker.patch(
+        "app.utils.stream.render_city_events", wraps=render_city_events
+    )
+
+    publish_weather_updates(Weather, city_ids=[1, 2])
+
+    render.assert_called_once_with([1], DEFAULT_CONNECTION_NAME)
+    publish = client.pipeline.return_value.publish
+    publish.assert_called_once()
+    channel, event = publish.call_args.args
+    assert channel == "weather:updates:1"
+    assert event_payload(event)["id"] == 1
+
+
+def test_publish_skips_unfollowed_cities(mocker, stored_cities):
+    client = mocker.patch("app.utils.stream._get_publisher").return_value
+    client.pubsub_numsub.return_value = [(b"weather:updates:1", 0)]
+
+    publish_weather_updates(Weather, city_ids=[1])
+
+    client.pipeline.assert_not_called()
+
+
+def test_hub_fans_out_one_subscription(pubsub):
+    async def scenario():
+        hub = WeatherUpdateHub(queue_size=2)
+        first = await hub.subscribe([1, 2])
+        second = await hub.subscribe([1])
+
+        hub.dispatch(1, b"one")
+        hub.dispatch(2, b"two")
+        assert [first.get_nowait(), first.get_nowait()] == [b"one", b"two"]
+        assert second.get_nowait() == b"one"
+
+        await hub.unsubscribe([1, 2], first)
+        await hub.unsubscribe([1], second)
+        hub._reader.cancel()
+
+    asyncio.run(scenario())
+
+    assert [call.args for call in pubsub.subscribe.await_args_list] == [
+        ("weather:updates:1", "weather:updates:2")
+    ]
+    assert [call.args for call in pubsub.unsubscribe.await_args_list] == [
+        ("weather:updates:2",),
+        ("weather:updates:1",),
+    ]
+
+
+def test_hub_drops_oldest_event_of_slow_clients(pubsub):
+    async def scenario():
+        hub = WeatherUpdateHub(queue_size=2)
+        queue = await hub.subscribe([1])
+        for event in (b"a", b"b", b"c"):
+            hub.dispatch(1, event)
+        hub._reader.cancel()
+        return hub, [queue.get_nowait(), queue.get_nowait()]
+
+    hub, events = asyncio.run(scenario())
+
+    assert events == [b"b", b"c"]
+    assert hub.dropped == 1
+
+
+def test_hub_closes_streams_when_redis_fails(pubsub):
+    pubsub.get_message.side_effect = ConnectionError("gone")
+
+    async def scenario():
+        hub = WeatherUpdateHub()
+        queue = await hub.subscribe([1])
+        return await asyncio.wait_for(queue.get(), 1)
+
+    assert asyncio.run(scenario()) is STREAM_CLOSED
+
+
+def get_stream(params, factory=AsyncRequestFactory):
+    request = factory().get("/weather/stream/", params)
+    return asyncio.run(WeatherStreamView.as_view()(request))
+
+
+@pytest.mark.parametrize("ids", ["", "1,a", ",".join(map(str, range(51)))])
+def test_stream_invalid_ids(mocker, ids):
+    mocker.patch("app.views.weather_stream_view.WEATHER_STREAM", True)
+
+    assert get_stream({"ids": ids}).status_code == 400
+
+
+def test_stream_disabled():
+    assert get_stream({"ids": "1"}).status_code == 404
+
+
+def test_stream_needs_asgi(mocker):
+    mocker.patch("app.views.weather_stream_view.WEATHER_STREAM", True)
+
+    assert get_stream({"ids": "1"}, RequestFactory).status_code == 501
+
+
+def test_stream_sends_snapshot_then_updates(mocker, stored_cities):
+    mocker.patch("app.views.weather_stream_view.WEATHER_STREAM", True)
+    hub = mocker.patch("app.views.weather_stream_view.weather_update_hub")
+
+    async def subscribe(city_ids):
+        queue = asyncio.Queue()
+        for event in (b"update\n\n", STREAM_CLOSED):
+            queue.put_nowait(event)
+        return queue
+
+    hub.subscribe.side_effect = subscribe
+    hub.unsubscribe = mocker.AsyncMock()
+    request = AsyncRequestFactory().get("/weather/stream/", {"ids": "2,1"})
+
+    async def scenario():
+        response = await WeatherStreamView.as_view()(request)
+        return response, [event async for event in response.streaming_content]
+
+    response, events = asyncio.run(scenario())
+
+    assert response["Content-Type"] == "text/event-stream"
+    assert [event_payload(event)["id"] for event in events[:2]] == [1, 2]
+    assert events[2:] == [b"update\n\n"]
+    hub.unsubscribe.assert_awaited_once()
@@ -0,0 +1,105 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.signals import notify_weather_stored
+from app.utils.tiles import (
+    aggregate_tile,
+    city_tile_keys,
+    tile_bounds,
+    tile_cache_key,
+    tile_position,
+)
+
+# Bogota and Medellin share a cell of the zoom 3 tile (2, 3), Lima is in (2, 4).
+CITIES = [
+    (1, 4.6097, -74.0817, 286.15, 2.0, 0),
+    (2, 6.2518, -75.5636, 296.15, 4.0, 90),
+    (3, -12.0432, -77.0282, 291.15, 5.0, 180),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def stored_cities():
+    for city_id, lat, lon, temp, speed, deg in CITIES:
+        Weather(
+            id=city_id,
+            coord={"lat": lat, "lon": lon},
+            main={"temp": temp},
+            wind={"speed": speed, "deg": deg},
+        ).save()
+
+
+def test_tile_position_and_bounds():
+    x, y = tile_position(4.6097, -74.0817, 5)
+    west, south, east, north = tile_bounds(5, int(x), int(y))
+
+    assert (int(x), int(y)) == (9, 15)
+    assert west <= -74.0817 < east
+    assert south < 4.6097 <= north
+
+
+def test_aggregate_tile(stored_cities):
+    tile = aggregate_tile(3, 2, 3)
+
+    assert tile["count"] == 2
+    assert len(tile["cells"]) == 1
+    cell = tile["cells"][0]
+    assert cell["count"] == 2
+    assert cell["temp_mean"] == pytest.approx(291.15)
+    assert cell["temp_min"] == 286.15
+    assert cell["wind_speed_max"] == 4.0
+    assert cell["wind_deg_mean"] == 63
+
+
+def test_aggregate_whole_world(stored_cities):
+    assert aggregate_tile(0, 0, 0)["count"] == 3
+
+
+def test_tile_endpoint(stored_cities):
+    url = reverse("weather-tile", kwargs={"z": 3, "x": 2, "y": 4})
+    response = APIClient().get(url, {"unit": "imperial"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["count"] == 1
+    assert response.data["data"]["cells"][0]["temp_mean"] == 64.4
+
+
+def test_tile_endpoint_uses_cache(mocker, stored_cities):
+    url = reverse("weather-tile", kwargs={"z": 3, "x": 2, "y": 3})
+    aggregate = mocker.patch("app.utils.tiles.aggregate_tile", wraps=aggregate_tile)
+
+    APIClient().get(url)
+    APIClient().get(url)
+
+    assert aggregate.call_count == 1
+
+
+@pytest.mark.parametrize("z, x, y", [(13, 0, 0), (2, 4, 0), (2, 0, 4)])
+def test_tile_endpoint_out_of_range(z, x, y):
+    url = reverse("weather-tile", kwargs={"z": z, "x": x, "y": y})
+
+    assert APIClient().get(url).status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_stored_cities_invalidate_their_tiles(stored_cities):
+    bogota_tile = tile_cache_key(3, 2, 3)
+    lima_tile = tile_cache_key(3, 2, 4)
+    cache.set_many({bogota_tile: {"count": 0}, lima_tile: {"count": 0}})
+
+    notify_weather_stored(Weather, [1])
+
+    assert cache.get(bogota_tile) is None
+    assert cache.get(lima_tile) == {"count": 0}
+    assert tile_cache_key(0, 0, 0) in city_tile_keys(4.6097, -74.0817)
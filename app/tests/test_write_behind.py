@@ -0,0 +1,163 @@
+import pytest
+from mongoengine import connect, disconnect
+import mongomock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from app.models import Weather
+from app.serializers.weather_serializer import WeatherSerializer
+from app.utils.metrics import get_metrics
+from app.utils.persistence import forecast_hash, weather_upsert_document
+from app.utils.write_behind import WriteBehindQueue
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mongoengine_connection():
+    disconnect()
+    connect(
+        "mongoenginetest",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        uuidRepresentation="standard",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_db(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    Weather.objects.delete()
+
+
+@pytest.fixture
+def weather_data():
+    return {
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "id": 3688689,
+        "name": "Bogota",
+        "cod": 200,
+        "daily": [],
+    }
+
+
+def upsert(weather_data, temp):
+    weather_data["main"]["temp"] = temp
+    serializer = WeatherSerializer(data=weather_data)
+    assert serializer.is_valid()
+    return weather_upsert_document(serializer.validated_data)
+
+
+def test_write_behind_flushes_latest_upsert(weather_data):
+    write_queue = WriteBehindQueue(flush_interval=0.01)
+    weather_data["forecast"] = []
+
+    assert write_queue.put(3688689, upsert(weather_data, 280.0))
+    assert write_queue.put(3688689, upsert(weather_data, 290.0))
+    write_queue.join()
+    write_queue.close()
+
+    weather = Weather.objects.get(id=3688689)
+    assert weather.main.temp == 290.0
+    assert weather.forecast_hash == forecast_hash([])
+    assert weather.created_at is not None
+
+
+def test_write_behind_merges_upserts_of_a_city(mocker, weather_data):
+    write_queue = WriteBehindQueue()
+    mocker.patch.object(write_queue, "start")
+    weather_data["forecast"] = [{"dt": 1}]
+    full = upsert(weather_data, 280.0)
+    del weather_data["forecast"]
+    current_only = upsert(weather_data, 290.0)
+
+    assert write_queue.put(3688689, full)
+    assert write_queue.put(3688689, current_only)
+    write_queue.close()
+
+    weather = Weather.objects.get(id=3688689)
+    assert weather.main.temp == 290.0
+    assert weather.forecast == [{"dt": 1}]
+    assert weather.forecast_hash == forecast_hash([{"dt": 1}])
+
+
+def test_write_behind_backpressure(mocker, weather_data):
+    write_queue = WriteBehindQueue(maxsize=1, put_timeout=0.01)
+    mocker.patch.object(write_queue, "start")
+
+    assert write_queue.put(3688689, upsert(weather_data, 280.0))
+    assert not write_queue.put(3688689, upsert(weather_data, 290.0))
+    write_queue.close()
+
+
+def test_write_behind_flushes_on_close(mocker, weather_data):
+    write_queue = WriteBehindQueue()
+    mocker.patch.object(write_queue, "start")
+    write_queue.put(3688689, upsert(weather_data, 280.0))
+
+    write_queue.close()
+
+    assert Weather.objects.get(id=3688689).main.temp == 280.0
+    assert not write_queue.put(3688689, upsert(weather_data, 290.0))
+
+
+def test_get_weather_write_behind(mocker, weather_data):
+    write_queue = WriteBehindQueue(flush_interval=0.01)
+    mocker.patch("app.views.weather_view.WEATHER_WRITE_BEHIND", True)
+    mocker.patch("app.views.weather_view.write_behind_queue", write_queue)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = weather_data
+
+    response = APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+    write_queue.join()
+    write_queue.close()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["data"]["temperature"] == "14°C"
+    assert Weather.objects.get(id=3688689).name == "Bogota"
+
+
+def test_get_weather_write_behind_tracks_update_interval(mocker, weather_data):
+    write_queue = WriteBehindQueue(flush_interval=0.01)
+    mocker.patch("app.views.weather_view.WEATHER_WRITE_BEHIND", True)
+    mocker.patch("app.views.weather_view.write_behind_queue", write_queue)
+    mock_get = mocker.patch("requests.get")
+    mock_get.return_value.status_code = 200
+    skipped = get_metrics()["weather.writes.skipped"]
+
+    for dt in (1000, 1600, 1600):
+        mock_get.return_value.json.return_value = {**weather_data, "dt": dt}
+        cache.clear()
+        APIClient().get(reverse("weather"), {"city": "Bogota", "country": "CO"})
+        write_queue.join()
+    write_queue.close()
+
+    assert Weather.objects.get(id=3688689).dt_interval == 600
+    assert get_metrics()["weather.writes.skipped"] == skipped + 1
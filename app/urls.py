@@ -17,8 +17,41 @@ Including another URLconf
 
 from django.urls import path
 
+from app.views.alert_rules_view import AlertRuleAPIView, AlertRulesAPIView
+from app.views.metrics_view import MetricsAPIView
+from app.views.weather_autocomplete_view import WeatherAutocompleteAPIView
+from app.views.weather_batch_view import WeatherBatchAPIView
+from app.views.weather_cities_view import WeatherCitiesAPIView
+from app.views.weather_countries_view import WeatherCountriesAPIView
+from app.views.weather_export_view import WeatherExportAPIView
+from app.views.weather_hourly_view import WeatherHourlyAPIView
+from app.views.weather_stream_view import WeatherStreamView
+from app.views.weather_tile_view import WeatherTileAPIView
 from app.views.weather_view import WeatherAPIView
 
 urlpatterns = [
     path("weather/", WeatherAPIView.as_view(), name="weather"),
+    path("weather/batch/", WeatherBatchAPIView.as_view(), name="weather-batch"),
+    path("weather/hourly/", WeatherHourlyAPIView.as_view(), name="weather-hourly"),
+    path("weather/export/", WeatherExportAPIView.as_view(), name="weather-export"),
+    path("weather/cities/", WeatherCitiesAPIView.as_view(), name="weather-cities"),
+    path(
+        "weather/countries/",
+        WeatherCountriesAPIView.as_view(),
+        name="weather-countries",
+    ),
+    path(
+        "weather/autocomplete/",
+        WeatherAutocompleteAPIView.as_view(),
+        name="weather-autocomplete",
+    ),
+    path(
+        "weather/tiles/<int:z>/<int:x>/<int:y>/",
+        WeatherTileAPIView.as_view(),
+        name="weather-tile",
+    ),
+    path("weather/stream/", WeatherStreamView.as_view(), name="weather-stream"),
+    path("alerts/", AlertRulesAPIView.as_view(), name="alerts"),
+    path("alerts/<str:rule_id>/", AlertRuleAPIView.as_view(), name="alert"),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
 ]
@@ -0,0 +1,47 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.constants import UPSTREAM_ADMISSION_TIMEOUT, UPSTREAM_MAX_CONCURRENT
+from app.utils.metrics import increment, register_metric
+
+ADMISSION_REJECTED_METRIC = register_metric("upstream.admission.rejected")
+
+
+class AdmissionGate:
+    """
+    Caps the number of requests of this process that wait on the upstream API at the same time.
+    A request that cannot get a slot within `timeout` seconds is not admitted, so callers can
+    serve stored data or fail fast instead of tying up every worker when upstream is slow.
+    """
+
+    def __init__(self, limit: int, timeout: float):
+        self.limit = limit
+        self.timeout = timeout
+        self._semaphore: Optional[threading.BoundedSemaphore] = None
+        if limit > 0:
+            self._semaphore = threading.BoundedSemaphore(limit)
+
+    @contextmanager
+    def admit(self) -> Iterator[bool]:
+        """
+        Holds an upstream slot for the duration of the block.
+        Yields:
+            bool: True if the request was admitted, False if every slot stayed busy. Always True
+                when the limit is 0, which disables admission control.
+        """
+
+        if self._semaphore is None:
+            yield True
+            return
+        if not self._semaphore.acquire(timeout=self.timeout):
+            increment(ADMISSION_REJECTED_METRIC)
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._semaphore.release()
+
+
+upstream_admission = AdmissionGate(UPSTREAM_MAX_CONCURRENT, UPSTREAM_ADMISSION_TIMEOUT)
@@ -0,0 +1,192 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from app.constants import ALERTS_REDIS_URL, ALERTS_STREAM_KEY, ALERTS_STREAM_MAXLEN
+from app.models import AlertRule, Weather
+from app.models.enums import AlertMetric, AlertOperator, BeaufortScale
+from app.utils.metrics import increment, register_metric
+
+ALERTS_FIRED_METRIC = register_metric("alerts.fired")
+
+# Where each alert metric is read in a Weather document.
+ALERT_METRIC_SOURCES = {
+    AlertMetric.TEMPERATURE.value: ("main", "temp"),
+    AlertMetric.WIND_SPEED.value: ("wind", "speed"),
+    AlertMetric.HUMIDITY.value: ("main", "humidity"),
+    AlertMetric.PRESSURE.value: ("main", "pressure"),
+}
+
+ALERT_RULE_FIELDS = (
+    "id",
+    "city_id",
+    "metric",
+    "operator",
+    "threshold",
+    "label",
+    "triggered",
+)
+
+# The rules of one city for one metric and operator, sorted by threshold.
+RuleGroup = Tuple[List[float], List[Dict[str, Any]]]
+
+_client: Optional[redis.Redis] = None
+
+
+def metric_values(document: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Reads the alert metrics of a stored Weather document.
+    Args:
+        document (Dict[str, Any]): The raw Weather document.
+    Returns:
+        Dict[str, float]: The value of each metric present in the document.
+    """
+
+    values = {}
+    for metric, (section, field) in ALERT_METRIC_SOURCES.items():
+        value = (document.get(section) or {}).get(field)
+        if value is not None:
+            values[metric] = value
+    return values
+
+
+def group_rules(
+    rules: Iterable[Dict[str, Any]],
+) -> Dict[int, Dict[Tuple[str, str], RuleGroup]]:
+    """
+    Groups raw alert rules by city, metric and operator, sorted by threshold.
+    Args:
+        rules (Iterable[Dict[str, Any]]): The raw AlertRule documents.
+    Returns:
+        Dict[int, Dict[Tuple[str, str], RuleGroup]]: The sorted thresholds and rules of each group.
+    """
+
+    grouped: Dict[int, Dict[Tuple[str, str], List[Dict[str, Any]]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for rule in rules:
+        grouped[rule["city_id"]][(rule["metric"], rule["operator"])].append(rule)
+    result = {}
+    for city_id, groups in grouped.items():
+        result[city_id] = {}
+        for key, group in groups.items():
+            group.sort(key=lambda rule: rule["threshold"])
+            result[city_id][key] = ([rule["threshold"] for rule in group], group)
+    return result
+
+
+def matching_rules(
+    groups: Dict[Tuple[str, str], RuleGroup], values: Dict[str, float]
+) -> List[Dict[str, Any]]:
+    """
+    Finds the rules of a city whose condition holds. Each group is split with one binary search
+    over its sorted thresholds, so the cost grows with the log of the number of rules.
+    Args:
+        groups (Dict[Tuple[str, str], RuleGroup]): The rule groups of the city.
+        values (Dict[str, float]): The metric values of the city.
+    Returns:
+        List[Dict[str, Any]]: The rules whose condition holds.
+    """
+
+    matched = []
+    for (metric, operator), (thresholds, rules) in groups.items():
+        value = values.get(metric)
+        if value is None:
+            continue
+        if operator == AlertOperator.ABOVE.value:
+            matched.extend(rules[: bisect_left(thresholds, value)])
+        else:
+            matched.extend(rules[bisect_right(thresholds, value) :])
+    return matched
+
+
+def alert_event(rule: Dict[str, Any], document: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Builds the stream entry of a triggered alert.
+    Args:
+        rule (Dict[str, Any]): The raw AlertRule document.
+        document (Dict[str, Any]): The raw Weather document that triggered it.
+    Returns:
+        Dict[str, str]: The stream entry fields.
+    """
+
+    value = metric_values(document)[rule["metric"]]
+    event = {
+        "rule_id": str(rule["_id"]),
+        "city_id": str(rule["city_id"]),
+        "city": document.get("name", ""),
+        "metric": rule["metric"],
+        "operator": rule["operator"],
+        "threshold": str(rule["threshold"]),
+        "value": str(value),
+        "dt": str(document.get("dt", "")),
+        "label": rule.get("label") or "",
+    }
+    if rule["metric"] == AlertMetric.WIND_SPEED.value:
+        event["beaufort"] = BeaufortScale.get_description(value)
+    return event
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(ALERTS_REDIS_URL)
+    return _client
+
+
+def evaluate_alerts(sender: Any, city_ids: Iterable[int], **kwargs: Any) -> None:
+    """
+    Evaluates the alert rules of stored cities. Receiver of the `weather_stored` signal.
+    The rules of every stored city are loaded with one query, and an alert is added to the
+    ALERTS_STREAM_KEY Redis stream when a condition starts holding. It fires again only after
+    the condition stopped holding at a later evaluation.
+    Args:
+        sender (Any): The sender of the signal.
+        city_ids (Iterable[int]): The ids of the stored cities.
+    """
+
+    rules = list(
+        AlertRule.objects(city_id__in=list(city_ids))
+        .only(*ALERT_RULE_FIELDS)
+        .as_pymongo()
+    )
+    if not rules:
+        return
+    grouped = group_rules(rules)
+    documents = (
+        Weather.objects(id__in=list(grouped))
+        .only("name", "dt", "main", "wind")
+        .as_pymongo()
+    )
+
+    fired = []
+    cleared = []
+    for document in documents:
+        groups = grouped[document["_id"]]
+        matched = {
+            rule["_id"] for rule in matching_rules(groups, metric_values(document))
+        }
+        for _, group in groups.values():
+            for rule in group:
+                if rule["_id"] in matched and not rule.get("triggered"):
+                    fired.append(alert_event(rule, document))
+                elif rule["_id"] not in matched and rule.get("triggered"):
+                    cleared.append(rule["_id"])
+
+    if fired:
+        # The rules are only marked once the alerts are in the stream, so a failed push is
+        # retried at the next refresh.
+        pipeline = _get_client().pipeline(transaction=False)
+        for event in fired:
+            pipeline.xadd(
+                ALERTS_STREAM_KEY, event, maxlen=ALERTS_STREAM_MAXLEN, approximate=True
+            )
+        pipeline.execute()
+        AlertRule.objects(id__in=[event["rule_id"] for event in fired]).update(
+            set__triggered=True
+        )
+        increment(ALERTS_FIRED_METRIC, len(fired))
+    if cleared:
+        AlertRule.objects(id__in=cleared).update(set__triggered=False)
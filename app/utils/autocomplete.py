@@ -0,0 +1,145 @@
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models import Weather
+from app.utils.persistence import weather_reads
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes a city name for prefix matching, ignoring case and accents.
+    Args:
+        name (str): The city name or typed prefix.
+    Returns:
+        str: The case-folded name without combining accents.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", name)
+    return (
+        "".join(char for char in decomposed if not unicodedata.combining(char))
+        .casefold()
+        .strip()
+    )
+
+
+class CityPrefixIndex:
+    """
+    An in-memory index of the stored city names for prefix lookups.
+
+    Names are kept in a sorted list of `(normalized name, city id)` keys, so a prefix query is a
+    binary search followed by a scan of the matching keys, without touching MongoDB. The index is
+    built from MongoDB on first use and then extended as new cities are stored.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._cities: Dict[int, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self._built = False
+
+    def build(self) -> None:
+        """
+        Loads the name and country of every stored city.
+        """
+
+        documents = weather_reads().only("name", "sys.country").as_pymongo()
+        cities = {
+            document["_id"]: (
+                document["name"],
+                document.get("sys", {}).get("country", ""),
+            )
+            for document in documents
+            if document.get("name")
+        }
+        with self._lock:
+            self._cities = cities
+            self._keys = sorted(
+                (normalize_name(name), city_id) for city_id, (name, _) in cities.items()
+            )
+            self._built = True
+
+    def add(self, city_id: int, name: str, country: str) -> None:
+        """
+        Adds a city to the index, or updates its name and country.
+        Args:
+            city_id (int): The upstream city id.
+            name (str): The city name.
+            country (str): The 2-character country code.
+        """
+
+        with self._lock:
+            previous = self._cities.get(city_id)
+            if previous is not None:
+                if previous == (name, country):
+                    return
+                key = (normalize_name(previous[0]), city_id)
+                index = bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+            self._cities[city_id] = (name, country)
+            insort(self._keys, (normalize_name(name), city_id))
+
+    def search(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Finds the stored cities whose name starts with a prefix, in alphabetical order.
+        Args:
+            prefix (str): The typed prefix. Case and accents are ignored.
+            country (str, optional): Only return cities of this 2-character country code.
+            limit (int, optional): The maximum number of cities to return. Defaults to 10.
+        Returns:
+            List[Dict[str, Any]]: The `id`, `name` and `country` of each matching city.
+        """
+
+        if not self._built:
+            self.build()
+
+        prefix = normalize_name(prefix)
+        country = country.upper() if country else None
+        matches = []
+        with self._lock:
+            index = bisect_left(self._keys, (prefix,))
+            while index < len(self._keys) and len(matches) < limit:
+                key, city_id = self._keys[index]
+                if not key.startswith(prefix):
+                    break
+                name, city_country = self._cities[city_id]
+                if country is None or city_country == country:
+                    matches.append(
+                        {"id": city_id, "name": name, "country": city_country}
+                    )
+                index += 1
+        return matches
+
+    def handle_weather_stored(
+        self, sender: Any, city_ids: Iterable[int], **kwargs: Any
+    ) -> None:
+        """
+        Adds newly stored cities to the index. Receiver of the `weather_stored` signal.
+        Cities already in the index are skipped, since their names do not change, so refreshes
+        of known cities do not read MongoDB.
+        Args:
+            sender (Any): The sender of the signal.
+            city_ids (Iterable[int]): The ids of the stored cities.
+        """
+
+        if not self._built:
+            return
+        new_ids = [city_id for city_id in city_ids if city_id not in self._cities]
+        if not new_ids:
+            return
+        for document in (
+            Weather.objects(id__in=new_ids).only("name", "sys.country").as_pymongo()
+        ):
+            if document.get("name"):
+                self.add(
+                    document["_id"],
+                    document["name"],
+                    document.get("sys", {}).get("country", ""),
+                )
+
+
+city_index = CityPrefixIndex()
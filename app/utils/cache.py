@@ -0,0 +1,99 @@
+import time
+from typing import Optional, Tuple
+
+from app.constants import (
+    WEATHER_CACHE_MAX_TTL,
+    WEATHER_CACHE_MIN_TTL,
+    WEATHER_DEFAULT_UPDATE_INTERVAL,
+    WEATHER_UPDATE_INTERVAL_SMOOTHING,
+)
+
+
+def next_update_interval(
+    previous_dt: Optional[int], new_dt: Optional[int], interval: Optional[int]
+) -> Optional[int]:
+    """
+    Updates the observed upstream update interval of a city with a new observation.
+    Gaps longer than WEATHER_CACHE_MAX_TTL are ignored, since they reflect how often the city
+    was requested rather than how often the upstream observation changes.
+    Args:
+        previous_dt (int, optional): The stored observation timestamp.
+        new_dt (int, optional): The incoming observation timestamp.
+        interval (int, optional): The stored update interval in seconds.
+    Returns:
+        int | None: The exponentially smoothed update interval in seconds.
+    """
+
+    if previous_dt is None or new_dt is None or new_dt <= previous_dt:
+        return interval
+
+    observed = new_dt - previous_dt
+    if observed > WEATHER_CACHE_MAX_TTL:
+        return interval
+    if interval is None:
+        return observed
+    return round(
+        WEATHER_UPDATE_INTERVAL_SMOOTHING * observed
+        + (1 - WEATHER_UPDATE_INTERVAL_SMOOTHING) * interval
+    )
+
+
+def observation_ttl(
+    dt: Optional[int], interval: Optional[int] = None, now: Optional[float] = None
+) -> int:
+    """
+    Computes how long a weather response can be cached, based on when the next upstream
+    observation is expected to be available.
+    Args:
+        dt (int, optional): The timestamp of the stored observation.
+        interval (int, optional): The observed update interval of the city in seconds.
+        now (float, optional): The current timestamp. Defaults to the current time.
+    Returns:
+        int: The cache timeout in seconds, between WEATHER_CACHE_MIN_TTL and WEATHER_CACHE_MAX_TTL.
+    """
+
+    if dt is None:
+        return WEATHER_CACHE_MIN_TTL
+
+    now = time.time() if now is None else now
+    interval = interval or WEATHER_DEFAULT_UPDATE_INTERVAL
+    remaining = int(dt + interval - now)
+    return max(WEATHER_CACHE_MIN_TTL, min(remaining, WEATHER_CACHE_MAX_TTL))
+
+
+def snap_to_grid(value: float, resolution: float) -> float:
+    """
+    Snaps a latitude or longitude to the nearest point of a regular grid.
+    Args:
+        value (float): The coordinate in degrees.
+        resolution (float): The grid spacing in degrees.
+    Returns:
+        float: The coordinate of the nearest grid point, rounded to remove float noise.
+    """
+
+    return round(round(value / resolution) * resolution, 6)
+
+
+def round_coordinates(
+    lat: Optional[str], lon: Optional[str], precision: int
+) -> Tuple[float, float]:
+    """
+    Parses latitude and longitude query parameters and rounds them to a fixed precision.
+    Args:
+        lat (str, optional): The latitude, between -90 and 90.
+        lon (str, optional): The longitude, between -180 and 180.
+        precision (int): The number of decimals to keep.
+    Returns:
+        Tuple[float, float]: The rounded latitude and longitude.
+    Raises:
+        ValueError: If a coordinate is missing, not a number or out of range.
+    """
+
+    try:
+        lat_value = float(lat)
+        lon_value = float(lon)
+    except (TypeError, ValueError):
+        raise ValueError("lat and lon parameters must both be numbers")
+    if not -90 <= lat_value <= 90 or not -180 <= lon_value <= 180:
+        raise ValueError("lat must be between -90 and 90 and lon between -180 and 180")
+    return round(lat_value, precision), round(lon_value, precision)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+
+from app.constants import WEATHER_RENDER_HISTORY_SIZE, WEATHER_RENDER_HISTORY_TTL
+
+# Response fields that change on every render, left out of ETags and always sent in deltas.
+VOLATILE_RESPONSE_FIELDS = ("requested_time",)
+
+
+def render_etag(data: Dict[str, Any]) -> str:
+    """
+    Computes the ETag of a rendered weather response.
+    Args:
+        data (Dict[str, Any]): The rendered response data.
+    Returns:
+        str: A digest of the data, ignoring the fields that change on every render.
+    """
+
+    stable = {
+        key: value for key, value in data.items() if key not in VOLATILE_RESPONSE_FIELDS
+    }
+    encoded = json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+
+def render_history_key(city_id: int, render_context: Dict[str, Any]) -> str:
+    """
+    Returns the cache key of the render history of a city, for one response variant.
+    Args:
+        city_id (int): The upstream city id.
+        render_context (Dict[str, Any]): The `unit`, `include`, `fields` and `format` of the response.
+    Returns:
+        str: The cache key.
+    """
+
+    fields = render_context.get("fields")
+    return ":".join(
+        (
+            "weather:renders",
+            str(city_id),
+            str(render_context.get("unit")),
+            str(render_context.get("include")),
+            str(render_context.get("format")),
+            ",".join(fields) if fields else "*",
+        )
+    )
+
+
+def record_render(
+    city_id: int, render_context: Dict[str, Any], dt: int, data: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Appends a rendered response to the render history of a city, unless it matches the last one.
+    The history keeps the last WEATHER_RENDER_HISTORY_SIZE distinct renders of each response variant.
+    Args:
+        city_id (int): The upstream city id.
+        render_context (Dict[str, Any]): The `unit`, `include` and `fields` of the response.
+        dt (int): The observation timestamp of the rendered data.
+        data (Dict[str, Any]): The rendered response data.
+    Returns:
+        List[Dict[str, Any]]: The history, oldest first, with the `dt`, `etag` and `data` of each
+            render. The last entry is the given render.
+    """
+
+    key = render_history_key(city_id, render_context)
+    history = cache.get(key) or []
+    etag = render_etag(data)
+    if history and history[-1]["etag"] == etag:
+        return history
+    history.append({"dt": dt, "etag": etag, "data": dict(data)})
+    history = history[-WEATHER_RENDER_HISTORY_SIZE:]
+    cache.set(key, history, WEATHER_RENDER_HISTORY_TTL)
+    return history
+
+
+def find_render(history: List[Dict[str, Any]], since: str) -> Optional[Dict[str, Any]]:
+    """
+    Finds the render a client holds in a render history.
+    Args:
+        history (List[Dict[str, Any]]): The render history of the city.
+        since (str): The ETag of the render, quoted or not, or its observation timestamp.
+    Returns:
+        Dict[str, Any] | None: The latest matching render, or None if it is not in the history.
+    """
+
+    since = since.strip()
+    if since.startswith("W/"):
+        since = since[2:]
+    since = since.strip('"')
+    for render in reversed(history):
+        if render["etag"] == since or str(render["dt"]) == since:
+            return render
+    return None
+
+
+def diff_render(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes the response fields that changed between two renders of a city.
+    Args:
+        previous (Dict[str, Any]): The render the client holds.
+        current (Dict[str, Any]): The current render.
+    Returns:
+        Dict[str, Any]: The changed fields with their current value, and the volatile fields.
+            A changed forecast is sent as its `size` and the changed `days` by position.
+    """
+
+    delta = {}
+    for key, value in current.items():
+        if key in VOLATILE_RESPONSE_FIELDS:
+            delta[key] = value
+        elif key == "forecast" and isinstance(previous.get(key), list):
+            old_days = previous[key]
+            days = {
+                str(index): day
+                for index, day in enumerate(value)
+                if index >= len(old_days) or old_days[index] != day
+            }
+            if days or len(value) != len(old_days):
+                delta[key] = {"size": len(value), "days": days}
+        elif previous.get(key) != value:
+            delta[key] = value
+    return delta
@@ -0,0 +1,130 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from app.models import Weather
+from app.utils.persistence import weather_reads
+
+# Internal bookkeeping fields that are not exported unless requested.
+EXPORT_EXCLUDED_FIELDS = ("forecast_hash", "rollup")
+
+
+def export_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parses a comma-separated list of Weather document fields to export.
+    Args:
+        value (str, optional): The requested fields. Defaults to every stored field.
+    Returns:
+        Tuple[str, ...]: The document fields to project.
+    Raises:
+        ValueError: If a field is not a Weather document field.
+    """
+
+    if not value:
+        return tuple(
+            field
+            for field in Weather._fields
+            if field != "id" and field not in EXPORT_EXCLUDED_FIELDS
+        )
+    fields = tuple(field.strip() for field in value.split(",") if field.strip())
+    unknown = [field for field in fields if field.split(".")[0] not in Weather._fields]
+    if unknown:
+        raise ValueError(f"Unknown weather fields: {', '.join(unknown)}")
+    return fields
+
+
+def iter_weather_batches(
+    fields: Iterable[str], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Iterates every stored Weather document as raw dictionaries, one batch at a time.
+    The server-side cursor runs on the read connection, fetches `batch_size` documents per round
+    trip and does not cache results, so memory use does not grow with the collection.
+    Args:
+        fields (Iterable[str]): The document fields to project.
+        batch_size (int): The number of documents per batch.
+    Yields:
+        List[Dict[str, Any]]: The projected documents, with `_id` renamed to `id`.
+    """
+
+    queryset = (
+        weather_reads()
+        .only(*fields)
+        .order_by("_id")
+        .as_pymongo()
+        .no_cache()
+        .batch_size(batch_size)
+    )
+    batch = []
+    for document in queryset:
+        document["id"] = document.pop("_id")
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunks(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """
+    Encodes batches of documents as NDJSON, yielding one chunk per batch.
+    Args:
+        batches (Iterable[List[Dict[str, Any]]]): The documents to encode.
+    Yields:
+        bytes: One JSON object per line.
+    """
+
+    for batch in batches:
+        yield "".join(
+            json.dumps(document, separators=(",", ":"), default=_json_default) + "\n"
+            for document in batch
+        ).encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compresses a stream of chunks into a single gzip stream without buffering it.
+    Args:
+        chunks (Iterable[bytes]): The uncompressed chunks.
+        level (int, optional): The compression level. Defaults to 6.
+    Yields:
+        bytes: The compressed chunks.
+    """
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def async_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Serves a synchronous stream of chunks to an ASGI server, one chunk at a time.
+    Django reads synchronous streaming content with `sync_to_async(list)` under ASGI, which
+    would load the whole export in memory before sending it. Each chunk is instead produced in
+    the sync thread, so the cursor is read one batch at a time while the client downloads.
+    Args:
+        chunks (Iterable[bytes]): The chunks to send.
+    Yields:
+        bytes: The same chunks.
+    """
+
+    iterator = iter(chunks)
+    next_chunk = sync_to_async(next)
+    while True:
+        chunk = await next_chunk(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
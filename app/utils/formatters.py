@@ -1,6 +1,40 @@
 from app.models.enums import TemperatureUnit
 
 
+def convert_temperature(kelvin: float, unit: str) -> float:
+    """
+    Converts a temperature from Kelvin to the given unit.
+    Args:
+        kelvin (float): Temperature in Kelvin.
+        unit (str): The TemperatureUnit value to convert to.
+    Returns:
+        float: The temperature in the given unit, rounded to one decimal.
+    """
+
+    if unit == TemperatureUnit.CELSIUS.value:
+        return round(kelvin - 273.15, 1)
+    elif unit == TemperatureUnit.FAHRENHEIT.value:
+        return round((kelvin - 273.15) * 9 / 5 + 32, 1)
+    return round(kelvin, 1)
+
+
+def to_kelvin(temperature: float, unit: str) -> float:
+    """
+    Converts a temperature in the given unit to Kelvin.
+    Args:
+        temperature (float): The temperature.
+        unit (str): The TemperatureUnit value of the temperature.
+    Returns:
+        float: The temperature in Kelvin.
+    """
+
+    if unit == TemperatureUnit.CELSIUS.value:
+        return temperature + 273.15
+    elif unit == TemperatureUnit.FAHRENHEIT.value:
+        return (temperature - 32) * 5 / 9 + 273.15
+    return temperature
+
+
 def parse_temperature(kelvin: float, unit: str) -> str:
     """
     Convert a temperature from Kelvin to Celsius.
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Deque, Dict, Optional
+
+import requests
+
+from app.constants import (
+    UPSTREAM_HEDGE_INITIAL_DELAY,
+    UPSTREAM_HEDGE_MAX_RATIO,
+    UPSTREAM_HEDGE_MAX_WORKERS,
+    UPSTREAM_HEDGE_MIN_DELAY,
+    UPSTREAM_HEDGE_MIN_SAMPLES,
+    UPSTREAM_HEDGE_PERCENTILE,
+    UPSTREAM_HEDGE_WINDOW,
+    UPSTREAM_HEDGING,
+)
+from app.utils.metrics import increment, register_metric
+
+HEDGES_METRIC = register_metric("upstream.hedges")
+HEDGE_WINS_METRIC = register_metric("upstream.hedge.wins")
+
+# Unused hedge budget is capped, so a long quiet period cannot be followed by a burst of hedges.
+HEDGE_BUDGET_CAP = 10
+
+
+class HedgedRequests:
+    """
+    Sends upstream GET requests with hedging: when a request has not answered within the
+    rolling `percentile` latency of its endpoint, an identical request is sent and the first
+    successful response wins. The slower request is left to finish in the background.
+
+    Every request adds `max_ratio` to a hedge budget and every hedge spends 1 from it, so
+    hedges stay below that fraction of the traffic even when upstream is slow across the board.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = UPSTREAM_HEDGING,
+        percentile: float = UPSTREAM_HEDGE_PERCENTILE,
+        window: int = UPSTREAM_HEDGE_WINDOW,
+        min_samples: int = UPSTREAM_HEDGE_MIN_SAMPLES,
+        initial_delay: float = UPSTREAM_HEDGE_INITIAL_DELAY,
+        min_delay: float = UPSTREAM_HEDGE_MIN_DELAY,
+        max_ratio: float = UPSTREAM_HEDGE_MAX_RATIO,
+        max_workers: int = UPSTREAM_HEDGE_MAX_WORKERS,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.max_workers = max_workers
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = 0.0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def delay(self, endpoint: str) -> float:
+        """
+        Returns how long a request to an endpoint may run before it is hedged.
+        Args:
+            endpoint (str): The upstream endpoint name.
+        Returns:
+            float: The rolling latency percentile of the endpoint in seconds, at least
+                `min_delay`, or `initial_delay` until `min_samples` latencies were recorded.
+        """
+
+        with self._lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return max(self.initial_delay, self.min_delay)
+        index = min(int(len(samples) * self.percentile), len(samples) - 1)
+        return max(samples[index], self.min_delay)
+
+    def record(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def get(self, endpoint: str, url: str) -> requests.Response:
+        """
+        Sends a GET request, hedging it when it is slower than usual for its endpoint.
+        Args:
+            endpoint (str): The upstream endpoint name, which keys the latency window.
+            url (str): The URL to request.
+        Returns:
+            requests.Response: The first successful response.
+        Raises:
+            requests.RequestException: If every request sent failed.
+        """
+
+        if not self.enabled:
+            return requests.get(url)
+
+        with self._lock:
+            self._budget = min(self._budget + self.max_ratio, HEDGE_BUDGET_CAP)
+        executor = self._get_executor()
+        primary = executor.submit(self._timed_get, endpoint, url)
+        try:
+            return primary.result(timeout=self.delay(endpoint))
+        except FutureTimeoutError:
+            pass
+        if not self._spend_budget():
+            return primary.result()
+
+        increment(HEDGES_METRIC)
+        hedge = executor.submit(self._timed_get, endpoint, url)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        increment(HEDGE_WINS_METRIC)
+                    return future.result()
+            if not pending:
+                return done.pop().result()
+
+    def _timed_get(self, endpoint: str, url: str) -> requests.Response:
+        started = time.perf_counter()
+        try:
+            return requests.get(url)
+        finally:
+            self.record(endpoint, time.perf_counter() - started)
+
+    def _spend_budget(self) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use, so processes with hedging disabled start no threads.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="weather-hedge"
+                )
+            return self._executor
+
+
+hedged_requests = HedgedRequests()
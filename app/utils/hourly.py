@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+
+# Numeric One Call hourly attributes stored as one column each.
+HOURLY_COLUMNS = ("temp", "pressure", "humidity", "wind_speed", "wind_deg", "pop")
+
+
+def compact_hourly(hourly: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Converts the One Call hourly forecast into a compact columnar document.
+    Hours are evenly spaced, so only the first timestamp and the step are stored, and the
+    repeated weather descriptions are stored once and referenced by index.
+    Args:
+        hourly (List[Dict[str, Any]]): The `hourly` list of a One Call response.
+    Returns:
+        Dict[str, Any] | None: The `start`, `step` and `size` of the series, one list per
+            HOURLY_COLUMNS entry, the `descriptions` and the `weather` description indexes,
+            or None if there are no hours.
+    """
+
+    if not hourly:
+        return None
+
+    descriptions = {}
+    compact = {
+        "start": hourly[0]["dt"],
+        "step": hourly[1]["dt"] - hourly[0]["dt"] if len(hourly) > 1 else 3600,
+        "size": len(hourly),
+    }
+    for column in HOURLY_COLUMNS:
+        compact[column] = [hour.get(column, 0) for hour in hourly]
+    compact["weather"] = [
+        descriptions.setdefault(hour["weather"][0]["description"], len(descriptions))
+        for hour in hourly
+    ]
+    compact["descriptions"] = list(descriptions)
+    return compact
+
+
+def hourly_index(hourly: Dict[str, Any], cursor: Optional[int]) -> int:
+    """
+    Returns the position of the first hour at or after a cursor.
+    Cursors are timestamps rather than positions, so they stay valid when the series is refreshed.
+    Args:
+        hourly (Dict[str, Any]): The compact hourly forecast.
+        cursor (int, optional): The timestamp of the first hour to return. Defaults to the first hour.
+    Returns:
+        int: The position in the series, between 0 and its size.
+    """
+
+    if cursor is None or cursor <= hourly["start"]:
+        return 0
+    index = -(-(cursor - hourly["start"]) // hourly["step"])
+    return min(index, hourly["size"])
@@ -0,0 +1,48 @@
+from typing import Dict, Set
+
+from django.core.cache import cache
+
+METRICS_KEY_PREFIX = "metrics:"
+
+_registered_metrics: Set[str] = set()
+
+
+def register_metric(name: str) -> str:
+    """
+    Registers a counter so that it is reported by `get_metrics`.
+    Args:
+        name (str): The name of the counter.
+    Returns:
+        str: The name of the counter, so it can be assigned to a module constant.
+    """
+
+    _registered_metrics.add(name)
+    return name
+
+
+def increment(name: str, delta: int = 1) -> None:
+    """
+    Increments a counter shared by every worker through the default cache.
+    Args:
+        name (str): The name of the counter.
+        delta (int, optional): The amount to add. Defaults to 1.
+    """
+
+    key = METRICS_KEY_PREFIX + name
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def get_metrics() -> Dict[str, int]:
+    """
+    Returns the current value of every registered counter.
+    Returns:
+        Dict[str, int]: The counter values, by name.
+    """
+
+    names = sorted(_registered_metrics)
+    values = cache.get_many([METRICS_KEY_PREFIX + name for name in names])
+    return {name: values.get(METRICS_KEY_PREFIX + name, 0) for name in names}
@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Sort keys of keyset-paginated listings and whether their values are datetimes.
+KEYSET_SORT_FIELDS = {"name": False, "updated_at": True}
+
+
+def encode_cursor(value: Any, document_id: int) -> str:
+    """
+    Encodes the sort key of the last document of a page as an opaque cursor.
+    Args:
+        value (Any): The sort field value of the document.
+        document_id (int): The id of the document, which breaks ties between equal values.
+    Returns:
+        str: The URL-safe base64 encoding of the key.
+    """
+
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([value, document_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_field: str) -> Tuple[Any, int]:
+    """
+    Decodes a cursor returned by `encode_cursor`.
+    Args:
+        cursor (str): The cursor.
+        sort_field (str): The sort field the cursor was created for.
+    Returns:
+        Tuple[Any, int]: The sort field value and the id of the last document of the previous page.
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+
+    try:
+        value, document_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # Documents without the sort field are encoded with a null value.
+        if KEYSET_SORT_FIELDS[sort_field] and value is not None:
+            value = datetime.fromisoformat(value)
+        return value, int(document_id)
+    except (TypeError, ValueError, KeyError):
+        raise ValueError("cursor is not valid for this sort order")
+
+
+def parse_sort(value: Optional[str]) -> Tuple[str, int]:
+    """
+    Parses a sort parameter such as `name` or `-updated_at`.
+    Args:
+        value (str, optional): The sort parameter. Defaults to `name`.
+    Returns:
+        Tuple[str, int]: The sort field and direction, 1 for ascending or -1 for descending.
+    Raises:
+        ValueError: If the field is not a keyset sort field.
+    """
+
+    value = value or "name"
+    direction = -1 if value.startswith("-") else 1
+    field = value.lstrip("-")
+    if field not in KEYSET_SORT_FIELDS:
+        raise ValueError(f"sort must be one of {', '.join(KEYSET_SORT_FIELDS)}")
+    return field, direction
+
+
+def keyset_filter(
+    sort_field: str, direction: int, cursor: Optional[Tuple[Any, int]]
+) -> Dict[str, Any]:
+    """
+    Builds the filter that selects the documents after a cursor in `(sort_field, _id)` order.
+    Unlike skipping, the filter lets an index on `(sort_field, _id)` seek directly to the page,
+    so the cost of a page does not depend on how deep it is. Documents without the sort field
+    sort before every value, as MongoDB orders missing and null values lowest.
+    Args:
+        sort_field (str): The sort field.
+        direction (int): 1 for ascending or -1 for descending.
+        cursor (Tuple[Any, int], optional): The decoded cursor, or None for the first page.
+    Returns:
+        Dict[str, Any]: The raw MongoDB filter.
+    """
+
+    if cursor is None:
+        return {}
+    value, document_id = cursor
+    operator = "$gt" if direction == 1 else "$lt"
+    ties = {sort_field: value, "_id": {operator: document_id}}
+    if value is None:
+        if direction == -1:
+            return ties
+        return {"$or": [{sort_field: {"$ne": None}}, ties]}
+    after = [{sort_field: {operator: value}}, ties]
+    if direction == -1:
+        # Comparison operators never match null, so the documents without a value follow.
+        after.append({sort_field: None})
+    return {"$or": after}
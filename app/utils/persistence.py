@@ -0,0 +1,201 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytz
+from django.conf import settings
+from mongoengine.queryset import QuerySet
+from pymongo import UpdateOne
+
+from app.models import Weather
+
+# Fields read when rendering a WeatherResponseSerializer response and computing its cache expiry.
+WEATHER_RESPONSE_FIELDS = (
+    "name",
+    "sys",
+    "main",
+    "wind",
+    "weather",
+    "timezone",
+    "coord",
+    "forecast",
+    "dt",
+    "dt_interval",
+)
+
+# Fields needed to decide whether an incoming upstream observation has to be written.
+WEATHER_STATE_FIELDS = ("dt", "dt_interval", "forecast_hash")
+
+
+def forecast_hash(
+    forecast: Optional[List[Dict[str, Any]]], hourly: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Computes a stable hash of a daily forecast list and its hourly forecast.
+    Args:
+        forecast (List[Dict[str, Any]], optional): The forecast days as stored in the Weather document.
+        hourly (Dict[str, Any], optional): The compact hourly forecast stored with it, if any.
+    Returns:
+        str: The hexadecimal SHA-1 digest of the canonical JSON encoding of the forecast.
+    """
+
+    forecast = forecast or []
+    # Without hourly data the digest matches the daily forecast alone.
+    payload = json.dumps(
+        {"daily": forecast, "hourly": hourly} if hourly else forecast,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def is_unchanged(
+    stored_dt: Optional[int],
+    stored_forecast_hash: Optional[str],
+    dt: int,
+    digest: Optional[str],
+) -> bool:
+    """
+    Checks whether an incoming upstream observation matches the stored one.
+    Args:
+        stored_dt (int, optional): The observation timestamp of the stored document.
+        stored_forecast_hash (str, optional): The forecast hash of the stored document.
+        dt (int): The incoming observation timestamp.
+        digest (str, optional): The hash of the incoming forecast, or None if no forecast was fetched.
+    Returns:
+        bool: True if both the observation time and the forecast are unchanged.
+    """
+
+    if stored_dt != dt:
+        return False
+    return digest is None or stored_forecast_hash == digest
+
+
+def weather_upsert_document(
+    validated_data: Dict[str, Any], **fields: Any
+) -> Dict[str, Any]:
+    """
+    Builds the update document that stores a validated upstream payload as a Weather document.
+    Payloads without a forecast leave the stored forecast untouched.
+    Args:
+        validated_data (Dict[str, Any]): The validated data of a WeatherSerializer.
+        **fields (Any): Additional fields to set, such as `dt_interval`.
+    Returns:
+        Dict[str, Any]: The `$set`/`$setOnInsert` update document.
+    """
+
+    now = datetime.now(tz=pytz.utc)
+    values = {key: value for key, value in validated_data.items() if key != "id"}
+    if "forecast" in validated_data:
+        values["forecast_hash"] = forecast_hash(
+            validated_data["forecast"], validated_data.get("hourly")
+        )
+    values["updated_at"] = now
+    values.update(fields)
+    return {"$set": values, "$setOnInsert": {"created_at": now}}
+
+
+def weather_upsert_operation(
+    validated_data: Dict[str, Any], **fields: Any
+) -> UpdateOne:
+    """
+    Builds the bulk upsert that stores a validated upstream payload as a Weather document.
+    Args:
+        validated_data (Dict[str, Any]): The validated data of a WeatherSerializer.
+        **fields (Any): Additional fields to set, such as `dt_interval`.
+    Returns:
+        UpdateOne: The upsert operation, keyed by the upstream city id.
+    """
+
+    return UpdateOne(
+        {"_id": validated_data["id"]},
+        weather_upsert_document(validated_data, **fields),
+        upsert=True,
+    )
+
+
+def weather_reads(alias: Optional[str] = None) -> QuerySet:
+    """
+    Returns a Weather queryset on the read connection, which prefers secondaries.
+    Only read paths that tolerate replication lag should use it.
+    Args:
+        alias (str, optional): The connection alias. Defaults to the MONGO_READ_ALIAS setting.
+    Returns:
+        QuerySet: The Weather queryset.
+    """
+
+    return Weather.objects.using(alias or settings.MONGO_READ_ALIAS)
+
+
+def get_weather_document(
+    city_id: int,
+    fields: Iterable[str] = WEATHER_RESPONSE_FIELDS,
+    alias: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads a stored Weather document as a raw dictionary, without hydrating a mongoengine Document.
+    Args:
+        city_id (int): The upstream city id.
+        fields (Iterable[str], optional): The fields to project. Defaults to the fields rendered in responses.
+        alias (str, optional): The connection alias. Defaults to the read connection.
+    Returns:
+        Dict[str, Any] | None: The projected document with `_id` renamed to `id`, or None if it is not stored.
+    """
+
+    document = weather_reads(alias)(id=city_id).only(*fields).as_pymongo().first()
+    if document is not None:
+        document["id"] = document.pop("_id")
+    return document
+
+
+def get_weather_documents(
+    city_ids: Iterable[int],
+    fields: Iterable[str] = WEATHER_RESPONSE_FIELDS,
+    alias: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Reads several stored Weather documents as raw dictionaries.
+    Args:
+        city_ids (Iterable[int]): The upstream city ids.
+        fields (Iterable[str], optional): The fields to project. Defaults to the fields rendered in responses.
+        alias (str, optional): The connection alias. Defaults to the read connection.
+    Returns:
+        List[Dict[str, Any]]: The projected documents with `_id` renamed to `id`.
+    """
+
+    documents = list(
+        weather_reads(alias)(id__in=list(city_ids)).only(*fields).as_pymongo()
+    )
+    for document in documents:
+        document["id"] = document.pop("_id")
+    return documents
+
+
+def find_weather_document(
+    city: str,
+    country: str,
+    fields: Iterable[str] = WEATHER_RESPONSE_FIELDS,
+    alias: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads the stored Weather document of a city by its name, as a raw dictionary.
+    Args:
+        city (str): The city name, matched case-insensitively.
+        country (str): The 2-character country code.
+        fields (Iterable[str], optional): The fields to project. Defaults to the fields rendered in responses.
+        alias (str, optional): The connection alias. Defaults to the read connection.
+    Returns:
+        Dict[str, Any] | None: The projected document with `_id` renamed to `id`, or None if it is not stored.
+    """
+
+    document = (
+        weather_reads(alias)(sys__country=country.upper(), name__iexact=city)
+        .only(*fields)
+        .as_pymongo()
+        .first()
+    )
+    if document is not None:
+        document["id"] = document.pop("_id")
+    return document
@@ -0,0 +1,141 @@
+import cProfile
+import io
+import json
+import marshal
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+
+from app.constants import (
+    PROFILING_DIR,
+    PROFILING_STORAGE,
+    PROFILING_TOP_N,
+    PROFILING_TRACEMALLOC_FRAMES,
+    PROFILING_TTL,
+)
+
+PROFILE_KEY_PREFIX = "profile:"
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+# Whether the profiler started tracing, rather than finding it enabled (e.g. PYTHONTRACEMALLOC).
+_tracemalloc_owned = False
+
+
+class RequestProfiler:
+    """
+    Captures the cProfile call tree and the tracemalloc allocation top-N of one request.
+
+    cProfile only sees the thread that started it. tracemalloc is process-wide, so it stays
+    enabled while any profiled request is running, and allocations of concurrent requests
+    can show up in the top-N.
+    """
+
+    def __init__(self, top_n: int = PROFILING_TOP_N):
+        self.top_n = top_n
+        self._profiler = cProfile.Profile()
+        self._snapshot_before: Optional[tracemalloc.Snapshot] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        global _tracemalloc_users, _tracemalloc_owned
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+                _tracemalloc_owned = True
+            _tracemalloc_users += 1
+        self._snapshot_before = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stops profiling and summarizes the captured data.
+        Returns:
+            Dict[str, Any]: The `duration` in seconds, the marshalled pstats `stats`, the text
+                `summary` of the top functions by cumulative time and the top `allocations`.
+        """
+
+        global _tracemalloc_users, _tracemalloc_owned
+        self._profiler.disable()
+        duration = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0 and _tracemalloc_owned:
+                tracemalloc.stop()
+                _tracemalloc_owned = False
+
+        # pstats.Stats takes the stats away from the profiler, so dump them first.
+        self._profiler.create_stats()
+        stats = marshal.dumps(self._profiler.stats)
+        summary = io.StringIO()
+        pstats.Stats(self._profiler, stream=summary).sort_stats(
+            pstats.SortKey.CUMULATIVE
+        ).print_stats(self.top_n)
+
+        allocations = [
+            {
+                # Frames go from the oldest call to the allocating line.
+                "location": str(stat.traceback[-1]),
+                "traceback": [str(frame) for frame in stat.traceback],
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(self._snapshot_before, "traceback")[
+                : self.top_n
+            ]
+        ]
+        return {
+            "duration": duration,
+            "peak_traced_memory": peak,
+            "stats": stats,
+            "summary": summary.getvalue(),
+            "allocations": allocations,
+        }
+
+
+def store_profile(profile_id: str, profile: Dict[str, Any]) -> None:
+    """
+    Stores a captured profile, in the cache or as files depending on PROFILING_STORAGE.
+    With file storage, `<id>.prof` can be opened with pstats or snakeviz and `<id>.json`
+    holds the request details, the summary and the allocations.
+    Args:
+        profile_id (str): The request id the profile is stored under.
+        profile (Dict[str, Any]): The profile returned by `RequestProfiler.stop`, with request details.
+    """
+
+    if PROFILING_STORAGE == "files":
+        directory = Path(PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{profile_id}.prof").write_bytes(profile["stats"])
+        details = {key: value for key, value in profile.items() if key != "stats"}
+        (directory / f"{profile_id}.json").write_text(json.dumps(details, indent=2))
+        return
+    cache.set(PROFILE_KEY_PREFIX + profile_id, profile, PROFILING_TTL)
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Loads a profile stored by `store_profile`.
+    Args:
+        profile_id (str): The request id of the profile.
+    Returns:
+        Dict[str, Any] | None: The profile, or None if it is not stored or has expired.
+    """
+
+    if PROFILING_STORAGE == "files":
+        directory = Path(PROFILING_DIR)
+        details_path = directory / f"{profile_id}.json"
+        if not details_path.exists():
+            return None
+        profile = json.loads(details_path.read_text())
+        profile["stats"] = (directory / f"{profile_id}.prof").read_bytes()
+        return profile
+    return cache.get(PROFILE_KEY_PREFIX + profile_id)
@@ -0,0 +1,237 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytz
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from app.models import CountryRollup, Weather
+from app.models.enums import BeaufortScale
+
+logger = logging.getLogger(__name__)
+
+BEAUFORT_SCALES = list(BeaufortScale)
+
+# Conditional swaps tried per city before its change is left to `rebuild_country_rollups`.
+ROLLUP_CLAIM_ATTEMPTS = 5
+
+# Weather document fields read to update the rollups.
+ROLLUP_SOURCE_FIELDS = ("sys.country", "main.temp", "wind.speed", "rollup")
+
+
+def rollup_snapshot(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Returns what a stored Weather document contributes to its country rollup.
+    Args:
+        document (Dict[str, Any]): The raw Weather document.
+    Returns:
+        Dict[str, Any] | None: The `country`, `temp` and Beaufort `scale` position of the city,
+            and its `wind` speed, or None if the document lacks one of them.
+    """
+
+    country = (document.get("sys") or {}).get("country")
+    temp = (document.get("main") or {}).get("temp")
+    wind = (document.get("wind") or {}).get("speed")
+    if not country or temp is None or wind is None:
+        return None
+    return {
+        "country": country,
+        "temp": temp,
+        "scale": BEAUFORT_SCALES.index(BeaufortScale.get_scale(wind)),
+        "wind": wind,
+    }
+
+
+def rollup_deltas(
+    previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Computes the rollup changes of a city moving from one snapshot to another.
+    Args:
+        previous (Dict[str, Any], optional): The snapshot already counted, if any.
+        current (Dict[str, Any], optional): The snapshot of the stored document, if any.
+    Returns:
+        Dict[str, Dict[str, Any]]: The `inc` increments and the `max` wind speed of each country.
+    """
+
+    deltas: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {"inc": defaultdict(float), "max": None}
+    )
+    if previous is not None:
+        inc = deltas[previous["country"]]["inc"]
+        inc["cities"] -= 1
+        inc["temp_sum"] -= previous["temp"]
+        inc[f"wind_scales.{previous['scale']}"] -= 1
+    if current is not None:
+        delta = deltas[current["country"]]
+        delta["inc"]["cities"] += 1
+        delta["inc"]["temp_sum"] += current["temp"]
+        delta["inc"][f"wind_scales.{current['scale']}"] += 1
+        delta["max"] = current["wind"]
+    return deltas
+
+
+def rollup_operations(deltas: Iterable[Dict[str, Dict[str, Any]]]) -> List[UpdateOne]:
+    """
+    Merges rollup changes into one upsert per country.
+    Args:
+        deltas (Iterable[Dict[str, Dict[str, Any]]]): The changes returned by `rollup_deltas`.
+    Returns:
+        List[UpdateOne]: The `$inc`/`$max` upserts of the CountryRollup documents.
+    """
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for delta in deltas:
+        for country, change in delta.items():
+            target = merged.setdefault(
+                country, {"inc": defaultdict(float), "max": None}
+            )
+            for field, value in change["inc"].items():
+                target["inc"][field] += value
+            if change["max"] is not None:
+                target["max"] = max(target["max"] or 0.0, change["max"])
+
+    now = datetime.now(tz=pytz.UTC)
+    operations = []
+    for country, change in merged.items():
+        update: Dict[str, Any] = {"$set": {"updated_at": now}}
+        inc = {
+            field: int(value) if field != "temp_sum" else value
+            for field, value in change["inc"].items()
+            if value
+        }
+        if inc:
+            update["$inc"] = inc
+        if change["max"] is not None:
+            update["$max"] = {"wind_peak": change["max"]}
+        operations.append(UpdateOne({"_id": country}, update, upsert=True))
+    return operations
+
+
+def claim_snapshot(
+    collection: Collection, document: Dict[str, Any]
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Swaps the snapshot counted for a Weather document with its current one. The swap is
+    conditional on the counted snapshot, so each transition between two snapshots is claimed by
+    exactly one caller. When another store swapped it first, the document is read again and
+    the swap retried from its new snapshot.
+    Args:
+        collection (Collection): The Weather collection.
+        document (Dict[str, Any]): The raw Weather document, with the ROLLUP_SOURCE_FIELDS.
+    Returns:
+        Dict[str, Dict[str, Any]] | None: The rollup changes of the claimed transition, or None
+            if the document is already counted with its current snapshot.
+    """
+
+    for _ in range(ROLLUP_CLAIM_ATTEMPTS):
+        previous = document.get("rollup") or None
+        current = rollup_snapshot(document)
+        if previous == current:
+            return None
+        claimed = collection.update_one(
+            {"_id": document["_id"], "rollup": document.get("rollup")},
+            {"$set": {"rollup": current or {}}},
+        )
+        if claimed.modified_count:
+            return rollup_deltas(previous, current)
+        document = collection.find_one({"_id": document["_id"]}, ROLLUP_SOURCE_FIELDS)
+        if document is None:
+            return None
+    logger.warning(
+        "Gave up counting city %s in the country rollups after %s attempts",
+        document["_id"],
+        ROLLUP_CLAIM_ATTEMPTS,
+    )
+    return None
+
+
+def update_country_rollups(sender: Any, city_ids: Iterable[int], **kwargs: Any) -> None:
+    """
+    Applies the changes of stored cities to the country rollups. Receiver of the `weather_stored` signal.
+    Each document records the snapshot last counted for it, and its delta is only applied by
+    the caller whose conditional swap of that snapshot matched. A city stored twice
+    concurrently is therefore counted exactly once. The deltas of every city are merged into
+    one bulk write of the rollups.
+    Args:
+        sender (Any): The sender of the signal.
+        city_ids (Iterable[int]): The ids of the stored cities.
+    """
+
+    collection = Weather._get_collection()
+    deltas = []
+    for document in (
+        Weather.objects(id__in=list(city_ids)).only(*ROLLUP_SOURCE_FIELDS).as_pymongo()
+    ):
+        delta = claim_snapshot(collection, document)
+        if delta is not None:
+            deltas.append(delta)
+
+    operations = rollup_operations(deltas)
+    if operations:
+        CountryRollup._get_collection().bulk_write(operations, ordered=False)
+
+
+def rebuild_country_rollups(batch_size: int = 1000) -> int:
+    """
+    Recomputes every country rollup and city snapshot from the stored Weather documents.
+    Args:
+        batch_size (int, optional): The number of documents read per round trip. Defaults to 1000.
+    Returns:
+        int: The number of countries.
+    """
+
+    deltas = []
+    snapshots = []
+    documents = (
+        Weather.objects.only(*ROLLUP_SOURCE_FIELDS)
+        .as_pymongo()
+        .no_cache()
+        .batch_size(batch_size)
+    )
+    for document in documents:
+        current = rollup_snapshot(document)
+        deltas.append(rollup_deltas(None, current))
+        snapshots.append(
+            UpdateOne({"_id": document["_id"]}, {"$set": {"rollup": current or {}}})
+        )
+
+    CountryRollup.objects.delete()
+    operations = rollup_operations(deltas)
+    if operations:
+        CountryRollup._get_collection().bulk_write(operations, ordered=False)
+    for start in range(0, len(snapshots), batch_size):
+        Weather._get_collection().bulk_write(
+            snapshots[start : start + batch_size], ordered=False
+        )
+    return len(operations)
+
+
+def summarize_rollup(rollup: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derives the country statistics of a rollup.
+    Args:
+        rollup (Dict[str, Any]): The raw CountryRollup document.
+    Returns:
+        Dict[str, Any]: The `country`, number of `cities`, mean temperature in Kelvin, strongest
+            current Beaufort scale, highest wind speed seen and update time.
+    """
+
+    cities = rollup.get("cities", 0)
+    scales = [
+        int(position)
+        for position, count in (rollup.get("wind_scales") or {}).items()
+        if count > 0
+    ]
+    return {
+        "country": rollup["_id"],
+        "cities": cities,
+        "temp_mean": rollup.get("temp_sum", 0.0) / cities if cities else None,
+        "wind_max_beaufort": BEAUFORT_SCALES[max(scales)].description
+        if scales
+        else None,
+        "wind_peak": rollup.get("wind_peak"),
+        "updated_at": rollup.get("updated_at"),
+    }
@@ -0,0 +1,77 @@
+import gzip
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from rest_framework.exceptions import ValidationError
+
+from app.models import Weather
+from app.serializers.weather_serializer import WeatherSerializer
+from app.signals import notify_weather_stored
+from app.utils.persistence import weather_upsert_operation
+
+
+def iter_jsonl_chunks(
+    paths: Iterable[str], chunk_size: int
+) -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Reads JSONL files line by line and groups the parsed lines into chunks.
+    Files ending in `.gz` are decompressed on the fly.
+    Args:
+        paths (Iterable[str]): The JSONL files to read.
+        chunk_size (int): The maximum number of lines per chunk.
+    Yields:
+        List[Tuple[str, Any]]: The `path:line` location and parsed payload of each line. Lines that
+            are not valid JSON are yielded with a JSONDecodeError as payload.
+    """
+
+    chunk = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError as e:
+                    payload = e
+                chunk.append((f"{path}:{line_number}", payload))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed_weather_chunk(
+    chunk: List[Tuple[str, Any]],
+) -> Tuple[int, List[Tuple[str, Any]]]:
+    """
+    Validates a chunk of upstream payloads and upserts the valid ones with one unordered bulk write.
+    A single WeatherSerializer validates every payload of the chunk, so its fields are only built once.
+    Args:
+        chunk (List[Tuple[str, Any]]): The location and payload of each line, as yielded by `iter_jsonl_chunks`.
+    Returns:
+        Tuple[int, List[Tuple[str, Any]]]: The number of cities written and the location and errors of
+            every invalid line.
+    """
+
+    serializer = WeatherSerializer()
+    operations: Dict[int, Any] = {}
+    invalid = []
+    for location, payload in chunk:
+        if isinstance(payload, json.JSONDecodeError):
+            invalid.append((location, str(payload)))
+            continue
+        try:
+            validated_data = serializer.run_validation(payload)
+        except ValidationError as e:
+            invalid.append((location, e.detail))
+            continue
+        # Later lines of the same city win, as they would with sequential writes.
+        operations[validated_data["id"]] = weather_upsert_operation(validated_data)
+
+    if operations:
+        Weather._get_collection().bulk_write(list(operations.values()), ordered=False)
+        notify_weather_stored(Weather, operations)
+    return len(operations), invalid
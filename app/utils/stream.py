@@ -0,0 +1,230 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import redis
+import redis.asyncio
+from mongoengine import DEFAULT_CONNECTION_NAME
+from rest_framework.renderers import JSONRenderer
+
+from app.constants import WEATHER_STREAM_QUEUE_SIZE, WEATHER_STREAM_REDIS_URL
+from app.serializers.weather_serializer import WeatherResponseSerializer
+from app.utils.metrics import increment, register_metric
+from app.utils.persistence import get_weather_documents
+
+logger = logging.getLogger(__name__)
+
+STREAM_PUBLISHED_METRIC = register_metric("stream.published")
+
+CHANNEL_PREFIX = "weather:updates:"
+
+# Sent to every subscriber of a city when the hub loses Redis, so clients reconnect.
+STREAM_CLOSED = None
+
+_publisher: Optional[redis.Redis] = None
+
+
+def city_channel(city_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{city_id}"
+
+
+def format_event(city_id: int, dt: Any, payload: bytes) -> bytes:
+    """
+    Builds a server-sent event carrying the rendered weather of a city.
+    Args:
+        city_id (int): The upstream city id.
+        dt (Any): The observation timestamp, used with the city id as the event id.
+        payload (bytes): The rendered JSON payload, on a single line.
+    Returns:
+        bytes: The `weather` event, ready to be written to every subscriber.
+    """
+
+    return b"event: weather\nid: %d:%s\ndata: %s\n\n" % (
+        city_id,
+        str(dt).encode(),
+        payload,
+    )
+
+
+def render_city_events(
+    city_ids: Iterable[int], alias: Optional[str] = None
+) -> Dict[int, bytes]:
+    """
+    Renders the stored weather of cities as server-sent events.
+    Args:
+        city_ids (Iterable[int]): The upstream city ids.
+        alias (str, optional): The connection alias. Defaults to the read connection.
+    Returns:
+        Dict[int, bytes]: The event of each stored city, in Celsius with every response field.
+    """
+
+    renderer = JSONRenderer()
+    return {
+        weather_dict["id"]: format_event(
+            weather_dict["id"],
+            weather_dict.get("dt"),
+            renderer.render(
+                {
+                    "id": weather_dict["id"],
+                    **WeatherResponseSerializer(weather_dict).data,
+                }
+            ),
+        )
+        for weather_dict in get_weather_documents(city_ids, alias=alias)
+    }
+
+
+def _get_publisher() -> redis.Redis:
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(WEATHER_STREAM_REDIS_URL)
+    return _publisher
+
+
+def publish_weather_updates(
+    sender: Any, city_ids: Iterable[int], **kwargs: Any
+) -> None:
+    """
+    Publishes the rendered weather of stored cities to their Redis channels. Receiver of the
+    `weather_stored` signal. Only cities with subscribers are read and rendered, once each,
+    whatever the number of connected clients.
+    Args:
+        sender (Any): The sender of the signal.
+        city_ids (Iterable[int]): The ids of the stored cities.
+    """
+
+    city_ids = list(city_ids)
+    client = _get_publisher()
+    subscribed = [
+        city_id
+        for city_id, (_, count) in zip(
+            city_ids, client.pubsub_numsub(*map(city_channel, city_ids))
+        )
+        if count
+    ]
+    if not subscribed:
+        return
+    # Read from the primary, so the event carries the write that triggered it.
+    events = render_city_events(subscribed, DEFAULT_CONNECTION_NAME)
+    pipeline = client.pipeline(transaction=False)
+    for city_id, event in events.items():
+        pipeline.publish(city_channel(city_id), event)
+    pipeline.execute()
+    increment(STREAM_PUBLISHED_METRIC, len(events))
+
+
+class WeatherUpdateHub:
+    """
+    Fans the weather events of one Redis pub/sub connection out to the streams of this process.
+    A city channel is subscribed while at least one stream follows the city. Each stream reads
+    from a bounded queue. A client that falls behind loses its oldest events rather than
+    buffering without limit, since every event holds the full current state of its city.
+
+    The hub belongs to the event loop that first used it, so it needs an ASGI server where one
+    loop serves every request of the process.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = WEATHER_STREAM_REDIS_URL,
+        queue_size: int = WEATHER_STREAM_QUEUE_SIZE,
+    ):
+        self.redis_url = redis_url
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._pubsub: Optional[redis.asyncio.client.PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        # Counted locally, so dispatching never blocks the event loop on the metrics cache.
+        self.dropped = 0
+
+    async def subscribe(self, city_ids: Iterable[int]) -> asyncio.Queue:
+        """
+        Follows cities.
+        Args:
+            city_ids (Iterable[int]): The upstream city ids.
+        Returns:
+            asyncio.Queue: The queue receiving the events of the cities, and STREAM_CLOSED if
+                the hub loses its Redis connection.
+        """
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        channels = []
+        for city_id in city_ids:
+            queues = self._subscribers.setdefault(city_id, set())
+            queues.add(queue)
+            if len(queues) == 1:
+                channels.append(city_channel(city_id))
+        if channels:
+            if self._pubsub is None:
+                self._pubsub = redis.asyncio.Redis.from_url(self.redis_url).pubsub()
+            try:
+                await self._pubsub.subscribe(*channels)
+            except Exception:
+                self._remove(city_ids, queue)
+                raise
+            if self._reader is None:
+                self._reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self, city_ids: Iterable[int], queue: asyncio.Queue) -> None:
+        """
+        Stops following cities.
+        Args:
+            city_ids (Iterable[int]): The city ids passed to `subscribe`.
+            queue (asyncio.Queue): The queue returned by `subscribe`.
+        """
+
+        channels = self._remove(city_ids, queue)
+        if channels and self._pubsub is not None:
+            await self._pubsub.unsubscribe(*channels)
+
+    def _remove(self, city_ids: Iterable[int], queue: asyncio.Queue) -> List[str]:
+        channels = []
+        for city_id in city_ids:
+            queues = self._subscribers.get(city_id)
+            if queues is None:
+                continue
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[city_id]
+                channels.append(city_channel(city_id))
+        return channels
+
+    def dispatch(self, city_id: int, event: Optional[bytes]) -> None:
+        """
+        Queues an event for every stream following a city.
+        Args:
+            city_id (int): The upstream city id.
+            event (bytes, optional): The event, or STREAM_CLOSED.
+        """
+
+        for queue in self._subscribers.get(city_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None or message["type"] != "message":
+                    continue
+                channel = message["channel"].decode()
+                self.dispatch(int(channel[len(CHANNEL_PREFIX) :]), message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Weather update hub lost its Redis connection")
+            pubsub, self._pubsub, self._reader = self._pubsub, None, None
+            for city_id in list(self._subscribers):
+                self.dispatch(city_id, STREAM_CLOSED)
+            self._subscribers.clear()
+            with suppress(Exception):
+                await pubsub.aclose()
+
+
+weather_update_hub = WeatherUpdateHub()
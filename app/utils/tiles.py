@@ -0,0 +1,205 @@
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.core.cache import cache
+
+from app.constants import TILE_CACHE_TTL, TILE_GRID_SIZE, TILE_MAX_ZOOM
+from app.models import Weather
+from app.utils.metrics import increment, register_metric
+
+TILE_HITS_METRIC = register_metric("tiles.hits")
+TILE_MISSES_METRIC = register_metric("tiles.misses")
+
+# The latitude limit of the Web Mercator projection.
+MAX_LATITUDE = 85.0511287798
+
+# Stored fields read when aggregating a tile.
+TILE_FIELDS = ("coord", "main.temp", "wind")
+
+
+def tile_position(lat: float, lon: float, zoom: int) -> Tuple[float, float]:
+    """
+    Projects a location to fractional Web Mercator tile coordinates.
+    Args:
+        lat (float): The latitude of the location.
+        lon (float): The longitude of the location.
+        zoom (int): The zoom level.
+    Returns:
+        Tuple[float, float]: The x and y tile coordinates. The integer parts are the tile.
+    """
+
+    tiles = 2**zoom
+    lat = max(-MAX_LATITUDE, min(lat, MAX_LATITUDE))
+    lat_rad = math.radians(lat)
+    x = (lon + 180) / 360 * tiles
+    y = (1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * tiles
+    return min(x, tiles - 1e-9), min(y, tiles - 1e-9)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Computes the bounding box of a Web Mercator tile.
+    Args:
+        zoom (int): The zoom level.
+        x (int): The tile column.
+        y (int): The tile row.
+    Returns:
+        Tuple[float, float, float, float]: The west, south, east and north bounds in degrees.
+    """
+
+    tiles = 2**zoom
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    west = x / tiles * 360 - 180
+    east = (x + 1) / tiles * 360 - 180
+    return west, latitude(y + 1), east, latitude(y)
+
+
+def tile_cache_key(zoom: int, x: int, y: int) -> str:
+    """
+    Returns the cache key of a rendered tile.
+    Args:
+        zoom (int): The zoom level.
+        x (int): The tile column.
+        y (int): The tile row.
+    Returns:
+        str: The cache key, which includes the grid size so resized grids do not reuse old tiles.
+    """
+
+    return f"tile:{TILE_GRID_SIZE}:{zoom}:{x}:{y}"
+
+
+def aggregate_tile(zoom: int, x: int, y: int) -> Dict[str, Any]:
+    """
+    Aggregates the current weather of the stored cities inside a tile into a grid of cells.
+    Cities are selected with a bounding-box query on `coord`, and each cell of the
+    TILE_GRID_SIZE x TILE_GRID_SIZE grid reports the temperature and wind of its cities.
+    Args:
+        zoom (int): The zoom level.
+        x (int): The tile column.
+        y (int): The tile row.
+    Returns:
+        Dict[str, Any]: The tile bounds, the number of cities and the non-empty cells, with
+            temperatures in Kelvin.
+    """
+
+    west, south, east, north = tile_bounds(zoom, x, y)
+    last = 2**zoom - 1
+    query: Dict[str, Any] = {
+        "coord.lon": {"$gte": west, "$lte" if x == last else "$lt": east}
+    }
+    # The southernmost and northernmost rows also hold the locations beyond the projection limit.
+    lat_range = {}
+    if y < last:
+        lat_range["$gt"] = south
+    if y > 0:
+        lat_range["$lte"] = north
+    if lat_range:
+        query["coord.lat"] = lat_range
+
+    cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    count = 0
+    # Read from the primary: tiles are dropped from the cache right after a write and cached
+    # for TILE_CACHE_TTL, so a lagging secondary would keep the old values for that long.
+    for document in Weather.objects(__raw__=query).only(*TILE_FIELDS).as_pymongo():
+        temp = document.get("main", {}).get("temp")
+        wind = document.get("wind", {})
+        if temp is None or "speed" not in wind:
+            continue
+        position_x, position_y = tile_position(
+            document["coord"]["lat"], document["coord"]["lon"], zoom
+        )
+        key = (
+            min(int((position_y - y) * TILE_GRID_SIZE), TILE_GRID_SIZE - 1),
+            min(int((position_x - x) * TILE_GRID_SIZE), TILE_GRID_SIZE - 1),
+        )
+        cell = cells.setdefault(
+            key,
+            {"count": 0, "temps": [], "speeds": [], "u": 0.0, "v": 0.0},
+        )
+        cell["count"] += 1
+        cell["temps"].append(temp)
+        cell["speeds"].append(wind["speed"])
+        deg = math.radians(wind.get("deg", 0))
+        cell["u"] += wind["speed"] * math.sin(deg)
+        cell["v"] += wind["speed"] * math.cos(deg)
+        count += 1
+
+    return {
+        "bounds": [west, south, east, north],
+        "count": count,
+        "cells": [
+            {
+                "row": row,
+                "col": col,
+                "count": cell["count"],
+                "temp_mean": sum(cell["temps"]) / cell["count"],
+                "temp_min": min(cell["temps"]),
+                "temp_max": max(cell["temps"]),
+                "wind_speed_mean": round(sum(cell["speeds"]) / cell["count"], 2),
+                "wind_speed_max": max(cell["speeds"]),
+                "wind_deg_mean": round(
+                    math.degrees(math.atan2(cell["u"], cell["v"])) % 360
+                ),
+            }
+            for (row, col), cell in sorted(cells.items())
+        ],
+    }
+
+
+def get_tile(zoom: int, x: int, y: int) -> Dict[str, Any]:
+    """
+    Returns the aggregated tile, from the tile cache when it was already rendered.
+    Args:
+        zoom (int): The zoom level.
+        x (int): The tile column.
+        y (int): The tile row.
+    Returns:
+        Dict[str, Any]: The aggregated tile, as returned by `aggregate_tile`.
+    """
+
+    cache_key = tile_cache_key(zoom, x, y)
+    tile = cache.get(cache_key)
+    if tile is not None:
+        increment(TILE_HITS_METRIC)
+        return tile
+    increment(TILE_MISSES_METRIC)
+    tile = aggregate_tile(zoom, x, y)
+    cache.set(cache_key, tile, TILE_CACHE_TTL)
+    return tile
+
+
+def city_tile_keys(lat: float, lon: float) -> List[str]:
+    """
+    Returns the cache keys of every tile containing a location, from zoom 0 to TILE_MAX_ZOOM.
+    Args:
+        lat (float): The latitude of the location.
+        lon (float): The longitude of the location.
+    Returns:
+        List[str]: The tile cache keys.
+    """
+
+    keys = []
+    for zoom in range(TILE_MAX_ZOOM + 1):
+        x, y = tile_position(lat, lon, zoom)
+        keys.append(tile_cache_key(zoom, int(x), int(y)))
+    return keys
+
+
+def invalidate_city_tiles(sender: Any, city_ids: Iterable[int], **kwargs: Any) -> None:
+    """
+    Drops the cached tiles containing the stored cities. Receiver of the `weather_stored` signal.
+    Args:
+        sender (Any): The sender of the signal.
+        city_ids (Iterable[int]): The ids of the stored cities.
+    """
+
+    keys = set()
+    for document in Weather.objects(id__in=list(city_ids)).only("coord").as_pymongo():
+        coord = document.get("coord")
+        if coord:
+            keys.update(city_tile_keys(coord["lat"], coord["lon"]))
+    if keys:
+        cache.delete_many(list(keys))
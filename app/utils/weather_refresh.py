@@ -0,0 +1,193 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pytz
+import requests
+from pymongo import UpdateOne
+
+from app.constants import (
+    OPEN_WEATHER_MAP_API,
+    OPEN_WEATHER_MAP_API_KEY,
+    OPEN_WEATHER_MAP_GROUP_SIZE,
+)
+from app.models import Weather
+from app.serializers.weather_serializer import WeatherSerializer
+from app.signals import notify_weather_stored
+from app.utils.cache import next_update_interval
+from app.utils.metrics import increment, register_metric
+
+logger = logging.getLogger(__name__)
+
+GROUP_WRITES_SKIPPED_METRIC = register_metric("weather.group.writes.skipped")
+
+# Current weather fields returned by the group endpoint that are stored as-is.
+GROUP_CURRENT_FIELDS = ("coord", "weather", "main", "visibility", "wind", "clouds")
+
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Splits a list into consecutive chunks of at most `size` items.
+    Args:
+        items (List[Any]): The items to split.
+        size (int): The maximum number of items per chunk.
+    Returns:
+        Iterator[List[Any]]: The chunks, in order.
+    """
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def fetch_weather_group(
+    city_ids: List[int], weather_api_key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetches the current weather for several cities with a single OpenWeatherMap group request.
+    Args:
+        city_ids (List[int]): The upstream city ids, at most OPEN_WEATHER_MAP_GROUP_SIZE of them.
+        weather_api_key (str, optional): The API key to use for the request. If not provided, a default key will be used.
+    Returns:
+        List[Dict[str, Any]]: The current weather entries returned by the group endpoint.
+    Raises:
+        requests.HTTPError: If the group request fails.
+    """
+
+    api_key = OPEN_WEATHER_MAP_API_KEY if not weather_api_key else weather_api_key
+    ids = ",".join(str(city_id) for city_id in city_ids)
+    group_request = requests.get(
+        f"{OPEN_WEATHER_MAP_API}/data/2.5/group?id={ids}&appid={api_key}"
+    )
+
+    if group_request.status_code != 200:
+        raise requests.HTTPError(
+            f"Failed to fetch weather group data ({group_request.status_code})"
+        )
+    return group_request.json().get("list", [])
+
+
+def build_group_update(
+    item: Dict[str, Any], stored: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Builds the `$set` document that applies a group endpoint entry to a stored Weather document.
+    The group endpoint omits `base`, `cod` and the `sys.type`/`sys.id` station fields, and reports the
+    timezone under `sys`, so only the fields it does return are overwritten.
+    Args:
+        item (Dict[str, Any]): A current weather entry from the group endpoint.
+        stored (Dict[str, Any], optional): The stored `dt` and `dt_interval` of the city.
+    Returns:
+        Dict[str, Any] | None: The fields to set, or None if the entry does not validate.
+    """
+
+    item = dict(item)
+    sys_data = dict(item.get("sys", {}))
+    if "timezone" in sys_data:
+        item["timezone"] = sys_data.pop("timezone")
+    item["sys"] = sys_data
+
+    serializer = WeatherSerializer(data=item, partial=True)
+    if not serializer.is_valid():
+        logger.warning(
+            "Skipping invalid group entry %s: %s", item.get("id"), serializer.errors
+        )
+        return None
+
+    validated_data = serializer.validated_data
+    update = {
+        field: validated_data[field]
+        for field in GROUP_CURRENT_FIELDS + ("dt", "timezone", "name")
+        if field in validated_data
+    }
+    for field, value in validated_data.get("sys", {}).items():
+        update[f"sys.{field}"] = value
+    if stored is not None and "dt" in validated_data:
+        update["dt_interval"] = next_update_interval(
+            stored.get("dt"), validated_data["dt"], stored.get("dt_interval")
+        )
+    update["updated_at"] = datetime.now(tz=pytz.utc)
+    return update
+
+
+def select_stale_cities(
+    city_ids: Optional[Iterable[int]] = None, max_age: Optional[int] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Selects the stored cities that are due for a refresh.
+    Args:
+        city_ids (Iterable[int], optional): Restricts the selection to these ids. Defaults to every stored city.
+        max_age (int, optional): Only cities last updated more than `max_age` seconds ago are selected.
+    Returns:
+        Dict[int, Dict[str, Any]]: The stored `dt` and `dt_interval` of each city to refresh, by city id.
+    """
+
+    query: Dict[str, Any] = {}
+    if city_ids is not None:
+        query["_id"] = {"$in": list(city_ids)}
+    if max_age is not None:
+        query["updated_at"] = {
+            "$lt": datetime.now(tz=pytz.utc) - timedelta(seconds=max_age)
+        }
+    return {
+        document["_id"]: document
+        for document in Weather._get_collection().find(
+            query, {"dt": 1, "dt_interval": 1}
+        )
+    }
+
+
+def refresh_weather_group(
+    city_ids: Optional[Iterable[int]] = None,
+    max_age: Optional[int] = None,
+    weather_api_key: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Refreshes the current weather of stored cities using group requests and bulk-updates MongoDB.
+    Args:
+        city_ids (Iterable[int], optional): The city ids to refresh. Defaults to every stored city.
+        max_age (int, optional): Skips cities updated less than `max_age` seconds ago.
+        weather_api_key (str, optional): The API key to use for the upstream requests.
+    Returns:
+        Dict[str, int]: Counters with the number of cities selected, upstream calls made,
+        documents updated, unchanged observations skipped and upstream calls that failed.
+    """
+
+    stale_cities = select_stale_cities(city_ids, max_age)
+    stats = {
+        "selected": len(stale_cities),
+        "calls": 0,
+        "updated": 0,
+        "skipped": 0,
+        "failed": 0,
+    }
+
+    for ids in chunked(list(stale_cities), OPEN_WEATHER_MAP_GROUP_SIZE):
+        stats["calls"] += 1
+        try:
+            items = fetch_weather_group(ids, weather_api_key)
+        except requests.RequestException:
+            logger.exception("Group refresh failed for cities %s", ids)
+            stats["failed"] += 1
+            continue
+
+        operations = []
+        updated_ids = []
+        for item in items:
+            if item.get("id") not in ids:
+                continue
+            if item.get("dt") == stale_cities[item["id"]].get("dt"):
+                stats["skipped"] += 1
+                continue
+            update = build_group_update(item, stale_cities[item["id"]])
+            if update is not None:
+                operations.append(UpdateOne({"_id": item["id"]}, {"$set": update}))
+                updated_ids.append(item["id"])
+
+        if operations:
+            result = Weather._get_collection().bulk_write(operations, ordered=False)
+            stats["updated"] += result.modified_count
+            notify_weather_stored(Weather, updated_ids)
+
+    if stats["skipped"]:
+        increment(GROUP_WRITES_SKIPPED_METRIC, stats["skipped"])
+    return stats
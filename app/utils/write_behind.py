@@ -0,0 +1,174 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.constants import (
+    WEATHER_WRITE_BEHIND_BATCH_SIZE,
+    WEATHER_WRITE_BEHIND_FLUSH_INTERVAL,
+    WEATHER_WRITE_BEHIND_PUT_TIMEOUT,
+    WEATHER_WRITE_BEHIND_QUEUE_SIZE,
+)
+from app.models import Weather
+from app.signals import notify_weather_stored
+from app.utils.metrics import increment, register_metric
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_FLUSHED_METRIC = register_metric("weather.write_behind.flushed")
+WRITE_BEHIND_REJECTED_METRIC = register_metric("weather.write_behind.rejected")
+WRITE_BEHIND_FAILED_METRIC = register_metric("weather.write_behind.failed")
+
+
+def merge_updates(updates: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges the update documents queued for one city, in queue order.
+    Later `$set` values win, but fields set only by earlier updates are kept, such as the
+    forecast of a full fetch followed by a current-only refresh. The earliest `$setOnInsert`
+    values are kept.
+    Args:
+        updates (Iterable[Dict[str, Any]]): The `$set`/`$setOnInsert` update documents.
+    Returns:
+        Dict[str, Any]: The merged update document.
+    """
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for update in updates:
+        for operator, values in update.items():
+            target = merged.setdefault(operator, {})
+            if operator == "$setOnInsert":
+                for field, value in values.items():
+                    target.setdefault(field, value)
+            else:
+                target.update(values)
+    return merged
+
+
+class WriteBehindQueue:
+    """
+    A bounded in-process queue of Weather upserts flushed in batches by a background thread.
+
+    Producers that find the queue full for longer than `put_timeout` are refused, so they can
+    write synchronously instead of queueing without limit. Pending operations are flushed when
+    the queue is closed, which happens automatically at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = WEATHER_WRITE_BEHIND_QUEUE_SIZE,
+        batch_size: int = WEATHER_WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = WEATHER_WRITE_BEHIND_FLUSH_INTERVAL,
+        put_timeout: float = WEATHER_WRITE_BEHIND_PUT_TIMEOUT,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Tuple[int, Dict[str, Any]]]" = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    def start(self) -> None:
+        """
+        Starts the background flush thread if it is not running yet.
+        """
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="weather-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def put(self, city_id: int, update: Dict[str, Any]) -> bool:
+        """
+        Queues an upsert for the background thread.
+        Args:
+            city_id (int): The id of the Weather document the upsert applies to.
+            update (Dict[str, Any]): The update document of the upsert, as built by
+                `weather_upsert_document`.
+        Returns:
+            bool: True if the operation was queued, False if the queue stayed full or is closing.
+        """
+
+        if self._stopping.is_set():
+            return False
+        self.start()
+        try:
+            self._queue.put((city_id, update), timeout=self.put_timeout)
+        except queue.Full:
+            increment(WRITE_BEHIND_REJECTED_METRIC)
+            return False
+        return True
+
+    def join(self) -> None:
+        """
+        Blocks until every queued operation has been flushed.
+        """
+
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background thread and flushes every pending operation.
+        Args:
+            timeout (float, optional): How long to wait for the background thread to stop.
+        """
+
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._flush(self._drain(block=False))
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._flush(batch)
+
+    def _drain(self, block: bool) -> List[Tuple[int, Dict[str, Any]]]:
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            while len(batch) < self.batch_size or not block:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _flush(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if not batch:
+            return
+        # The upserts of each city in the batch are merged into one write.
+        updates: Dict[int, List[Dict[str, Any]]] = {}
+        for city_id, update in batch:
+            updates.setdefault(city_id, []).append(update)
+        operations = {
+            city_id: UpdateOne(
+                {"_id": city_id}, merge_updates(city_updates), upsert=True
+            )
+            for city_id, city_updates in updates.items()
+        }
+        try:
+            Weather._get_collection().bulk_write(
+                list(operations.values()), ordered=False
+            )
+            increment(WRITE_BEHIND_FLUSHED_METRIC, len(operations))
+            notify_weather_stored(self, operations)
+        except Exception:
+            logger.exception("Failed to flush %s weather upserts", len(operations))
+            increment(WRITE_BEHIND_FAILED_METRIC, len(operations))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+write_behind_queue = WriteBehindQueue()
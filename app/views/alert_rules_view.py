@@ -0,0 +1,101 @@
+import traceback
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.models import AlertRule
+from app.serializers.alert_rule_serializer import AlertRuleSerializer
+
+
+class AlertRulesAPIView(APIView):
+    @method_decorator(never_cache)
+    def get(self, request):
+        """
+        Handles GET requests to list the alert rules of a city.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing the alert rules or error messages.
+        Query Parameters:
+            city_id (int): The OpenWeatherMap city id.
+        Responses:
+            200 OK: Returns the alert rules of the city. Temperature thresholds are in Kelvin.
+            400 Bad Request: If city_id is missing or not an integer.
+        """
+
+        try:
+            city_id = int(request.query_params.get("city_id", ""))
+        except ValueError:
+            return Response(
+                {"message": "city_id must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        rules = AlertRule.objects(city_id=city_id).order_by("created_at")
+        return Response(
+            {"data": AlertRuleSerializer(rules, many=True).data},
+            status=status.HTTP_200_OK,
+        )
+
+    def post(self, request):
+        """
+        Handles POST requests to register an alert rule on a city.
+        The rule is evaluated whenever the weather of the city is stored, and an alert is added
+        to the ALERTS_STREAM_KEY Redis stream when its condition starts holding.
+        Args:
+            request (Request): The HTTP request object containing the rule.
+        Returns:
+            Response: A DRF Response object containing the created rule or error messages.
+        Body Parameters:
+            city_id (int): The OpenWeatherMap city id.
+            metric (str): `temperature`, `wind_speed`, `humidity` or `pressure`.
+            operator (str): `above` or `below`.
+            threshold (float): The threshold, in `unit` for temperatures, m/s, % or hPa.
+            beaufort (str): A Beaufort scale name, such as `gale`, instead of a wind speed threshold.
+            unit (str): The unit of a temperature threshold: `metric` (default), `imperial` or `standard`.
+            label (str): An optional description, copied to the alerts.
+        Responses:
+            201 Created: Returns the created rule.
+            400 Bad Request: If the rule is invalid.
+            500 Internal Server Error: If the rule cannot be stored.
+        """
+
+        serializer = AlertRuleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            serializer.save()
+            return Response({"data": serializer.data}, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class AlertRuleAPIView(APIView):
+    def delete(self, request, rule_id):
+        """
+        Handles DELETE requests to remove an alert rule.
+        Args:
+            request (Request): The HTTP request object.
+            rule_id (str): The id of the rule.
+        Returns:
+            Response: An empty DRF Response object or an error message.
+        Responses:
+            204 No Content: The rule was removed.
+            404 Not Found: If the rule does not exist.
+        """
+
+        try:
+            deleted = AlertRule.objects(id=ObjectId(rule_id)).delete()
+        except InvalidId:
+            deleted = 0
+        if not deleted:
+            return Response(
+                {"message": "Alert rule not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
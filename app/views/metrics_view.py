@@ -0,0 +1,21 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.utils.metrics import get_metrics
+
+
+class MetricsAPIView(APIView):
+    @method_decorator(never_cache)
+    def get(self, request):
+        """
+        Handles GET requests to read the operational counters of the weather API.
+        Args:
+            request (Request): The HTTP request object.
+        Returns:
+            Response: A DRF Response object containing the value of every registered counter.
+        """
+
+        return Response({"data": get_metrics()}, status=status.HTTP_200_OK)
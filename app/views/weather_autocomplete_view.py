@@ -0,0 +1,61 @@
+import traceback
+from django.utils.cache import patch_cache_control
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+    WEATHER_CACHE_MIN_TTL,
+)
+from app.utils.autocomplete import city_index
+
+
+class WeatherAutocompleteAPIView(APIView):
+    def get(self, request):
+        """
+        Handles GET requests to suggest stored cities whose name starts with the typed text.
+        Suggestions come from an in-memory prefix index, so they do not query MongoDB.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing the suggested cities or error messages.
+        Query Parameters:
+            q (str): The typed prefix of the city name. Case and accents are ignored.
+            country (str): Only suggest cities of this 2-character country code.
+            limit (int): The maximum number of suggestions, up to AUTOCOMPLETE_MAX_LIMIT.
+                Defaults to AUTOCOMPLETE_LIMIT.
+        Responses:
+            200 OK: Returns the suggested cities in alphabetical order.
+            400 Bad Request: If q is missing or limit is invalid.
+            500 Internal Server Error: If there is an error building the index.
+        """
+
+        prefix = request.query_params.get("q", "").strip()
+        country = request.query_params.get("country")
+        if not prefix:
+            return Response(
+                {"message": "q parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+            return Response(
+                {"message": f"limit must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            data = city_index.search(prefix, country, limit)
+            response = Response({"data": data}, status=status.HTTP_200_OK)
+            patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
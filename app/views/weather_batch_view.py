@@ -0,0 +1,126 @@
+import traceback
+from django.utils.cache import patch_cache_control
+from mongoengine import DEFAULT_CONNECTION_NAME
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from app.constants import (
+    OPEN_WEATHER_MAP_GROUP_SIZE,
+    WEATHER_CACHE_MIN_TTL,
+    WEATHER_REFRESH_MAX_AGE,
+)
+from app.models.enums import TemperatureUnit
+from app.renderers.compact_renderer import CompactFormatMixin, CompactJSONRenderer
+from app.serializers.weather_serializer import (
+    CompactWeatherSerializer,
+    WeatherResponseSerializer,
+)
+from app.utils.admission import upstream_admission
+from app.utils.cache import observation_ttl
+from app.utils.persistence import get_weather_documents
+from app.utils.weather_refresh import refresh_weather_group
+
+
+class WeatherBatchAPIView(CompactFormatMixin, APIView):
+    max_batch_size = OPEN_WEATHER_MAP_GROUP_SIZE * 5
+
+    def get(self, request):
+        """
+        Handles GET requests to fetch weather data for several stored cities at once.
+        Cities whose data is older than WEATHER_REFRESH_MAX_AGE are refreshed through the
+        OpenWeatherMap group endpoint, packing up to OPEN_WEATHER_MAP_GROUP_SIZE cities per call.
+        When every upstream slot is busy, the stored data is returned without a refresh.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing weather data or error messages.
+        Query Parameters:
+            ids (str): Comma-separated OpenWeatherMap city ids.
+            fields (str): Comma-separated response fields to render. Only the document fields they
+                need are read from MongoDB. Defaults to every field.
+            format (str): `compact` renders numbers and forecast columns instead of formatted strings.
+        Responses:
+            200 OK: Returns weather data for the stored cities and the ids that are not stored.
+            400 Bad Request: If ids is missing, malformed or exceeds the batch size, or if fields is invalid.
+            500 Internal Server Error: If there is an error refreshing the weather data.
+        """
+
+        unit = request.query_params.get("unit", TemperatureUnit.CELSIUS.value)
+        weather_api_key = request.headers.get("X-Open-Weather-Key")
+
+        try:
+            city_ids = [
+                int(city_id)
+                for city_id in request.query_params.get("ids", "").split(",")
+                if city_id.strip()
+            ]
+        except ValueError:
+            return Response(
+                {"message": "ids must be a comma-separated list of integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not city_ids:
+            return Response(
+                {"message": "ids parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(city_ids) > self.max_batch_size:
+            return Response(
+                {"message": f"At most {self.max_batch_size} ids are allowed"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            fields = WeatherResponseSerializer.parse_fields(
+                request.query_params.get("fields")
+            )
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        render_context = {"unit": unit, "fields": fields}
+        serializer_class = WeatherResponseSerializer
+        if request.accepted_renderer.format == CompactJSONRenderer.format:
+            serializer_class = CompactWeatherSerializer
+        projection = serializer_class(context=render_context).get_projection()
+
+        try:
+            with upstream_admission.admit() as admitted:
+                if admitted:
+                    refresh_weather_group(
+                        city_ids,
+                        max_age=WEATHER_REFRESH_MAX_AGE,
+                        weather_api_key=weather_api_key,
+                    )
+
+            data = []
+            found_ids = set()
+            ttls = []
+            # Read from the primary, so the response carries the refresh written just above.
+            for weather_dict in get_weather_documents(
+                city_ids, projection, alias=DEFAULT_CONNECTION_NAME
+            ):
+                response_serializer = serializer_class(
+                    weather_dict, context=render_context
+                )
+                data.append({"id": weather_dict["id"], **response_serializer.data})
+                found_ids.add(weather_dict["id"])
+                ttls.append(
+                    observation_ttl(weather_dict["dt"], weather_dict.get("dt_interval"))
+                )
+
+            missing = [city_id for city_id in city_ids if city_id not in found_ids]
+            response = Response(
+                {"data": data, "missing": missing}, status=status.HTTP_200_OK
+            )
+            if ttls:
+                patch_cache_control(response, max_age=min(ttls))
+            if not admitted:
+                patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+                response["X-Weather-Stale"] = "true"
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
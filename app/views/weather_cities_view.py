@@ -0,0 +1,96 @@
+import traceback
+from django.utils.cache import patch_cache_control
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import (
+    CITIES_MAX_PAGE_SIZE,
+    CITIES_PAGE_SIZE,
+    WEATHER_CACHE_MIN_TTL,
+)
+from app.utils.export import export_fields
+from app.utils.persistence import weather_reads
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    parse_sort,
+)
+
+# Fields returned for each city unless `fields` is given.
+CITY_LISTING_FIELDS = ("name", "sys.country", "coord", "updated_at")
+
+
+class WeatherCitiesAPIView(APIView):
+    def get(self, request):
+        """
+        Handles GET requests to list the stored cities, one page at a time.
+        Pages are selected with a keyset on the sort field and the city id instead of an offset,
+        so every page is an index seek, however deep it is.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing the cities or error messages.
+        Query Parameters:
+            country (str): Only list cities of this 2-character country code.
+            sort (str): `name` (default) or `updated_at`, prefixed with `-` for descending order.
+            limit (int): The number of cities per page, up to CITIES_MAX_PAGE_SIZE. Defaults to CITIES_PAGE_SIZE.
+            cursor (str): The `next_cursor` of the previous page.
+            fields (str): Comma-separated Weather document fields to return. Defaults to the name,
+                country, coordinates and update time.
+        Responses:
+            200 OK: Returns the cities of the page and the cursor of the next page.
+            400 Bad Request: If sort, limit, cursor or fields are invalid.
+            500 Internal Server Error: If there is an error reading the cities.
+        """
+
+        country = request.query_params.get("country")
+        try:
+            sort_field, direction = parse_sort(request.query_params.get("sort"))
+            limit = int(request.query_params.get("limit", CITIES_PAGE_SIZE))
+            if not 1 <= limit <= CITIES_MAX_PAGE_SIZE:
+                raise ValueError(f"limit must be between 1 and {CITIES_MAX_PAGE_SIZE}")
+            cursor = request.query_params.get("cursor")
+            cursor = decode_cursor(cursor, sort_field) if cursor else None
+            fields = CITY_LISTING_FIELDS
+            if request.query_params.get("fields"):
+                fields = export_fields(request.query_params.get("fields"))
+        except ValueError as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            query = keyset_filter(sort_field, direction, cursor)
+            if country:
+                query["sys.country"] = country.upper()
+            order = "-" if direction == -1 else "+"
+            documents = list(
+                weather_reads()(__raw__=query)
+                .only(sort_field, *fields)
+                .order_by(f"{order}{sort_field}", f"{order}id")
+                .limit(limit + 1)
+                .as_pymongo()
+            )
+
+            next_cursor = None
+            if len(documents) > limit:
+                documents = documents[:limit]
+                last = documents[-1]
+                next_cursor = encode_cursor(last.get(sort_field), last["_id"])
+
+            data = []
+            for document in documents:
+                document["id"] = document.pop("_id")
+                if sort_field not in fields:
+                    document.pop(sort_field, None)
+                data.append(document)
+            response = Response(
+                {"data": data, "next_cursor": next_cursor}, status=status.HTTP_200_OK
+            )
+            patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
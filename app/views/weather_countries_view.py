@@ -0,0 +1,67 @@
+import traceback
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import WEATHER_CACHE_MIN_TTL
+from app.models import CountryRollup
+from app.models.enums import TemperatureUnit
+from app.utils.formatters import convert_temperature
+from app.utils.rollups import summarize_rollup
+
+
+class WeatherCountriesAPIView(APIView):
+    def get(self, request):
+        """
+        Handles GET requests to summarize the stored weather by country.
+        The statistics come from rollup documents that are updated incrementally whenever a city is
+        stored, so the answer is one read by country code, however many cities are stored.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing the country summaries or error messages.
+        Query Parameters:
+            country (str): Only summarize this 2-character country code. Defaults to every country.
+            unit (str): The temperature unit: `metric` (default), `imperial` or `standard`.
+        Responses:
+            200 OK: Returns the number of cities, mean temperature, strongest current Beaufort scale
+                and highest wind speed seen of each country.
+            400 Bad Request: If the country code is not a 2-character string.
+            404 Not Found: If no city of the country is stored.
+            500 Internal Server Error: If there is an error reading the rollups.
+        """
+
+        country = request.query_params.get("country")
+        unit = request.query_params.get("unit", TemperatureUnit.CELSIUS.value)
+        if country is not None and len(country) != 2:
+            return Response(
+                {"message": "Country must be a 2-character string"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            rollups = CountryRollup.objects.using(settings.MONGO_READ_ALIAS)
+            if country is not None:
+                rollups = rollups(country=country.upper())
+            data = []
+            for rollup in rollups.order_by("_id").as_pymongo():
+                summary = summarize_rollup(rollup)
+                # Rollups whose cities all moved to another country are left empty.
+                if not summary["cities"]:
+                    continue
+                summary["temp_mean"] = convert_temperature(summary["temp_mean"], unit)
+                data.append(summary)
+            if country is not None and not data:
+                return Response(
+                    {"message": "Country not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+            response = Response({"data": data}, status=status.HTTP_200_OK)
+            patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,58 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import EXPORT_BATCH_SIZE
+from app.utils.export import (
+    async_chunks,
+    export_fields,
+    gzip_chunks,
+    iter_weather_batches,
+    ndjson_chunks,
+)
+
+
+class WeatherExportAPIView(APIView):
+    @method_decorator(never_cache)
+    def get(self, request):
+        """
+        Handles GET requests to export every stored Weather document as NDJSON.
+        The collection is read with a batched cursor and streamed as it is read, so memory use
+        does not depend on the size of the collection. The stream is gzip-compressed when the
+        client accepts it. Under ASGI, the chunks are served through an asynchronous iterator
+        so that they are still sent as they are read.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            StreamingHttpResponse: One JSON document per line.
+            Response: A DRF Response object containing an error message.
+        Query Parameters:
+            fields (str): Comma-separated Weather document fields to export. Defaults to every stored field.
+        Responses:
+            200 OK: Streams the stored weather documents.
+            400 Bad Request: If fields contains an unknown field.
+        """
+
+        try:
+            fields = export_fields(request.query_params.get("fields"))
+        except ValueError as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        chunks = ndjson_chunks(iter_weather_batches(fields, EXPORT_BATCH_SIZE))
+        compress = "gzip" in request.headers.get("Accept-Encoding", "")
+        if compress:
+            chunks = gzip_chunks(chunks)
+        if isinstance(request._request, ASGIRequest):
+            chunks = async_chunks(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type="application/x-ndjson")
+        response["Content-Disposition"] = 'attachment; filename="weather.ndjson"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
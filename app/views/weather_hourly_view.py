@@ -0,0 +1,82 @@
+import traceback
+from django.utils.cache import patch_cache_control
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import HOURLY_MAX_PAGE_SIZE, HOURLY_PAGE_SIZE
+from app.models.enums import TemperatureUnit
+from app.serializers.weather_serializer import HourlyForecastSerializer
+from app.utils.cache import observation_ttl
+from app.utils.persistence import get_weather_document
+
+# Fields read when rendering a page of the hourly forecast.
+HOURLY_RESPONSE_FIELDS = ("hourly", "timezone", "dt", "dt_interval")
+
+
+class WeatherHourlyAPIView(APIView):
+    def get(self, request):
+        """
+        Handles GET requests to fetch a page of the stored hourly forecast of a city.
+        The hourly forecast is stored when the city's forecast is fetched through `/weather/`.
+        Only the hours of the requested page are formatted.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+        Returns:
+            Response: A DRF Response object containing the hourly forecast or error messages.
+        Query Parameters:
+            id (int): The OpenWeatherMap city id.
+            cursor (int): The timestamp of the first hour to return, taken from `next_cursor`.
+                Defaults to the first stored hour.
+            limit (int): The number of hours per page, up to HOURLY_MAX_PAGE_SIZE.
+                Defaults to HOURLY_PAGE_SIZE.
+        Responses:
+            200 OK: Returns the formatted hours and the cursor of the next page.
+            400 Bad Request: If id, cursor or limit are not valid integers, or limit is out of range.
+            404 Not Found: If the city is not stored.
+            500 Internal Server Error: If there is an error reading the hourly forecast.
+        """
+
+        unit = request.query_params.get("unit", TemperatureUnit.CELSIUS.value)
+
+        try:
+            city_id = int(request.query_params.get("id", ""))
+            cursor = request.query_params.get("cursor")
+            cursor = int(cursor) if cursor else None
+            limit = int(request.query_params.get("limit", HOURLY_PAGE_SIZE))
+        except ValueError:
+            return Response(
+                {"message": "id, cursor and limit must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= limit <= HOURLY_MAX_PAGE_SIZE:
+            return Response(
+                {"message": f"limit must be between 1 and {HOURLY_MAX_PAGE_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            weather_dict = get_weather_document(city_id, HOURLY_RESPONSE_FIELDS)
+            if weather_dict is None:
+                return Response(
+                    {"message": "City not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+
+            response_serializer = HourlyForecastSerializer(
+                weather_dict, context={"unit": unit, "cursor": cursor, "limit": limit}
+            )
+            response = Response(
+                {"data": response_serializer.data}, status=status.HTTP_200_OK
+            )
+            patch_cache_control(
+                response,
+                max_age=observation_ttl(
+                    weather_dict.get("dt"), weather_dict.get("dt_interval")
+                ),
+            )
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,98 @@
+import asyncio
+from typing import AsyncIterator, List
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from app.constants import (
+    WEATHER_STREAM,
+    WEATHER_STREAM_HEARTBEAT,
+    WEATHER_STREAM_MAX_CITIES,
+)
+from app.utils.stream import STREAM_CLOSED, render_city_events, weather_update_hub
+
+HEARTBEAT_EVENT = b": keepalive\n\n"
+
+
+class WeatherStreamView(View):
+    async def get(self, request):
+        """
+        Handles GET requests to follow the weather of stored cities as server-sent events.
+        The stream starts with the stored weather of each city, then receives a `weather` event
+        whenever a city is stored again. Events are rendered once per refresh and fanned out
+        through Redis pub/sub, so the number of clients does not add serialization work.
+        The view is asynchronous and needs an ASGI server to keep streams open without
+        holding a worker thread each. Under WSGI, Django would consume the endless stream
+        before sending anything, so the request is refused.
+        Args:
+            request (HttpRequest): The HTTP request object containing query parameters.
+        Returns:
+            StreamingHttpResponse: A `text/event-stream` of the cities' weather.
+            JsonResponse: An error message.
+        Query Parameters:
+            ids (str): Comma-separated OpenWeatherMap city ids, at most WEATHER_STREAM_MAX_CITIES.
+        Responses:
+            200 OK: Streams the weather of the cities, in Celsius with every response field.
+            400 Bad Request: If ids is missing, malformed or exceeds WEATHER_STREAM_MAX_CITIES.
+            404 Not Found: If WEATHER_STREAM is disabled.
+            501 Not Implemented: If the application is not served by an ASGI server.
+        """
+
+        if not WEATHER_STREAM:
+            return JsonResponse(
+                {"message": "Weather streaming is not enabled"}, status=404
+            )
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"message": "Weather streaming needs an ASGI server"}, status=501
+            )
+        try:
+            city_ids = sorted(
+                {
+                    int(city_id)
+                    for city_id in request.GET.get("ids", "").split(",")
+                    if city_id.strip()
+                }
+            )
+        except ValueError:
+            return JsonResponse(
+                {"message": "ids must be a comma-separated list of integers"},
+                status=400,
+            )
+        if not city_ids:
+            return JsonResponse({"message": "ids parameter is required"}, status=400)
+        if len(city_ids) > WEATHER_STREAM_MAX_CITIES:
+            return JsonResponse(
+                {"message": f"At most {WEATHER_STREAM_MAX_CITIES} ids are allowed"},
+                status=400,
+            )
+
+        response = StreamingHttpResponse(
+            self._events(city_ids), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stops nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def _events(self, city_ids: List[int]) -> AsyncIterator[bytes]:
+        # Subscribe before reading the stored weather, so no refresh falls in between.
+        queue = await weather_update_hub.subscribe(city_ids)
+        try:
+            for event in (await sync_to_async(render_city_events)(city_ids)).values():
+                yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=WEATHER_STREAM_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_EVENT
+                    continue
+                if event is STREAM_CLOSED:
+                    return
+                yield event
+        finally:
+            await weather_update_hub.unsubscribe(city_ids, queue)
@@ -0,0 +1,62 @@
+import traceback
+from django.utils.cache import patch_cache_control
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.constants import TILE_MAX_ZOOM, WEATHER_CACHE_MIN_TTL
+from app.models.enums import TemperatureUnit
+from app.utils.formatters import convert_temperature
+from app.utils.tiles import get_tile
+
+
+class WeatherTileAPIView(APIView):
+    def get(self, request, z, x, y):
+        """
+        Handles GET requests to fetch the aggregated weather of the stored cities inside a map tile.
+        Rendered tiles are cached and dropped when a city inside them is stored again, so panning
+        a map mostly reads cached tiles.
+        Args:
+            request (Request): The HTTP request object containing query parameters.
+            z (int): The zoom level, up to TILE_MAX_ZOOM.
+            x (int): The Web Mercator tile column.
+            y (int): The Web Mercator tile row.
+        Returns:
+            Response: A DRF Response object containing the tile or error messages.
+        Query Parameters:
+            unit (str): The temperature unit: `metric` (default), `imperial` or `standard`.
+        Responses:
+            200 OK: Returns the tile bounds, the number of cities and the temperature and wind of each grid cell.
+            400 Bad Request: If the zoom level or tile coordinates are out of range.
+            500 Internal Server Error: If there is an error aggregating the tile.
+        """
+
+        unit = request.query_params.get("unit", TemperatureUnit.CELSIUS.value)
+        if z > TILE_MAX_ZOOM or x >= 2**z or y >= 2**z:
+            return Response(
+                {"message": f"z must be at most {TILE_MAX_ZOOM} and x and y below 2^z"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            tile = get_tile(z, x, y)
+            cells = [
+                {
+                    **cell,
+                    "temp_mean": convert_temperature(cell["temp_mean"], unit),
+                    "temp_min": convert_temperature(cell["temp_min"], unit),
+                    "temp_max": convert_temperature(cell["temp_max"], unit),
+                }
+                for cell in tile["cells"]
+            ]
+            response = Response(
+                {"data": {**tile, "cells": cells}}, status=status.HTTP_200_OK
+            )
+            # Invalidation only reaches the tile cache, so shared HTTP caches keep tiles briefly.
+            patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+            return response
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -1,33 +1,78 @@
-from datetime import datetime
-from typing import Any, Dict
-import pytz
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 import traceback
-import requests
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from mongoengine import DEFAULT_CONNECTION_NAME
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from mongoengine.errors import DoesNotExist
+from rest_framework.exceptions import ValidationError
 
 from app.constants import (
+    COORDINATE_CACHE_PRECISION,
+    FORECAST_GRID_CACHE_TTL,
+    FORECAST_GRID_RESOLUTION,
     OPEN_WEATHER_MAP_API,
     OPEN_WEATHER_MAP_API_KEY,
     OPEN_WEATHER_MAP_ONE_CALL_KEY,
+    UPSTREAM_MAX_WORKERS,
+    UPSTREAM_RETRY_AFTER,
+    WEATHER_CACHE_MIN_TTL,
+    WEATHER_WRITE_BEHIND,
 )
 from app.models import Weather
-from app.models.enums import TemperatureUnit
+from app.models.enums import TemperatureUnit, WeatherInclude
+from app.signals import notify_weather_stored
+from app.renderers.compact_renderer import CompactFormatMixin, CompactJSONRenderer
 from app.serializers.weather_serializer import (
+    CompactWeatherSerializer,
     WeatherResponseSerializer,
     WeatherSerializer,
 )
+from app.utils.admission import upstream_admission
+from app.utils.cache import (
+    next_update_interval,
+    observation_ttl,
+    round_coordinates,
+    snap_to_grid,
+)
+from app.utils.delta import diff_render, find_render, record_render
+from app.utils.hedging import hedged_requests
+from app.utils.hourly import compact_hourly
+from app.utils.metrics import increment, register_metric
+from app.utils.persistence import (
+    WEATHER_STATE_FIELDS,
+    find_weather_document,
+    forecast_hash,
+    get_weather_document,
+    is_unchanged,
+    weather_upsert_document,
+)
+from app.utils.write_behind import write_behind_queue
+
+WRITES_SKIPPED_METRIC = register_metric("weather.writes.skipped")
+WRITES_METRIC = register_metric("weather.writes")
+FORECAST_GRID_HITS_METRIC = register_metric("forecast.grid.hits")
+FORECAST_GRID_MISSES_METRIC = register_metric("forecast.grid.misses")
+ADMISSION_STALE_METRIC = register_metric("upstream.admission.stale")
+
+upstream_executor = ThreadPoolExecutor(
+    max_workers=UPSTREAM_MAX_WORKERS, thread_name_prefix="weather-upstream"
+)
 
 
-class WeatherAPIView(APIView):
-    @method_decorator(cache_page(60 * 2))  # 2 minutes
+class WeatherAPIView(CompactFormatMixin, APIView):
     def get(self, request):
         """
         Handles GET requests to fetch weather data for a specified city and country.
+        Successful responses are cached until the next upstream observation is expected,
+        based on the stored `dt` and the observed update interval of the city. The site-wide
+        cache middleware stores the page for its `max-age`.
+        With WEATHER_WRITE_BEHIND enabled, the response is rendered from the validated upstream
+        payload and the upsert is queued for a background thread instead of awaited.
+        At most UPSTREAM_MAX_CONCURRENT requests per process wait on the upstream API. Requests
+        beyond that are served from the stored weather of the city, or rejected with a 503.
         Args:
             request (Request): The HTTP request object containing query parameters.
         Returns:
@@ -35,71 +80,325 @@ class WeatherAPIView(APIView):
         Query Parameters:
             city (str): The name of the city for which to fetch weather data.
             country (str): The 2-character country code for the specified city.
+            lat (float): The latitude of the location. Used with `lon` instead of `city` and `country`.
+            lon (float): The longitude of the location. Used with `lat` instead of `city` and `country`.
+            include (str): The sections to fetch and render: `all` (default), `current` or `forecast`.
+            fields (str): Comma-separated response fields to render. Defaults to every field.
+            format (str): `compact` renders numbers and one array per forecast field, with a
+                `schema` of their units, instead of formatted strings. `fields` does not apply.
+            since (str): The ETag or observation `dt` of a previous response. If it is still in the
+                render history of the city, only the fields and forecast days that changed are returned.
         Responses:
-            200 OK: Returns weather data for the specified city and country.
-            400 Bad Request: If city or country parameters are missing, or if the country code is not a 2-character string.
+            200 OK: Returns weather data for the specified city and country, or coordinates.
+            400 Bad Request: If city or country parameters are missing, if the country code is not a 2-character string,
+                or if the coordinates, include or fields are invalid.
+            503 Service Unavailable: If the upstream API is saturated and no stored data can be served.
             500 Internal Server Error: If there is an error fetching weather data from the external API.
         """
 
         city = request.query_params.get("city", "")
         country = request.query_params.get("country", "")
+        lat = request.query_params.get("lat")
+        lon = request.query_params.get("lon")
         unit = request.query_params.get("unit", TemperatureUnit.CELSIUS.value)
+        include = request.query_params.get("include", WeatherInclude.ALL.value)
 
         weather_api_key = request.headers.get("X-Open-Weather-Key")
         forecast_api_key = request.headers.get("X-Open-Weather-Call-Key")
 
+        if include not in {option.value for option in WeatherInclude}:
+            return Response(
+                {"message": "include must be one of all, current or forecast"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            fields = WeatherResponseSerializer.parse_fields(
+                request.query_params.get("fields")
+            )
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        render_context = {
+            "unit": unit,
+            "include": include,
+            "fields": fields,
+            "since": request.query_params.get("since"),
+            "format": request.accepted_renderer.format,
+        }
+
         try:
+            if lat is not None or lon is not None:
+                return self._get_coordinate_weather(
+                    lat, lon, render_context, weather_api_key, forecast_api_key
+                )
+
             self._validate_params(city, country)
-            weather_data = self._fetch_weather_data(city, country, weather_api_key)
-            weather_forecast_data = self._fetch_weather_forecast(
-                weather_data, forecast_api_key
+            with upstream_admission.admit() as admitted:
+                if not admitted:
+                    return self._shed_weather_request(city, country, render_context)
+                weather_data = self._fetch_weather_data(city, country, weather_api_key)
+                weather_forecast_data = None
+                if include != WeatherInclude.CURRENT.value:
+                    weather_forecast_data = self._fetch_weather_forecast(
+                        weather_data, forecast_api_key
+                    )
+            weather_response = self._format_weather_response(
+                weather_data, weather_forecast_data
+            )
+
+            stored = self._store_weather_response(weather_response)
+            if isinstance(stored, Response):
+                return stored
+            return self._render_weather(*stored, render_context)
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _get_coordinate_weather(
+        self,
+        lat: Optional[str],
+        lon: Optional[str],
+        render_context: Dict[str, Any],
+        weather_api_key: Optional[str],
+        forecast_api_key: Optional[str],
+    ) -> Response:
+        """
+        Fetches weather data for a location given by its coordinates, skipping the city name lookup.
+        The current weather and forecast calls run in parallel, and results are cached under the
+        coordinates rounded to COORDINATE_CACHE_PRECISION decimals so GPS jitter hits the cache.
+        Forecast-only results and locations away from any city are not tied to a city, so they
+        are cached but not stored.
+        Args:
+            lat (str, optional): The latitude, between -90 and 90.
+            lon (str, optional): The longitude, between -180 and 180.
+            render_context (Dict[str, Any]): The `unit`, `include` and `fields` of the response.
+            weather_api_key (str, optional): The API key for the current weather request.
+            forecast_api_key (str, optional): The API key for the forecast request.
+        Returns:
+            Response: A DRF Response object containing weather data or error messages.
+        """
+
+        try:
+            lat, lon = round_coordinates(lat, lon, COORDINATE_CACHE_PRECISION)
+        except ValueError as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        include = render_context["include"]
+        cache_key = f"weather:coord:{COORDINATE_CACHE_PRECISION}:{lat}:{lon}:{include}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return self._render_weather(*cached, render_context)
+
+        with upstream_admission.admit() as admitted:
+            if not admitted:
+                return self._service_unavailable()
+            weather_future = forecast_future = None
+            if include != WeatherInclude.FORECAST.value:
+                weather_future = upstream_executor.submit(
+                    self._fetch_weather_data_by_coordinates, lat, lon, weather_api_key
+                )
+            if include != WeatherInclude.CURRENT.value:
+                forecast_future = upstream_executor.submit(
+                    self._fetch_weather_forecast,
+                    {"coord": {"lat": lat, "lon": lon}},
+                    forecast_api_key,
+                )
+            weather_data = weather_future.result() if weather_future else None
+            weather_forecast_data = (
+                forecast_future.result() if forecast_future else None
+            )
+        for upstream_response in (weather_data, weather_forecast_data):
+            if isinstance(upstream_response, Response):
+                return upstream_response
+
+        if weather_data is None:
+            weather_dict = self._format_forecast_response(
+                lat, lon, weather_forecast_data
+            )
+            dt_interval = None
+        elif not self._is_city(weather_data):
+            weather_dict = self._format_weather_response(
+                weather_data, weather_forecast_data
             )
+            for key in ("id", "name"):
+                weather_dict.pop(key, None)
+            dt_interval = None
+        else:
             weather_response = self._format_weather_response(
                 weather_data, weather_forecast_data
             )
+            stored = self._store_weather_response(weather_response)
+            if isinstance(stored, Response):
+                return stored
+            weather_dict, dt_interval = stored
 
-            try:
-                weather: Weather = Weather.objects.get(id=weather_response["id"])
+        cache.set(
+            cache_key,
+            (dict(weather_dict), dt_interval),
+            observation_ttl(weather_dict["dt"], dt_interval),
+        )
+        return self._render_weather(weather_dict, dt_interval, render_context)
 
-                serializer = WeatherSerializer(data=weather_response)
-                if serializer.is_valid():
-                    weather.update(
-                        **serializer.validated_data,
-                        updated_at=datetime.now(tz=pytz.utc),
-                    )
-                    weather = weather.reload()
-                else:
-                    return Response(
-                        serializer.errors, status=status.HTTP_400_BAD_REQUEST
-                    )
+    def _is_city(self, weather_data: Dict[str, Any]) -> bool:
+        """
+        Checks whether upstream current weather data belongs to a city. Locations away from any
+        city are answered with an `id` of 0, a blank `name` and no country.
+        Args:
+            weather_data (Dict[str, Any]): The current weather data.
+        Returns:
+            bool: True if the data can be stored as a Weather document.
+        """
 
-            except DoesNotExist:
-                serializer = WeatherSerializer(data=weather_response)
-                if serializer.is_valid():
-                    weather = Weather.objects.create(**serializer.validated_data)
-                else:
-                    return Response(
-                        serializer.errors, status=status.HTTP_400_BAD_REQUEST
-                    )
+        return bool(weather_data.get("id")) and bool(weather_data.get("name"))
+
+    def _shed_weather_request(
+        self, city: str, country: str, render_context: Dict[str, Any]
+    ) -> Response:
+        """
+        Answers a request that was not admitted to the upstream API, from the stored weather of
+        the city when there is one. Stored data can be older than the next expected observation,
+        so it is only cached for WEATHER_CACHE_MIN_TTL and flagged with `X-Weather-Stale`.
+        Args:
+            city (str): The name of the city.
+            country (str): The country code of the city.
+            render_context (Dict[str, Any]): The `unit`, `include` and `fields` of the response.
+        Returns:
+            Response: The stored weather data, or a 503 response if the city is not stored.
+        """
 
-            weather_dict = weather.to_mongo()
-            weather_dict["id"] = weather_dict["_id"]
-            response_serializer = WeatherResponseSerializer(
-                data=weather_dict, context={"unit": unit}
+        weather_dict = find_weather_document(city, country)
+        if weather_dict is None:
+            return self._service_unavailable()
+        increment(ADMISSION_STALE_METRIC)
+        response = self._render_weather(
+            weather_dict, weather_dict.get("dt_interval"), render_context
+        )
+        patch_cache_control(response, max_age=WEATHER_CACHE_MIN_TTL)
+        response["X-Weather-Stale"] = "true"
+        return response
+
+    def _service_unavailable(self) -> Response:
+        """
+        Builds the fast rejection returned while every upstream slot is busy.
+        Returns:
+            Response: A 503 response with a Retry-After header of UPSTREAM_RETRY_AFTER seconds.
+        """
+
+        return Response(
+            {"message": "The weather service is busy, please retry later"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(UPSTREAM_RETRY_AFTER)},
+        )
+
+    def _store_weather_response(
+        self, weather_response: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Optional[int]] | Response:
+        """
+        Validates a formatted upstream response and stores it.
+        Args:
+            weather_response (Dict[str, Any]): The combined current weather and forecast data.
+        Returns:
+            Tuple[Dict[str, Any], int | None]: The validated data and the observed update interval of the city.
+            Response: An error response if the upstream data does not validate.
+        """
+
+        serializer = WeatherSerializer(data=weather_response)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        validated_data = serializer.validated_data
+        return validated_data, self._save_weather(validated_data)
+
+    def _render_weather(
+        self,
+        weather_dict: Dict[str, Any],
+        dt_interval: Optional[int],
+        render_context: Dict[str, Any],
+    ) -> Response:
+        """
+        Renders weather data, with a cache expiry aligned to the next expected upstream observation.
+        The stored document matches the validated payload, so it is rendered directly instead of
+        being read back and validated again.
+        Renders of stored cities are recorded in a short per-city history and carry an ETag.
+        When the `since` context value matches a recorded render, only the changes are returned.
+        Args:
+            weather_dict (Dict[str, Any]): The validated weather data.
+            dt_interval (int, optional): The observed update interval of the city.
+            render_context (Dict[str, Any]): The `unit`, `include`, `fields`, `since` and `format` of the response.
+        Returns:
+            Response: A DRF Response object containing the weather data, or its changes.
+        """
+
+        serializer_class = WeatherResponseSerializer
+        if render_context.get("format") == CompactJSONRenderer.format:
+            serializer_class = CompactWeatherSerializer
+        data = serializer_class(weather_dict, context=render_context).data
+        body = {"data": data}
+        etag = None
+        if weather_dict.get("id") is not None:
+            history = record_render(
+                weather_dict["id"], render_context, weather_dict["dt"], data
             )
+            etag = history[-1]["etag"]
+            since = render_context.get("since")
+            previous = find_render(history, since) if since else None
+            if previous is not None:
+                body = {
+                    "data": diff_render(previous["data"], data),
+                    "since": previous["etag"],
+                }
 
-            if not response_serializer.is_valid():
-                return Response(
-                    response_serializer.errors, status=status.HTTP_400_BAD_REQUEST
-                )
-            return Response(
-                {"data": response_serializer.data}, status=status.HTTP_200_OK
+        response = Response(body, status=status.HTTP_200_OK)
+        if etag is not None:
+            response["ETag"] = f'"{etag}"'
+        patch_cache_control(
+            response, max_age=observation_ttl(weather_dict["dt"], dt_interval)
+        )
+        return response
+
+    def _save_weather(self, validated_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Stores validated weather data, skipping the write when the observation is unchanged.
+        Only the fields needed for that decision are read, as a raw document from the primary.
+        With WEATHER_WRITE_BEHIND enabled, the upsert is queued for a background thread instead of
+        awaited. The decision is then made against the last flushed state of the city.
+        Args:
+            validated_data (Dict[str, Any]): The validated data of a WeatherSerializer.
+        Returns:
+            int | None: The observed update interval of the city, in seconds.
+        """
+
+        stored = get_weather_document(
+            validated_data["id"], WEATHER_STATE_FIELDS, DEFAULT_CONNECTION_NAME
+        )
+        digest = None
+        if "forecast" in validated_data:
+            digest = forecast_hash(
+                validated_data["forecast"], validated_data.get("hourly")
             )
-        except Exception as e:
-            traceback.print_exc()
-            return Response(
-                {"message": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        if stored is not None and is_unchanged(
+            stored.get("dt"), stored.get("forecast_hash"), validated_data["dt"], digest
+        ):
+            increment(WRITES_SKIPPED_METRIC)
+            return stored.get("dt_interval")
+
+        dt_interval = None
+        if stored is not None:
+            dt_interval = next_update_interval(
+                stored.get("dt"), validated_data["dt"], stored.get("dt_interval")
             )
+        update = weather_upsert_document(validated_data, dt_interval=dt_interval)
+        if WEATHER_WRITE_BEHIND and write_behind_queue.put(
+            validated_data["id"], update
+        ):
+            return dt_interval
+        Weather._get_collection().update_one(
+            {"_id": validated_data["id"]}, update, upsert=True
+        )
+        increment(WRITES_METRIC)
+        notify_weather_stored(Weather, [validated_data["id"]])
+        return dt_interval
 
     def _validate_params(self, city: str, country: str) -> bool | Response:
         """
@@ -138,8 +437,36 @@ class WeatherAPIView(APIView):
         """
 
         api_key = OPEN_WEATHER_MAP_API_KEY if not weather_api_key else weather_api_key
-        weather_request = requests.get(
-            f"{OPEN_WEATHER_MAP_API}/data/2.5/weather?q={city},{country}&appid={api_key}"
+        weather_request = hedged_requests.get(
+            "weather",
+            f"{OPEN_WEATHER_MAP_API}/data/2.5/weather?q={city},{country}&appid={api_key}",
+        )
+
+        if weather_request.status_code != 200:
+            return Response(
+                {"message": "Failed to fetch weather data"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return weather_request.json()
+
+    def _fetch_weather_data_by_coordinates(
+        self, lat: float, lon: float, weather_api_key: str
+    ) -> Dict[str, Any]:
+        """
+        Fetches weather data for the given coordinates using the OpenWeatherMap API.
+        Args:
+            lat (float): The latitude of the location.
+            lon (float): The longitude of the location.
+            weather_api_key (str): The API key to use for the request. If not provided, a default key will be used.
+        Returns:
+            Dict[str, Any]: The weather data in JSON format if the request is successful.
+            Response: An error response with a message if the request fails.
+        """
+
+        api_key = OPEN_WEATHER_MAP_API_KEY if not weather_api_key else weather_api_key
+        weather_request = hedged_requests.get(
+            "weather",
+            f"{OPEN_WEATHER_MAP_API}/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}",
         )
 
         if weather_request.status_code != 200:
@@ -154,6 +481,8 @@ class WeatherAPIView(APIView):
     ) -> Dict[str, Any]:
         """
         Fetches the weather forecast for a given location using the OpenWeatherMap One Call API.
+        When FORECAST_GRID_RESOLUTION is positive, the location is snapped to a grid of that
+        spacing in degrees and the result is cached, so nearby cities reuse one upstream call.
         Args:
             weather_response (Dict[str, Any]): The response from the initial weather API call containing location data.
             forecast_api_key (str): The API key to use for the forecast request. If not provided, a default key will be used.
@@ -169,8 +498,23 @@ class WeatherAPIView(APIView):
             OPEN_WEATHER_MAP_ONE_CALL_KEY if not forecast_api_key else forecast_api_key
         )
 
-        weather_one_call_request = requests.get(
-            f"{OPEN_WEATHER_MAP_API}/data/2.5/onecall?lat={city_lat}&lon={city_lon}&appid={api_key}"
+        cache_key = None
+        if FORECAST_GRID_RESOLUTION > 0:
+            # Nearby cities share the One Call result of the grid point they snap to.
+            city_lat = snap_to_grid(city_lat, FORECAST_GRID_RESOLUTION)
+            city_lon = snap_to_grid(city_lon, FORECAST_GRID_RESOLUTION)
+            cache_key = (
+                f"forecast:grid:{FORECAST_GRID_RESOLUTION}:{city_lat}:{city_lon}"
+            )
+            weather_forecast = cache.get(cache_key)
+            if weather_forecast is not None:
+                increment(FORECAST_GRID_HITS_METRIC)
+                return weather_forecast
+            increment(FORECAST_GRID_MISSES_METRIC)
+
+        weather_one_call_request = hedged_requests.get(
+            "onecall",
+            f"{OPEN_WEATHER_MAP_API}/data/2.5/onecall?lat={city_lat}&lon={city_lon}&appid={api_key}",
         )
 
         if weather_one_call_request.status_code != 200:
@@ -178,23 +522,60 @@ class WeatherAPIView(APIView):
                 {"message": "Failed to fetch weather data"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-        return weather_one_call_request.json()
+        weather_forecast = weather_one_call_request.json()
+        if cache_key is not None:
+            cache.set(cache_key, weather_forecast, FORECAST_GRID_CACHE_TTL)
+        return weather_forecast
 
     def _format_weather_response(
-        self, weather_data: Dict[str, Any], weather_forecast_response: Dict[str, Any]
+        self,
+        weather_data: Dict[str, Any],
+        weather_forecast_response: Optional[Dict[str, Any]],
     ) -> Dict[str, Any]:
         """
         Formats the weather response by combining current weather data with forecast data.
+        The hourly forecast is stored in a compact columnar form for the hourly endpoint.
         Args:
             weather_data (Dict[str, Any]): The current weather data.
-            weather_forecast_response (Dict[str, Any]): The weather forecast data.
+            weather_forecast_response (Dict[str, Any], optional): The weather forecast data.
+                When omitted, the response has no `forecast` key and the stored forecast is left untouched.
         Returns:
             Dict[str, Any]: The combined weather data with forecast information.
         """
 
+        if weather_forecast_response is None:
+            return weather_data
+
         daily_forecast_list = []
         for daily_forecast in weather_forecast_response["daily"]:
             daily_forecast["timezone"] = weather_data["timezone"]
             daily_forecast_list.append(daily_forecast)
         weather_data["forecast"] = daily_forecast_list
+        weather_data["hourly"] = compact_hourly(
+            weather_forecast_response.get("hourly", [])
+        )
         return weather_data
+
+    def _format_forecast_response(
+        self, lat: float, lon: float, weather_forecast_response: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Formats a forecast-only response for a location that was not looked up as a city.
+        Args:
+            lat (float): The latitude of the location.
+            lon (float): The longitude of the location.
+            weather_forecast_response (Dict[str, Any]): The weather forecast data.
+        Returns:
+            Dict[str, Any]: The coordinates, observation time and forecast of the location.
+        """
+
+        timezone = weather_forecast_response.get("timezone_offset", 0)
+        return {
+            "coord": {"lat": lat, "lon": lon},
+            "timezone": timezone,
+            "dt": weather_forecast_response.get("current", {}).get("dt"),
+            "forecast": [
+                {**daily_forecast, "timezone": timezone}
+                for daily_forecast in weather_forecast_response["daily"]
+            ],
+        }
@@ -0,0 +1,167 @@
+"""
+Compares the mongoengine Document read path with the raw `as_pymongo` read path.
+
+Each iteration reads stored Weather documents and renders them with
+WeatherResponseSerializer, both for a single city and for a batch of cities.
+
+Usage:
+    python benchmarks/read_path.py [--cities 100] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import mongomock  # noqa: E402
+from django.conf import settings  # noqa: E402
+from mongoengine import DEFAULT_CONNECTION_NAME, connect, disconnect  # noqa: E402
+
+from app.models import Weather  # noqa: E402
+from app.serializers.weather_serializer import WeatherResponseSerializer  # noqa: E402
+from app.utils.persistence import (  # noqa: E402
+    get_weather_document,
+    get_weather_documents,
+)
+
+
+def make_weather(city_id: int) -> dict:
+    forecast_day = {
+        "dt": 1729620000,
+        "sunrise": 1729593647,
+        "sunset": 1729636848,
+        "temp": {
+            "day": 290.1,
+            "min": 282.4,
+            "max": 291.2,
+            "night": 283.0,
+            "eve": 287.5,
+            "morn": 282.6,
+        },
+        "pressure": 1017,
+        "humidity": 64,
+        "wind_speed": 3.1,
+        "wind_deg": 120,
+        "weather": [
+            {"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}
+        ],
+        "timezone": -18000,
+    }
+    return {
+        "id": city_id,
+        "coord": {"lon": -74.0817, "lat": 4.6097},
+        "weather": [
+            {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04n"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": 286.88,
+            "feels_like": 286.76,
+            "temp_min": 286.88,
+            "temp_max": 286.88,
+            "pressure": 1017,
+            "humidity": 94,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 1.54, "deg": 0},
+        "clouds": {"all": 75},
+        "dt": 1729570140,
+        "sys": {
+            "type": 1,
+            "id": 8582,
+            "country": "CO",
+            "sunrise": 1729507253,
+            "sunset": 1729550432,
+        },
+        "timezone": -18000,
+        "name": f"City {city_id}",
+        "cod": 200,
+        "forecast": [dict(forecast_day) for _ in range(8)],
+    }
+
+
+def render_document(weather: Weather) -> dict:
+    weather_dict = weather.to_mongo()
+    weather_dict["id"] = weather_dict["_id"]
+    serializer = WeatherResponseSerializer(data=weather_dict)
+    serializer.is_valid()
+    return serializer.data
+
+
+def document_single() -> dict:
+    return render_document(Weather.objects.get(id=1))
+
+
+def raw_single() -> dict:
+    return WeatherResponseSerializer(get_weather_document(1)).data
+
+
+def document_batch(city_ids: list) -> list:
+    return [render_document(weather) for weather in Weather.objects(id__in=city_ids)]
+
+
+def raw_batch(city_ids: list) -> list:
+    return [
+        WeatherResponseSerializer(weather_dict).data
+        for weather_dict in get_weather_documents(city_ids)
+    ]
+
+
+def report(label: str, document_time: float, raw_time: float, repeat: int) -> None:
+    print(
+        f"{label:<8} document {document_time / repeat * 1000:8.3f} ms"
+        f"   raw {raw_time / repeat * 1000:8.3f} ms"
+        f"   speedup {document_time / raw_time:5.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    # Both aliases resolve to the same mongomock client.
+    for alias in (DEFAULT_CONNECTION_NAME, settings.MONGO_READ_ALIAS):
+        disconnect(alias)
+    for alias in (DEFAULT_CONNECTION_NAME, settings.MONGO_READ_ALIAS):
+        connect(
+            "benchmark",
+            alias=alias,
+            host="mongodb://localhost",
+            mongo_client_class=mongomock.MongoClient,
+            uuidRepresentation="standard",
+        )
+    Weather._get_collection().insert_many(
+        [
+            {"_id": city_id, **make_weather(city_id)}
+            for city_id in range(1, args.cities + 1)
+        ]
+    )
+    city_ids = list(range(1, args.cities + 1))
+
+    report(
+        "single",
+        timeit.timeit(document_single, number=args.repeat),
+        timeit.timeit(raw_single, number=args.repeat),
+        args.repeat,
+    )
+    batch_repeat = max(1, args.repeat // 10)
+    report(
+        f"batch {args.cities}",
+        timeit.timeit(lambda: document_batch(city_ids), number=batch_repeat),
+        timeit.timeit(lambda: raw_batch(city_ids), number=batch_repeat),
+        batch_repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
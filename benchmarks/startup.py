@@ -0,0 +1,80 @@
+"""
+Measures worker cold-start time and per-request overhead of Django settings profiles.
+
+Each profile is measured in fresh interpreters: the cold start is the time to build the WSGI
+application, and the request time is the mean time of `GET /metrics/` through the full
+middleware stack, with an in-memory cache so no Redis or MongoDB server is needed.
+
+Usage:
+    python benchmarks/startup.py [--settings core.settings core.settings_api] [--runs 5] [--requests 2000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+cold_start = time.perf_counter() - started
+
+from django.test import Client, override_settings
+with override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+):
+    client = Client()
+    client.get("/metrics/")
+    started = time.perf_counter()
+    for _ in range(int(sys.argv[1])):
+        client.get("/metrics/")
+    request_time = (time.perf_counter() - started) / int(sys.argv[1])
+print(json.dumps({"cold_start": cold_start, "request": request_time}))
+"""
+
+
+def measure(settings_module: str, runs: int, requests: int) -> dict:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", WORKER, str(requests)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "cold_start": statistics.median(result["cold_start"] for result in results),
+        "request": statistics.median(result["request"] for result in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--settings", nargs="+", default=["core.settings", "core.settings_api"]
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for settings_module in args.settings:
+        result = measure(settings_module, args.runs, args.requests)
+        print(
+            f"{settings_module:<22} cold start {result['cold_start'] * 1000:8.1f} ms"
+            f"   request {result['request'] * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
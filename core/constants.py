@@ -1,29 +1,51 @@
 import os
+from typing import Any
 from dotenv import load_dotenv
 
 
 load_dotenv()
 
 
+def env(name: str, default: Any = None) -> Any:
+    """
+    Reads an environment variable, treating blank values as unset.
+    Args:
+        name (str): The name of the environment variable.
+        default (Any, optional): The value used when the variable is unset or blank, such as the
+            `KEY=` lines of .env.template. Defaults to None.
+    Returns:
+        Any: The value of the variable, or the default.
+    """
+
+    return os.environ.get(name) or default
+
+
 # Django
-APP_SECRET_KEY = os.environ.get("SECRET_KEY", "your_secret_key")
-APP_STAGE = os.environ.get("APP_STAGE", "development")
+APP_SECRET_KEY = env("SECRET_KEY", "your_secret_key")
+APP_STAGE = env("APP_STAGE", "development")
 
 # Postgres
-POSTGRES_DB = os.environ.get("POSTGRES_DB", "your_db_name")
-POSTGRES_USER = os.environ.get("POSTGRES_USER", "your_db_user")
-POSTGRES_PASSWORD = os.environ.get("POSTGRES_PASSWORD", "your_db_password")
-POSTGRES_HOST = os.environ.get("POSTGRES_HOST", "localhost")
-POSTGRES_PORT = os.environ.get("POSTGRES_PORT", 5432)
+POSTGRES_DB = env("POSTGRES_DB", "your_db_name")
+POSTGRES_USER = env("POSTGRES_USER", "your_db_user")
+POSTGRES_PASSWORD = env("POSTGRES_PASSWORD", "your_db_password")
+POSTGRES_HOST = env("POSTGRES_HOST", "localhost")
+POSTGRES_PORT = env("POSTGRES_PORT", 5432)
 
 # MongoDB
-MONGO_DB = os.environ.get("MONGO_DB", "your_db_name")
-MONGO_HOST = os.environ.get("MONGO_HOST", "localhost")
-MONGO_PORT = os.environ.get("MONGO_PORT", 27017)
-MONGO_USERNAME = os.environ.get("MONGO_USERNAME", "your_db_name")
-MONGO_PASSWORD = os.environ.get("MONGO_PASSWORD", "your_db_name")
+MONGO_DB = env("MONGO_DB", "your_db_name")
+MONGO_HOST = env("MONGO_HOST", "localhost")
+MONGO_PORT = env("MONGO_PORT", 27017)
+MONGO_USERNAME = env("MONGO_USERNAME", "your_db_name")
+MONGO_PASSWORD = env("MONGO_PASSWORD", "your_db_name")
+MONGO_MAX_POOL_SIZE = int(env("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(env("MONGO_MIN_POOL_SIZE", 0))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(env("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGO_CONNECT_TIMEOUT_MS = int(env("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(env("MONGO_SOCKET_TIMEOUT_MS", 10000))
+MONGO_COMPRESSORS = env("MONGO_COMPRESSORS", "")
+MONGO_READ_ALIAS = env("MONGO_READ_ALIAS", "weather-read")
 
 # Redis
-REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
-REDIS_PORT = os.environ.get("REDIS_PORT", 6379)
-REDIS_DB = os.environ.get("REDIS_DB", "0")
+REDIS_HOST = env("REDIS_HOST", "localhost")
+REDIS_PORT = env("REDIS_PORT", 6379)
+REDIS_DB = env("REDIS_DB", "0")
@@ -11,14 +11,22 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
-from mongoengine import connect
+from mongoengine import DEFAULT_CONNECTION_NAME, register_connection
+from pymongo import ReadPreference
 
 from core.constants import (
     APP_STAGE,
     APP_SECRET_KEY,
+    MONGO_COMPRESSORS,
+    MONGO_CONNECT_TIMEOUT_MS,
     MONGO_DB,
     MONGO_HOST,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
     MONGO_PASSWORD,
+    MONGO_READ_ALIAS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
     MONGO_USERNAME,
     REDIS_HOST,
 )
@@ -45,24 +53,32 @@ THIRD_PARTY_APPS = [
     "rest_framework",
 ]
 
+LOCAL_APPS = [
+    "app",
+]
+
 
-INSTALLED_APPS = [
-    "django.contrib.admin",
-    "django.contrib.auth",
-    "django.contrib.contenttypes",
-    "django.contrib.sessions",
-    "django.contrib.messages",
-    "django.contrib.staticfiles",
-] + THIRD_PARTY_APPS
+INSTALLED_APPS = (
+    [
+        "django.contrib.admin",
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+        "django.contrib.staticfiles",
+    ]
+    + THIRD_PARTY_APPS
+    + LOCAL_APPS
+)
 
 MIDDLEWARE = [
+    "app.middleware.profiling.ProfilingMiddleware",
     "django.middleware.cache.UpdateCacheMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.cache.FetchFromCacheMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -100,10 +116,29 @@ if APP_STAGE == "production":
 else:
     MONGO_URI = f"mongodb://{MONGO_USERNAME}:{MONGO_PASSWORD}@{MONGO_HOST}/{MONGO_DB}"
 
-connect(
+MONGO_CLIENT_OPTIONS = {
+    "uuidRepresentation": "standard",
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+    "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+}
+if MONGO_COMPRESSORS:
+    MONGO_CLIENT_OPTIONS["compressors"] = MONGO_COMPRESSORS
+
+# Registered rather than connected: the client is created by the first query, so commands
+# and workers that never touch MongoDB do not wait for it.
+register_connection(
+    DEFAULT_CONNECTION_NAME, db=MONGO_DB, host=MONGO_URI, **MONGO_CLIENT_OPTIONS
+)
+# Read-only paths use their own pool, which prefers secondaries. Writes stay on the primary.
+register_connection(
+    MONGO_READ_ALIAS,
     db=MONGO_DB,
     host=MONGO_URI,
-    uuidRepresentation="standard",
+    read_preference=ReadPreference.SECONDARY_PREFERRED,
+    **MONGO_CLIENT_OPTIONS,
 )
 
 
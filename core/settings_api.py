@@ -0,0 +1,30 @@
+"""
+Stateless API settings profile.
+
+Loads only the apps and middleware the weather API uses: no admin, sessions, auth, messages,
+CSRF or clickjacking protection, and no browsable API. Select it with
+`DJANGO_SETTINGS_MODULE=core.settings_api`.
+"""
+
+from core.settings import *  # noqa: F401,F403
+from core.settings import LOCAL_APPS, THIRD_PARTY_APPS
+
+INSTALLED_APPS = THIRD_PARTY_APPS + LOCAL_APPS
+
+MIDDLEWARE = [
+    "app.middleware.profiling.ProfilingMiddleware",
+    "django.middleware.cache.UpdateCacheMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.cache.FetchFromCacheMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_PERMISSION_CLASSES": [],
+    "UNAUTHENTICATED_USER": None,
+}